@@ -0,0 +1,33 @@
+"""Add version counters to families and children
+
+Revision ID: 003_add_version_counters
+Revises: 002_simplify_invitations
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003_add_version_counters'
+down_revision: Union[str, Sequence[str], None] = '002_simplify_invitations'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add version columns used to derive ETags."""
+    op.add_column('families', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('children', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Remove version columns."""
+    # SQLite needs batch mode (table rebuild) to drop columns
+    with op.batch_alter_table('children') as batch_op:
+        batch_op.drop_column('version')
+    with op.batch_alter_table('families') as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,114 @@
+"""Store primary and foreign keys as 16-byte BLOBs
+
+Revision ID: 004_binary_ids
+Revises: 003_add_version_counters
+Create Date: 2026-10-19
+
+"""
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004_binary_ids'
+down_revision: Union[str, Sequence[str], None] = '003_add_version_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows read and rewritten per statement, so large tables never sit in memory at once
+BATCH_SIZE = 10_000
+
+# Every id column, per table; the first is the primary key, the rest are nullable
+# unless listed in NOT_NULL
+ID_COLUMNS: Dict[str, List[str]] = {
+    'families': ['id'],
+    'parent_admins': ['id', 'family_id'],
+    'children': ['id', 'family_id'],
+    'transactions': ['id', 'child_id', 'parent_admin_id'],
+    'invitations': ['id', 'family_id', 'created_by_parent_id'],
+    'requests': ['id', 'child_id', 'resolved_by_parent_id'],
+    'notifications': ['id', 'parent_admin_id', 'child_id'],
+}
+NOT_NULL = {
+    ('parent_admins', 'family_id'),
+    ('children', 'family_id'),
+    ('transactions', 'child_id'),
+    ('invitations', 'family_id'),
+    ('invitations', 'created_by_parent_id'),
+    ('requests', 'child_id'),
+}
+
+
+def _to_bytes(value: Union[str, bytes]) -> bytes:
+    # SQLite 3.40 has no unhex(), so the text -> BLOB conversion happens here
+    if isinstance(value, bytes):
+        return value
+    if len(value) != 36:
+        raise ValueError(f"Not a UUID: {value!r}")
+    return bytes.fromhex(value.replace('-', ''))
+
+
+def _to_text(value: Union[str, bytes]) -> str:
+    if isinstance(value, str):
+        return value
+    h = value.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _rewrite(table: str, columns: List[str], convert: Callable[[Union[str, bytes]], Union[str, bytes]]) -> None:
+    """Convert the id columns of every row in place, BATCH_SIZE rows at a time in rowid order."""
+    bind = op.get_bind()
+    select_batch = sa.text(
+        f"SELECT rowid, {', '.join(columns)} FROM {table} WHERE rowid > :last ORDER BY rowid LIMIT :size"
+    )
+    update_row = sa.text(
+        f"UPDATE {table} SET {', '.join(f'{column} = :{column}' for column in columns)} WHERE rowid = :rowid"
+    )
+    last = 0
+    while True:
+        rows = bind.execute(select_batch, {'last': last, 'size': BATCH_SIZE}).all()
+        if not rows:
+            break
+        bind.execute(update_row, [
+            {'rowid': row[0], **{column: None if value is None else convert(value) for column, value in zip(columns, row[1:])}}
+            for row in rows
+        ])
+        last = rows[-1][0]
+
+
+def _retype(table: str, columns: List[str], old: sa.types.TypeEngine, new: sa.types.TypeEngine) -> None:
+    """Rebuild the table with the id columns declared as `new`; indexes and foreign keys are kept."""
+    with op.batch_alter_table(table, recreate='always') as batch_op:
+        for position, column in enumerate(columns):
+            batch_op.alter_column(
+                column,
+                type_=new,
+                existing_type=old,
+                existing_nullable=position > 0 and (table, column) not in NOT_NULL,
+            )
+
+
+def _check_foreign_keys() -> None:
+    violation: Optional[tuple] = op.get_bind().execute(sa.text("PRAGMA foreign_key_check")).first()
+    if violation is not None:
+        raise RuntimeError(f"Foreign key check failed after converting ids: {tuple(violation)}")
+
+
+def upgrade() -> None:
+    """Convert every id from 36-character text to 16 bytes and declare the columns as BLOB."""
+    # Foreign keys are off on migration connections, so tables convert independently;
+    # the check at the end confirms every reference still matches its parent
+    for table, columns in ID_COLUMNS.items():
+        _rewrite(table, columns, _to_bytes)
+        _retype(table, columns, sa.String(length=36), sa.LargeBinary(length=16))
+    _check_foreign_keys()
+
+
+def downgrade() -> None:
+    """Convert every id back to 36-character text."""
+    for table, columns in reversed(list(ID_COLUMNS.items())):
+        _rewrite(table, columns, _to_text)
+        _retype(table, columns, sa.LargeBinary(length=16), sa.String(length=36))
+    _check_foreign_keys()
@@ -0,0 +1,50 @@
+"""Composite and partial indexes for the history and unread-count queries
+
+Revision ID: 005_query_plan_indexes
+Revises: 004_binary_ids
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005_query_plan_indexes'
+down_revision: Union[str, Sequence[str], None] = '004_binary_ids'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the indexes recommended by the query plan review and drop the ones they replace."""
+    # A child's history page is read in created_at order straight from the index;
+    # child_id lookups (and the ON DELETE CASCADE from children) use its prefix
+    op.create_index('ix_transactions_child_id_created_at', 'transactions', ['child_id', 'created_at'], unique=False)
+    op.drop_index('ix_transactions_child_id', table_name='transactions')
+
+    # Unread counts only touch unread entries, without reading the table;
+    # an index on the boolean alone is never chosen
+    op.create_index(
+        'ix_notifications_parent_admin_id_unread', 'notifications', ['parent_admin_id', 'is_read'],
+        unique=False, sqlite_where=sa.text('is_read = 0')
+    )
+    op.create_index(
+        'ix_notifications_child_id_unread', 'notifications', ['child_id', 'is_read'],
+        unique=False, sqlite_where=sa.text('is_read = 0')
+    )
+    op.drop_index('ix_notifications_is_read', table_name='notifications')
+
+    # Refresh planner statistics for the new indexes where ANALYZE has been run before
+    op.execute('PRAGMA optimize')
+
+
+def downgrade() -> None:
+    """Restore the single-column indexes."""
+    op.create_index('ix_notifications_is_read', 'notifications', ['is_read'], unique=False)
+    op.drop_index('ix_notifications_child_id_unread', table_name='notifications')
+    op.drop_index('ix_notifications_parent_admin_id_unread', table_name='notifications')
+    op.create_index('ix_transactions_child_id', 'transactions', ['child_id'], unique=False)
+    op.drop_index('ix_transactions_child_id_created_at', table_name='transactions')
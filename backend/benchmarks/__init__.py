@@ -0,0 +1,6 @@
+"""
+Benchmark scripts for the PiggyBank backend.
+
+Run from the backend directory, e.g.:
+    python -m benchmarks.bench_statement_cache
+"""
@@ -0,0 +1,140 @@
+"""
+Benchmark: database size and query times before and after migration 004_binary_ids.
+
+A database is migrated to 003_add_version_counters (ids as 36-character
+text), bulk-loaded by benchmarks.synthetic, measured, upgraded to
+004_binary_ids with Alembic (ids rewritten to 16-byte BLOBs in batches),
+vacuumed and measured again.
+
+Reported before and after: file size, the size of each table with its
+indexes (from dbstat), and microseconds per call of the lookups the API
+makes most often, run with the stdlib sqlite3 module and a page cache of
+--cache-mb. Lookups cycle over --targets random children and transactions so
+they are not all served from one cached page. The migration's own run time
+is printed too, as an estimate of the downtime it needs.
+
+Usage:
+    python -m benchmarks.bench_binary_ids [--families N] [--children N] [--transactions N]
+        [--cache-mb N] [--targets N] [--number N]
+"""
+import argparse
+import itertools
+import os
+import random
+import sqlite3
+import tempfile
+from typing import Dict, List, Tuple
+
+from benchmarks.common import PASSWORD_HASH, migrate_database, per_call_us, print_table
+from benchmarks.synthetic import load
+from src.models import id_to_bytes
+
+TEXT_REVISION = "003_add_version_counters"
+
+TABLES = ("families", "parent_admins", "children", "transactions")
+
+# name -> (SQL, which id it is called with); mirrors src.models.statements
+QUERIES: Dict[str, Tuple[str, str]] = {
+    "child by id": ("SELECT * FROM children WHERE id = ?", "child"),
+    "transaction by id": ("SELECT * FROM transactions WHERE id = ?", "transaction"),
+    "children of family": ("SELECT * FROM children WHERE family_id = ?", "family"),
+    "child history page": (
+        "SELECT * FROM transactions WHERE child_id = ? ORDER BY created_at DESC LIMIT 50", "child"
+    ),
+    "family history page": (
+        "SELECT transactions.* FROM transactions JOIN children ON children.id = transactions.child_id "
+        "WHERE children.family_id = ? ORDER BY transactions.created_at DESC LIMIT 50", "family"
+    ),
+}
+
+
+def table_sizes(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Bytes per table, its indexes included."""
+    sizes = {}
+    for table in TABLES:
+        names = [table] + [
+            name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (table,))
+        ]
+        sizes[table] = conn.execute(
+            f"SELECT SUM(pgsize) FROM dbstat WHERE name IN ({', '.join('?' * len(names))})", names
+        ).fetchone()[0]
+    return sizes
+
+
+def time_queries(path: str, targets: Dict[str, list], args: argparse.Namespace) -> Dict[str, float]:
+    """Microseconds per call of each query in QUERIES."""
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA cache_size=-{args.cache_mb * 1024}")
+    timings = {}
+    for name, (sql, kind) in QUERIES.items():
+        ids = itertools.cycle(targets[kind])
+        timings[name] = per_call_us(lambda: conn.execute(sql, (next(ids),)).fetchall(), number=args.number, repeat=3)
+    conn.close()
+    return timings
+
+
+def measure(path: str, targets: Dict[str, list], args: argparse.Namespace) -> Tuple[int, Dict[str, int], Dict[str, float]]:
+    conn = sqlite3.connect(path)
+    sizes = table_sizes(conn)
+    conn.close()
+    return os.path.getsize(path), sizes, time_queries(path, targets, args)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--families", type=int, default=300)
+    parser.add_argument("--children", type=int, default=3, help="children per family")
+    parser.add_argument("--transactions", type=int, default=1000, help="transactions per child")
+    parser.add_argument("--cache-mb", type=int, default=2, help="SQLite page cache while timing")
+    parser.add_argument("--targets", type=int, default=500, help="distinct ids each lookup cycles through")
+    parser.add_argument("--number", type=int, default=2000, help="calls per timing run")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="piggybank-binary-ids-"), "ids.db")
+    url = f"sqlite:///{path}"
+    migrate_database(url, TEXT_REVISION)
+    data = load(path, args.families, args.children, args.transactions, PASSWORD_HASH, seed=1, binary_ids=False)
+    print(f"loaded {data.transactions:,} transactions with text ids in {data.seconds:.1f}s")
+
+    rng = random.Random(3)
+    conn = sqlite3.connect(path)
+    transaction_ids = [
+        row[0] for row in conn.execute("SELECT id FROM transactions ORDER BY random() LIMIT ?", (args.targets,))
+    ]
+    conn.execute("VACUUM")
+    conn.close()
+    text_targets = {
+        "child": [child_id for child_id, _, _ in rng.sample(data.children, min(args.targets, len(data.children)))],
+        "family": rng.sample(data.family_ids, min(args.targets, len(data.family_ids))),
+        "transaction": transaction_ids,
+    }
+    before = measure(path, text_targets, args)
+
+    seconds = migrate_database(url, "004_binary_ids")
+    migrated_size = os.path.getsize(path)
+    conn = sqlite3.connect(path)
+    conn.execute("VACUUM")
+    conn.close()
+    print(f"migrated to 004_binary_ids in {seconds:.1f}s ({data.transactions / seconds:,.0f} transactions/s); "
+          f"file {migrated_size / 1048576:.1f} MB before VACUUM")
+    blob_targets = {kind: [id_to_bytes(value) for value in ids] for kind, ids in text_targets.items()}
+    after = measure(path, blob_targets, args)
+    os.remove(path)
+
+    def change(old: float, new: float) -> str:
+        return f"{(new - old) / old:+.0%}" if old else "-"
+
+    rows: List[List[object]] = [["file MB", f"{before[0] / 1048576:.1f}", f"{after[0] / 1048576:.1f}", change(before[0], after[0])]]
+    for table in TABLES:
+        old, new = before[1][table], after[1][table]
+        rows.append([f"{table} MB", f"{old / 1048576:.2f}", f"{new / 1048576:.2f}", change(old, new)])
+    for name in QUERIES:
+        old, new = before[2][name], after[2][name]
+        rows.append([f"{name} us", f"{old:.1f}", f"{new:.1f}", change(old, new)])
+
+    print(f"\n{data.transactions:,} transactions, {args.cache_mb} MB cache, sizes after VACUUM")
+    print_table(["", "text ids", "blob ids", "change"], rows)
+
+
+if __name__ == "__main__":
+    main()
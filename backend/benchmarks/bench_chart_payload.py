@@ -0,0 +1,67 @@
+"""
+Benchmark: payload size and cost of a year of balance-chart data.
+
+"full" is the default history row (all ten fields), "fields" selects only
+created_at and balance_after with ?fields=, and "columnar" returns the same two
+fields as parallel arrays with delta-encoded timestamps (?format=columnar).
+Timings cover the query and serialization; sizes are raw and gzipped.
+
+Usage:
+    python -m benchmarks.bench_chart_payload [--rows N] [--number N]
+"""
+import argparse
+import gzip
+
+from benchmarks.common import SessionLocal, create_schema, seed_family, per_call_us, print_table
+from src.api.v1.schemas import (
+    transaction_rows_adapter,
+    partial_transaction_rows_adapter,
+    transaction_columns_adapter,
+)
+from src.services import TransactionService
+
+CHART_FIELDS = ["created_at", "balance_after"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=365, help="history rows (one per day for a year)")
+    parser.add_argument("--number", type=int, default=200, help="calls per timing run")
+    args = parser.parse_args()
+
+    create_schema()
+    db = SessionLocal()
+    _, _, children = seed_family(db, children=1, transactions_per_child=args.rows)
+    child_id = children[0].id
+
+    variants = {
+        "full": lambda: transaction_rows_adapter.dump_json(
+            TransactionService.get_transaction_rows_by_child(db, child_id, limit=args.rows)
+        ),
+        "fields": lambda: partial_transaction_rows_adapter.dump_json(
+            TransactionService.get_transaction_rows_by_child(db, child_id, limit=args.rows, fields=CHART_FIELDS)
+        ),
+        "columnar": lambda: transaction_columns_adapter.dump_json(
+            TransactionService.get_transaction_columns_by_child(db, child_id, limit=args.rows, fields=CHART_FIELDS)
+        ),
+    }
+
+    results = []
+    for name, fn in variants.items():
+        body = fn()
+        results.append((name, len(body), len(gzip.compress(body)), per_call_us(fn, args.number)))
+    db.close()
+
+    full_bytes, full_gzip, full_us = results[0][1:]
+    print(f"{args.rows} rows")
+    print_table(
+        ["variant", "bytes", "gzip bytes", "us/call", "size vs full", "time vs full"],
+        [
+            [name, size, zipped, f"{us:.0f}", f"{full_bytes / size:.1f}x", f"{full_us / us:.1f}x"]
+            for name, size, zipped, us in results
+        ]
+    )
+
+
+if __name__ == "__main__":
+    main()
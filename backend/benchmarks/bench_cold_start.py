@@ -0,0 +1,109 @@
+"""
+Benchmark: time-to-first-response after a cold start.
+
+Each run starts a fresh server process against a migrated, seeded database and
+measures how long it takes until the health endpoint answers ("ready"), and
+how long the first authenticated list request then takes ("first query").
+
+"legacy" is the previous container command, `alembic upgrade head && uvicorn`.
+"fast" runs uvicorn alone with MIGRATE_ON_STARTUP (one SELECT on
+alembic_version) and the startup warm-up.
+
+Usage:
+    python -m benchmarks.bench_cold_start [--runs N]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from benchmarks.common import SessionLocal, seed_family, print_table
+from src.auth import create_access_token
+from src.maintenance import migrate_if_needed
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url: str, token: str = "") -> int:
+    request = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"} if token else {})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def cold_start(mode: str, token: str) -> tuple:
+    """Start a server, wait for it to answer, then time one list request."""
+    port = _free_port()
+    serve = f"{sys.executable} -m uvicorn src.main:app --port {port} --log-level warning"
+    env = dict(os.environ)
+    if mode == "legacy":
+        command = f"{sys.executable} -m alembic upgrade head >/dev/null 2>&1 && exec {serve}"
+        env.update(MIGRATE_ON_STARTUP="false", WARM_UP_ON_STARTUP="false")
+    else:
+        command = f"exec {serve}"
+        env.update(MIGRATE_ON_STARTUP="true", WARM_UP_ON_STARTUP="true")
+
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(command, shell=True, cwd=BACKEND_DIR, env=env)
+    try:
+        while True:
+            try:
+                if _get(f"{base}/api/v1/health") == 200:
+                    break
+            except (urllib.error.URLError, ConnectionError):
+                pass
+            if process.poll() is not None:
+                raise RuntimeError(f"{mode} server exited with {process.returncode}")
+            time.sleep(0.005)
+        ready = time.perf_counter() - started
+
+        request_started = time.perf_counter()
+        assert _get(f"{base}/api/v1/children/", token) == 200
+        first_query = time.perf_counter() - request_started
+    finally:
+        process.terminate()
+        process.wait()
+    return ready, first_query
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="cold starts per mode")
+    args = parser.parse_args()
+
+    migrate_if_needed()
+    db = SessionLocal()
+    _, parent, _ = seed_family(db, children=3, transactions_per_child=20)
+    token = create_access_token({"sub": parent.id, "username": parent.username, "user_type": "parent",
+                                 "family_id": parent.family_id})
+    db.close()
+
+    rows = []
+    for mode in ("legacy", "fast"):
+        runs = [cold_start(mode, token) for _ in range(args.runs)]
+        ready = statistics.median(r[0] for r in runs)
+        first = statistics.median(r[1] for r in runs)
+        rows.append([mode, f"{ready * 1000:.0f}", f"{first * 1000:.1f}", f"{(ready + first) * 1000:.0f}"])
+
+    print(f"median of {args.runs} cold starts")
+    print_table(["mode", "ready ms", "first query ms", "time to first response ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
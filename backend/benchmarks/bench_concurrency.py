@@ -0,0 +1,281 @@
+"""
+Benchmark: concurrent credits/debits through TransactionService.create_transaction.
+
+For each --workers value, a fresh family is seeded and that many threads (or
+processes) start together, each issuing --ops interleaved credits and debits.
+Every write goes through run_with_retry, as the API's routes do. About
+--hot-share of the writes go to one shared child and the rest are spread over
+the family's other children, so both same-row and different-row contention
+are exercised.
+
+After each level the ledger is checked: every child's balance must equal its
+credits minus debits, each row's balance_before must equal the previous row's
+balance_after (in insert order, starting at zero), and the number of rows
+written must match what the workers saw commit. Any mismatch means
+BEGIN IMMEDIATE let an update get lost, and the script exits non-zero.
+
+Reported per level: commits per second, rejected debits (insufficient funds),
+writes that gave up with WriteContentionError, and the distributions of lock
+wait (call start until BEGIN IMMEDIATE succeeds, retries included) and of
+lock hold (BEGIN IMMEDIATE until the call returns).
+
+Usage:
+    python -m benchmarks.bench_concurrency [--workers 1,2,4,8,16] [--ops N]
+        [--mode threads|processes] [--children N] [--hot-share F] [--seed N]
+"""
+import argparse
+import multiprocessing
+import random
+import sys
+import threading
+import time
+from decimal import Decimal
+from typing import Dict, List, NamedTuple, Tuple
+
+from sqlalchemy import event, select, text
+
+from benchmarks.common import SessionLocal, create_schema, engine, percentile, print_table, seed_family
+from src.models import Child, Transaction, TransactionType
+from src.services import TransactionService, WriteContentionError, run_with_retry
+
+# History each child starts with, so debits have something to draw on
+SEED_TRANSACTIONS = 8
+
+# Per-thread time at which this thread's BEGIN IMMEDIATE last succeeded
+_probe = threading.local()
+_probe_installed = False
+
+
+def _install_lock_probe() -> None:
+    global _probe_installed
+    if _probe_installed:
+        return
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _lock_acquired(conn, cursor, statement, parameters, context, executemany):
+        if statement == "BEGIN IMMEDIATE":
+            _probe.acquired = time.perf_counter()
+
+    _probe_installed = True
+
+
+class WorkerPlan(NamedTuple):
+    """What one worker writes; picklable so it can be sent to a process."""
+    seed: int
+    ops: int
+    hot_child: str
+    other_children: List[str]
+    hot_share: float
+    parent_id: str
+    family_id: str
+
+
+class WorkerResult(NamedTuple):
+    """Outcomes and timings of one worker's writes."""
+    committed: int
+    rejected: int
+    gave_up: int
+    # Net change the worker committed per child, for the independent balance check
+    net: Dict[str, Decimal]
+    lock_waits: List[float]
+    lock_holds: List[float]
+
+
+def run_worker(plan: WorkerPlan, barrier) -> WorkerResult:
+    """Issue the plan's writes on a session of this worker's own."""
+    _install_lock_probe()
+    rng = random.Random(plan.seed)
+    committed = rejected = gave_up = 0
+    net: Dict[str, Decimal] = {}
+    lock_waits: List[float] = []
+    lock_holds: List[float] = []
+    db = SessionLocal()
+    try:
+        barrier.wait()
+        for _ in range(plan.ops):
+            if not plan.other_children or rng.random() < plan.hot_share:
+                child_id = plan.hot_child
+            else:
+                child_id = rng.choice(plan.other_children)
+            # Debits slightly smaller on average so balances drift up and most debits succeed
+            if rng.random() < 0.5:
+                kind, amount = TransactionType.CREDIT, Decimal(rng.randint(100, 1000)) / 100
+            else:
+                kind, amount = TransactionType.DEBIT, Decimal(rng.randint(50, 900)) / 100
+
+            _probe.acquired = None
+            started = time.perf_counter()
+            try:
+                run_with_retry(
+                    db, TransactionService.create_transaction,
+                    db, child_id, plan.parent_id, kind, amount, "bench", None, plan.family_id
+                )
+            except WriteContentionError:
+                gave_up += 1
+                continue
+            except ValueError:
+                rejected += 1
+            else:
+                committed += 1
+                net[child_id] = net.get(child_id, Decimal("0")) + (amount if kind == TransactionType.CREDIT else -amount)
+            finished = time.perf_counter()
+            if _probe.acquired is not None:
+                lock_waits.append(_probe.acquired - started)
+                lock_holds.append(finished - _probe.acquired)
+    finally:
+        db.close()
+    return WorkerResult(committed, rejected, gave_up, net, lock_waits, lock_holds)
+
+
+def _process_entry(plan: WorkerPlan, barrier, results) -> None:
+    results.put(run_worker(plan, barrier))
+
+
+def run_level(plans: List[WorkerPlan], mode: str) -> Tuple[List[WorkerResult], float]:
+    """Run one worker per plan concurrently; returns their results and the wall time."""
+    if mode == "threads":
+        barrier = threading.Barrier(len(plans) + 1)
+        results: List[WorkerResult] = []
+        threads = [
+            threading.Thread(target=lambda plan=plan: results.append(run_worker(plan, barrier)))
+            for plan in plans
+        ]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        return results, time.perf_counter() - started
+
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(len(plans) + 1)
+    queue = context.Queue()
+    processes = [context.Process(target=_process_entry, args=(plan, barrier, queue)) for plan in plans]
+    for process in processes:
+        process.start()
+    # Startup (interpreter, imports) is not part of the measurement
+    barrier.wait()
+    started = time.perf_counter()
+    results = [queue.get() for _ in processes]
+    elapsed = time.perf_counter() - started
+    for process in processes:
+        process.join()
+    return results, elapsed
+
+
+def check_ledger(db, children: Dict[str, Decimal], rows_before: int, results: List[WorkerResult]) -> List[str]:
+    """
+    Verify balances and balance chains after a run.
+
+    Args:
+        db: Database session
+        children: Child ID -> balance before the run
+        rows_before: Transactions those children had before the run
+        results: The workers' results
+
+    Returns:
+        Descriptions of every inconsistency found; empty if the ledger is sound
+    """
+    problems = []
+    expected_rows = sum(result.committed for result in results)
+    written_rows = 0
+    for child_id, starting_balance in children.items():
+        balance = db.scalar(select(Child.balance).where(Child.id == child_id))
+        rows = db.execute(
+            select(Transaction.type, Transaction.amount, Transaction.balance_before, Transaction.balance_after)
+            .where(Transaction.child_id == child_id)
+            .order_by(text("transactions.rowid"))
+        ).all()
+
+        ledger = Decimal("0")
+        previous_after = Decimal("0")
+        for position, (kind, amount, before, after) in enumerate(rows):
+            signed = amount if kind == TransactionType.CREDIT else -amount
+            if before != previous_after:
+                problems.append(f"{child_id}: row {position} balance_before {before} != previous balance_after {previous_after}")
+            if after != before + signed:
+                problems.append(f"{child_id}: row {position} balance_after {after} != {before} {signed:+}")
+            if after < 0:
+                problems.append(f"{child_id}: row {position} overdrawn to {after}")
+            ledger += signed
+            previous_after = after
+
+        committed_net = sum((result.net.get(child_id, Decimal("0")) for result in results), Decimal("0"))
+        if balance != ledger:
+            problems.append(f"{child_id}: balance {balance} != ledger sum {ledger}")
+        if balance != starting_balance + committed_net:
+            problems.append(f"{child_id}: balance {balance} != {starting_balance} + committed {committed_net}")
+        written_rows += len(rows)
+
+    if written_rows - rows_before != expected_rows:
+        problems.append(f"{written_rows - rows_before} rows written, {expected_rows} commits seen")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", default="1,2,4,8,16", help="concurrency levels, comma-separated")
+    parser.add_argument("--ops", type=int, default=200, help="writes per worker")
+    parser.add_argument("--mode", choices=("threads", "processes"), default="threads")
+    parser.add_argument("--children", type=int, default=4, help="children per family")
+    parser.add_argument("--hot-share", type=float, default=0.5, help="share of writes to the shared child")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    levels = [int(level) for level in args.workers.split(",")]
+
+    create_schema()
+    _install_lock_probe()
+    rows = []
+    failed = False
+    for workers in levels:
+        db = SessionLocal()
+        family, parent, kids = seed_family(db, children=args.children, transactions_per_child=SEED_TRANSACTIONS)
+        db.commit()
+        children = {child.id: child.balance for child in kids}
+        rows_before = len(kids) * SEED_TRANSACTIONS
+        child_ids = list(children)
+        plans = [
+            WorkerPlan(args.seed * 1000 + w, args.ops, child_ids[0], child_ids[1:], args.hot_share, parent.id, family.id)
+            for w in range(workers)
+        ]
+        db.close()
+
+        results, elapsed = run_level(plans, args.mode)
+
+        db = SessionLocal()
+        problems = check_ledger(db, children, rows_before, results)
+        db.close()
+        for problem in problems:
+            print(f"workers={workers}: {problem}", file=sys.stderr)
+        failed = failed or bool(problems)
+
+        committed = sum(result.committed for result in results)
+        waits = sorted(wait for result in results for wait in result.lock_waits)
+        holds = sorted(hold for result in results for hold in result.lock_holds)
+        rows.append([
+            workers,
+            committed,
+            sum(result.rejected for result in results),
+            sum(result.gave_up for result in results),
+            f"{committed / elapsed:.0f}",
+            *(f"{percentile(waits, pct) * 1000:.2f}" for pct in (50, 95, 99)),
+            f"{(waits[-1] if waits else 0.0) * 1000:.2f}",
+            f"{percentile(holds, 50) * 1000:.2f}",
+            f"{percentile(holds, 99) * 1000:.2f}",
+            "FAIL" if problems else "ok",
+        ])
+
+    print(f"\n{args.mode}, {args.ops} writes per worker, {args.children} children, "
+          f"{args.hot_share:.0%} to the shared child; times in ms")
+    print_table(
+        ["workers", "commits", "rejected", "gave up", "commits/s",
+         "wait p50", "wait p95", "wait p99", "wait max", "hold p50", "hold p99", "ledger"],
+        rows
+    )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
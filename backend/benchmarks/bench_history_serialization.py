@@ -0,0 +1,79 @@
+"""
+Benchmark: serializing a 100-row transaction history page.
+
+"legacy" reproduces the previous path: ORM entities -> TransactionResponse.from_orm
+per row -> re-validation against the response_model -> stdlib json. "rows" is the
+current path: Core rows -> TypeAdapter.dump_json straight to bytes. Both payloads
+are checked for equality before timing.
+
+Usage:
+    python -m benchmarks.bench_history_serialization [--rows N] [--number N]
+"""
+import argparse
+import json
+import warnings
+from typing import List
+
+from pydantic import TypeAdapter
+
+from benchmarks.common import SessionLocal, create_schema, seed_family, per_call_us, print_table
+from src.api.v1.schemas import TransactionResponse, transaction_rows_adapter
+from src.services import TransactionService
+
+response_model_adapter = TypeAdapter(List[TransactionResponse])
+
+# The legacy path deliberately uses from_orm
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+
+def legacy_serialize(transactions) -> bytes:
+    """What the route and FastAPI did per request before the fast path."""
+    content = [TransactionResponse.from_orm(t) for t in transactions]
+    validated = response_model_adapter.validate_python(content, from_attributes=True)
+    payload = response_model_adapter.dump_python(validated, mode="json")
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100, help="rows per history page (max 100 via the API)")
+    parser.add_argument("--number", type=int, default=300, help="calls per timing run")
+    args = parser.parse_args()
+
+    create_schema()
+    db = SessionLocal()
+    _, _, children = seed_family(db, children=1, transactions_per_child=args.rows * 2)
+    child_id = children[0].id
+
+    transactions = TransactionService.get_transactions_by_child(db, child_id, limit=args.rows)
+    rows = TransactionService.get_transaction_rows_by_child(db, child_id, limit=args.rows)
+    legacy_body = legacy_serialize(transactions)
+    fast_body = transaction_rows_adapter.dump_json(rows)
+    assert json.loads(legacy_body) == json.loads(fast_body), "payloads differ"
+
+    def legacy_end_to_end():
+        db.expunge_all()
+        return legacy_serialize(TransactionService.get_transactions_by_child(db, child_id, limit=args.rows))
+
+    def fast_end_to_end():
+        return transaction_rows_adapter.dump_json(
+            TransactionService.get_transaction_rows_by_child(db, child_id, limit=args.rows)
+        )
+
+    results = [
+        ("serialize only", per_call_us(lambda: legacy_serialize(transactions), args.number),
+         per_call_us(lambda: transaction_rows_adapter.dump_json(rows), args.number)),
+        ("query + serialize", per_call_us(legacy_end_to_end, args.number),
+         per_call_us(fast_end_to_end, args.number)),
+    ]
+    db.close()
+
+    print(f"{args.rows} rows, {len(fast_body)} byte payload")
+    print_table(
+        ["stage", "legacy us", "rows us", "speedup"],
+        [[name, f"{before:.0f}", f"{after:.0f}", f"{before / after:.1f}x"] for name, before, after in results]
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark: insert throughput and primary-key index size with uuid4 vs UUIDv7 ids.
+
+For each id scheme a separate database is bulk-loaded by benchmarks.synthetic
+with --existing transactions whose ids follow that scheme. Then --inserts new
+transactions are written the way the app writes them (one BEGIN IMMEDIATE ...
+COMMIT per --batch rows, WAL mode) with a page cache of --cache-mb, like a
+small server whose table has outgrown memory.
+
+Reported per scheme: rows per second, WAL bytes written per inserted row
+(more dirty pages per commit means more WAL), and the size, page count and
+leaf fill of the transactions primary-key index after the run. Random keys
+dirty a different index leaf for every row, so each commit writes more pages
+to the WAL and, once the index outgrows the cache, reads more pages too;
+time-ordered keys keep appending to the same right-most leaf. (SQLite
+rebalances across sibling pages, so leaf fill stays similar either way.)
+
+Usage:
+    python -m benchmarks.bench_id_locality [--existing N] [--inserts N] [--batch N] [--cache-mb N]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine
+
+from benchmarks.common import PASSWORD_HASH, print_table
+from benchmarks.synthetic import load
+from src.config.database import Base
+from src.models import id_to_bytes, new_id
+
+PK_INDEX = "sqlite_autoindex_transactions_1"
+
+SCHEMES: Dict[str, Callable[[], str]] = {
+    "uuid4": lambda: str(uuid.uuid4()),
+    "uuid7": new_id,
+}
+
+
+def index_stats(conn: sqlite3.Connection, name: str) -> Dict[str, float]:
+    """Size, pages and leaf fill ratio of one index, from the dbstat table."""
+    pages, size, unused = conn.execute(
+        "SELECT COUNT(*), SUM(pgsize), SUM(unused) FROM dbstat WHERE name = ? AND pagetype = 'leaf'", (name,)
+    ).fetchone()
+    total_pages, total_size = conn.execute(
+        "SELECT COUNT(*), SUM(pgsize) FROM dbstat WHERE name = ?", (name,)
+    ).fetchone()
+    return {"pages": total_pages, "bytes": total_size, "fill": 1 - unused / size if size else 0.0}
+
+
+def run(scheme: str, directory: str, args: argparse.Namespace) -> List[object]:
+    path = os.path.join(directory, f"{scheme}.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    families = max(1, args.existing // (args.children * 1000))
+    per_child = max(1, args.existing // (families * args.children))
+    data = load(path, families, args.children, per_child, PASSWORD_HASH, seed=1, time_ordered_ids=scheme == "uuid7")
+    print(f"{scheme}: loaded {data.transactions:,} transactions in {data.seconds:.1f}s")
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA cache_size=-{args.cache_mb * 1024}")
+    # Keep every frame in the WAL so its size measures what the inserts wrote
+    conn.execute("PRAGMA wal_autocheckpoint=0")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    before = index_stats(conn, PK_INDEX)
+
+    generate = SCHEMES[scheme]
+    rng = random.Random(2)
+    owners = {family_id: parent_id for parent_id, _, family_id in data.parents}
+    children = [(id_to_bytes(child_id), id_to_bytes(owners[family_id])) for child_id, _, family_id in data.children]
+    insert = (
+        "INSERT INTO transactions (id, child_id, parent_admin_id, type, amount, balance_before, "
+        "balance_after, description, category, created_at) VALUES (?, ?, ?, 'CREDIT', 1.0, 0, 1.0, 'bench', NULL, ?)"
+    )
+    started = time.perf_counter()
+    for offset in range(0, args.inserts, args.batch):
+        conn.execute("BEGIN IMMEDIATE")
+        for _ in range(min(args.batch, args.inserts - offset)):
+            child_id, parent_id = children[rng.randrange(len(children))]
+            conn.execute(insert, (id_to_bytes(generate()), child_id, parent_id, datetime.utcnow().isoformat(" ")))
+        conn.execute("COMMIT")
+    elapsed = time.perf_counter() - started
+
+    wal_bytes = os.path.getsize(path + "-wal")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    after = index_stats(conn, PK_INDEX)
+    conn.close()
+    file_size = os.path.getsize(path)
+    os.remove(path)
+
+    return [
+        scheme,
+        f"{args.inserts / elapsed:,.0f}",
+        f"{wal_bytes / args.inserts:,.0f}",
+        f"{after['bytes'] / 1048576:.1f}",
+        f"{after['pages'] - before['pages']:,}",
+        f"{before['fill']:.0%} -> {after['fill']:.0%}",
+        f"{file_size / 1048576:.1f}",
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--existing", type=int, default=1_000_000, help="transactions loaded before the run")
+    parser.add_argument("--inserts", type=int, default=20_000, help="transactions inserted and timed")
+    parser.add_argument("--batch", type=int, default=1, help="rows per commit (1 = one transaction per request)")
+    parser.add_argument("--children", type=int, default=3, help="children per family")
+    parser.add_argument("--cache-mb", type=int, default=2, help="SQLite page cache during the inserts")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="piggybank-ids-")
+    rows = [run(scheme, directory, args) for scheme in SCHEMES]
+
+    print(f"\n{args.inserts:,} inserts into {args.existing:,} existing rows, {args.batch} per commit, "
+          f"{args.cache_mb} MB cache")
+    print_table(
+        ["ids", "rows/s", "WAL B/row", "pk index MB", "pk pages added", "pk leaf fill", "file MB"],
+        rows
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: memory and time per history page as ORM objects, dicts or records.
+
+Each strategy loads one child's history page and encodes it to JSON:
+"orm" loads Transaction entities into the session (as in long-lived sessions),
+"dicts" is the default list path (Core rows -> dict per row), and "records"
+is the LIGHTWEIGHT_ROWS path (Core rows -> __slots__ TransactionRecord).
+All payloads are checked for equality first.
+
+Reported per page size: bytes still held by the loaded page before encoding
+(what a session or cache keeps alive), the page's peak allocation including
+encoding, objects left in the identity map, and microseconds per page
+without tracing.
+
+Usage:
+    python -m benchmarks.bench_row_memory [--rows 50,100,500] [--number N]
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from pydantic import TypeAdapter
+
+from benchmarks.common import SessionLocal, create_schema, per_call_us, print_table, seed_family
+from src.api.v1.schemas import TransactionResponse, transaction_records_adapter, transaction_rows_adapter
+from src.services import TransactionService
+
+response_model_adapter = TypeAdapter(List[TransactionResponse])
+
+
+def measure(db, load: Callable[[], object], encode: Callable[[object], bytes]) -> Tuple[int, int, int]:
+    """
+    Allocation of one page under tracemalloc.
+
+    Returns:
+        (bytes held by the loaded page, peak bytes while loading and encoding,
+        objects in the session's identity map while the page is held)
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        page = load()
+        held, _ = tracemalloc.get_traced_memory()
+        identity_map = len(db.identity_map)
+        encode(page)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return held - baseline, peak - baseline, identity_map
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", default="50,100,500", help="rows per page, comma-separated")
+    parser.add_argument("--number", type=int, default=200, help="pages per timing run")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.rows.split(",")]
+
+    create_schema()
+    db = SessionLocal()
+    _, _, children = seed_family(db, children=1, transactions_per_child=max(sizes))
+    child_id = children[0].id
+    db.expunge_all()
+
+    table = []
+    for size in sizes:
+        def load_orm():
+            db.expunge_all()
+            return TransactionService.get_transactions_by_child(db, child_id, limit=size)
+
+        def encode_orm(page):
+            return response_model_adapter.dump_json(response_model_adapter.validate_python(page, from_attributes=True))
+
+        strategies = [
+            ("orm", load_orm, encode_orm),
+            ("dicts", lambda: TransactionService.get_transaction_rows_by_child(db, child_id, limit=size),
+             transaction_rows_adapter.dump_json),
+            ("records", lambda: TransactionService.get_transaction_rows_by_child(db, child_id, limit=size, records=True),
+             transaction_records_adapter.dump_json),
+        ]
+        payloads = [json.loads(encode(load())) for _, load, encode in strategies]
+        assert all(payload == payloads[0] for payload in payloads), "payloads differ"
+
+        for name, load, encode in strategies:
+            held, peak, identity_map = measure(db, load, encode)
+            us = per_call_us(lambda: encode(load()), number=args.number, repeat=3)
+            table.append([size, name, f"{held:,}", f"{held // size:,}", f"{peak:,}", identity_map, f"{us:.0f}"])
+        db.expunge_all()
+    db.close()
+
+    print_table(["rows", "strategy", "held B", "held B/row", "peak B", "identity map", "us/page"], table)
+
+
+if __name__ == "__main__":
+    main()
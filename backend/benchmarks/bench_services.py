@@ -0,0 +1,128 @@
+"""
+Benchmark: service calls and auth dependencies at growing history sizes.
+
+For each --sizes value the database is reloaded by benchmarks.synthetic with
+--families families of --children children, each child holding that many
+transactions. The same calls are then timed at every size. A time that stays
+flat as history grows means the call is O(1) or O(log n) in the data; one
+that grows with it means a scan or sort over the history.
+
+Usage:
+    python -m benchmarks.bench_services [--sizes 100,1000,10000] [--families N] [--children N]
+        [--number N] [--seed N]
+"""
+import argparse
+import itertools
+from decimal import Decimal
+from typing import Any, Callable, Coroutine, List, Tuple
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from benchmarks.common import PASSWORD_HASH, SessionLocal, create_schema, engine, per_call_us, print_table
+from benchmarks.synthetic import load
+from src.auth import create_access_token, get_current_user, get_current_parent, get_parent_scope, get_child_scope
+from src.models import TransactionType
+from src.services import ChildService, TransactionService
+
+
+def run_sync(coro: Coroutine) -> Any:
+    """Run a coroutine that never suspends (the auth dependencies) without an event loop."""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("coroutine awaited something; it needs an event loop")
+
+
+def cases(db, data, number: int) -> List[Tuple[str, Callable[[], object], int]]:
+    """(name, call, calls per timing run) for every benchmarked code path."""
+    family_id = data.family_ids[0]
+    child_id, _, _ = data.children[0]
+    parent_id, parent_username, _ = data.parents[0]
+    parent_token = create_access_token({
+        "sub": parent_id, "username": parent_username, "user_type": "parent", "family_id": family_id
+    })
+    child_token = create_access_token({
+        "sub": child_id, "username": data.children[0][1], "user_type": "child", "family_id": family_id
+    })
+    parent_payload = run_sync(get_current_user(
+        HTTPAuthorizationCredentials(scheme="Bearer", credentials=parent_token), db
+    ))
+    child_payload = run_sync(get_current_user(
+        HTTPAuthorizationCredentials(scheme="Bearer", credentials=child_token), db
+    ))
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=parent_token)
+
+    def orm(call: Callable[[], object]) -> Callable[[], object]:
+        # Fresh identity map each call, as in a request's own session
+        def run():
+            db.expunge_all()
+            return call()
+        return run
+
+    family_children = [child for child in data.children if child[2] == family_id]
+    write_targets = itertools.cycle(child for child, _, _ in family_children)
+
+    def create_transaction():
+        return TransactionService.create_transaction(
+            db, next(write_targets), parent_id, TransactionType.CREDIT, Decimal("1.00"),
+            description="bench", family_id=family_id
+        )
+
+    return [
+        ("get_transactions_by_child (50)",
+         orm(lambda: TransactionService.get_transactions_by_child(db, child_id, limit=50)), number),
+        ("get_transaction_rows_by_child (50)",
+         lambda: TransactionService.get_transaction_rows_by_child(db, child_id, limit=50), number),
+        ("get_transactions_by_family (50)",
+         orm(lambda: TransactionService.get_transactions_by_family(db, family_id, limit=50)), max(1, number // 10)),
+        ("get_transaction_rows_by_family (50)",
+         lambda: TransactionService.get_transaction_rows_by_family(db, family_id, limit=50), max(1, number // 10)),
+        ("get_children_by_family",
+         orm(lambda: ChildService.get_children_by_family(db, family_id)), number),
+        ("get_current_user (JWT)",
+         lambda: run_sync(get_current_user(credentials, db)), number),
+        ("get_current_parent",
+         orm(lambda: run_sync(get_current_parent(parent_payload, db))), number),
+        ("get_parent_scope",
+         lambda: run_sync(get_parent_scope(parent_payload, db)), number),
+        ("get_child_scope",
+         lambda: run_sync(get_child_scope(child_payload, db)), number),
+        # Writes last: they grow the history they are measured against
+        ("create_transaction",
+         create_transaction, max(1, number // 10)),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="100,1000,10000", help="transactions per child, comma-separated")
+    parser.add_argument("--families", type=int, default=20)
+    parser.add_argument("--children", type=int, default=3, help="children per family")
+    parser.add_argument("--number", type=int, default=500, help="calls per timing run (reads)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    create_schema()
+    results = {}
+    for size in sizes:
+        engine.dispose()
+        data = load(engine.url.database, args.families, args.children, size, PASSWORD_HASH, args.seed)
+        print(f"size {size}: {data.transactions:,} transactions loaded in {data.seconds:.1f}s")
+        db = SessionLocal()
+        for name, call, number in cases(db, data, args.number):
+            results.setdefault(name, []).append(per_call_us(call, number=number, repeat=3))
+        db.close()
+
+    rows = []
+    for name, timings in results.items():
+        growth = timings[-1] / timings[0] if timings[0] else 0.0
+        rows.append([name, *(f"{us:.1f}" for us in timings), f"{growth:.1f}x"])
+    print(f"\nus per call; {args.families} families x {args.children} children x N transactions")
+    print_table(["call", *(f"N={size}" for size in sizes), f"{sizes[-1]}/{sizes[0]}"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Microbenchmark: ad-hoc ORM queries vs. the prebuilt statements in
+src.models.statements.
+
+The "legacy" column rebuilds each lookup with db.query(...).filter(...) the way
+the services did before; the "prebuilt" column calls the service/dependency
+code paths, which execute module-level select() constructs.
+
+Usage:
+    python -m benchmarks.bench_statement_cache [--number N]
+"""
+import argparse
+
+from benchmarks.common import SessionLocal, create_schema, seed_family, per_call_us, print_table
+from src.models import Child, ParentAdmin, Transaction
+from src.models.statements import PARENT_BY_ID
+from src.services import ChildService, TransactionService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=2000, help="calls per timing run")
+    args = parser.parse_args()
+
+    create_schema()
+    db = SessionLocal()
+    _, parent, children = seed_family(db, children=3, transactions_per_child=200)
+    child = children[0]
+
+    cases = [
+        (
+            "Child.id == ?",
+            lambda: db.query(Child).filter(Child.id == child.id).first(),
+            lambda: ChildService.get_child_by_id(db, child.id),
+        ),
+        (
+            "ParentAdmin.id == ?",
+            lambda: db.query(ParentAdmin).filter(ParentAdmin.id == parent.id).first(),
+            lambda: db.scalars(PARENT_BY_ID, {"parent_id": parent.id}).first(),
+        ),
+        (
+            "Child.username == ?",
+            lambda: db.query(Child).filter(Child.username == child.username).first(),
+            lambda: ChildService.get_child_by_username(db, child.username),
+        ),
+        (
+            "child history (50 rows)",
+            lambda: (
+                db.query(Transaction)
+                .filter(Transaction.child_id == child.id)
+                .order_by(Transaction.created_at.desc())
+                .limit(50)
+                .offset(0)
+                .all()
+            ),
+            lambda: TransactionService.get_transactions_by_child(db, child.id, limit=50),
+        ),
+    ]
+
+    rows = []
+    for name, legacy, prebuilt in cases:
+        before = per_call_us(legacy, number=args.number)
+        after = per_call_us(prebuilt, number=args.number)
+        rows.append([name, f"{before:.1f}", f"{after:.1f}", f"{before - after:+.1f}", f"{(1 - after / before) * 100:.0f}%"])
+
+    db.close()
+    print_table(["lookup", "legacy us/call", "prebuilt us/call", "saved us", "reduction"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Shared setup for the benchmark scripts.
+
+Importing this module points DATABASE_URL at a throwaway SQLite file (unless
+one is already set) before any application module reads the settings.
+"""
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, List, Tuple
+
+_TMP_DIR = tempfile.mkdtemp(prefix="piggybank-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_TMP_DIR}/bench.db")
+os.environ.setdefault("ENVIRONMENT", "benchmark")
+
+from src.config.database import Base, SessionLocal, engine  # noqa: E402
+from src.models import Family, ParentAdmin, Child, Transaction, ParentRole, TransactionType  # noqa: E402
+
+# bcrypt hash of "password1" - seeding must not pay a hash per row
+PASSWORD_HASH = "$2b$12$HBEpWtQYG9KDJiyImrnj8uIJ/AerdlvRLEqytiVTxJ5wkQPcPxi4."
+
+
+def create_schema() -> None:
+    """Create all tables in the benchmark database."""
+    Base.metadata.create_all(engine)
+
+
+def migrate_database(url: str, revision: str = "head") -> float:
+    """Run `alembic upgrade` on another database; returns seconds taken."""
+    from alembic import command
+    from alembic.config import Config
+    from src.maintenance.migrations import ALEMBIC_DIR
+
+    # alembic/env.py prefers DATABASE_URL over the configured URL
+    os.environ["DATABASE_URL"] = url
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    config.set_main_option("sqlalchemy.url", url)
+    started = time.perf_counter()
+    command.upgrade(config, revision)
+    return time.perf_counter() - started
+
+
+def seed_family(
+    db,
+    children: int = 1,
+    transactions_per_child: int = 0
+) -> Tuple[Family, ParentAdmin, List[Child]]:
+    """
+    Insert one family with its owner, children and credit history.
+
+    Returns:
+        Tuple of (Family, ParentAdmin, list of Child)
+    """
+    suffix = uuid.uuid4().hex[:8]
+    family = Family(id=str(uuid.uuid4()), family_code=suffix[:8].upper(), name=f"Family {suffix}")
+    parent = ParentAdmin(
+        id=str(uuid.uuid4()),
+        family_id=family.id,
+        username=f"parent_{suffix}",
+        name="Parent",
+        password_hash=PASSWORD_HASH,
+        role=ParentRole.OWNER
+    )
+    db.add_all([family, parent])
+
+    kids = []
+    start = datetime.utcnow() - timedelta(days=365)
+    for i in range(children):
+        child = Child(
+            id=str(uuid.uuid4()),
+            family_id=family.id,
+            username=f"child_{suffix}_{i}",
+            name=f"Child {i}",
+            password_hash=PASSWORD_HASH,
+            balance=Decimal("0.00")
+        )
+        balance = Decimal("0.00")
+        rows = []
+        for n in range(transactions_per_child):
+            amount = Decimal("1.25")
+            rows.append(Transaction(
+                id=str(uuid.uuid4()),
+                child_id=child.id,
+                parent_admin_id=parent.id,
+                type=TransactionType.CREDIT,
+                amount=amount,
+                balance_before=balance,
+                balance_after=balance + amount,
+                description=f"Allowance #{n}",
+                created_at=start + timedelta(minutes=n)
+            ))
+            balance += amount
+        child.balance = balance
+        db.add(child)
+        db.add_all(rows)
+        kids.append(child)
+
+    db.commit()
+    return family, parent, kids
+
+
+def per_call_us(fn: Callable[[], object], number: int = 2000, repeat: int = 5) -> float:
+    """Best-of-`repeat` mean time per call of `fn`, in microseconds."""
+    fn()  # warm caches
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e6
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[rank - 1]
+
+
+def print_table(headers: List[str], rows: List[List[object]]) -> None:
+    """Print rows as a fixed-width text table."""
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
+
+
+__all__ = [
+    "SessionLocal",
+    "engine",
+    "create_schema",
+    "seed_family",
+    "per_call_us",
+    "percentile",
+    "print_table",
+]
@@ -0,0 +1,338 @@
+"""
+Load test: mixed HTTP workload against a seeded temporary database.
+
+Seeds --families families, each with --children children and --transactions
+credits per child, then runs --concurrency async httpx workers for --duration
+seconds. Each worker picks operations by weight: logins, history reads, the
+parent dashboard, and credits/debits that all target the same "hot" child to
+exercise write contention. The app runs in-process (ASGI transport) or under
+uvicorn. Rate limiting is disabled for the run.
+
+Per-operation p50/p95/p99 latency and requests per second are printed and
+saved as JSON; --compare prints the change against an earlier result file.
+
+Usage:
+    python -m benchmarks.load_test [--server inprocess|uvicorn] [--duration S] [--concurrency N]
+        [--families N] [--children N] [--transactions N] [--mix op=weight,...]
+        [--seed N] [--output PATH] [--compare PATH]
+"""
+import os
+
+# Must be set before benchmarks.common imports the application settings
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ.setdefault("SLOW_QUERY_MS", "0")
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import random  # noqa: E402
+import socket  # noqa: E402
+import subprocess  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+from datetime import datetime, timezone  # noqa: E402
+from pathlib import Path  # noqa: E402
+from typing import Any, Dict, List, Optional, Tuple  # noqa: E402
+
+import httpx  # noqa: E402
+
+from benchmarks.common import SessionLocal, create_schema, seed_family, percentile, print_table  # noqa: E402
+from src.auth import create_access_token  # noqa: E402
+from src.config.settings import settings  # noqa: E402
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+API = settings.api_v1_prefix
+PASSWORD = "password1"  # matches benchmarks.common.PASSWORD_HASH
+
+DEFAULT_MIX = "login_parent=1,login_child=1,child_history=6,my_history=4,family_history=2,dashboard=3,credit=3,debit=2"
+
+
+class Fixture:
+    """Seeded users, their tokens and the hot child for contended writes."""
+
+    def __init__(self, families: int, children: int, transactions: int):
+        create_schema()
+        self.parents: List[Tuple[str, Dict[str, str]]] = []
+        self.children: List[Tuple[str, str, Dict[str, str], Dict[str, str]]] = []
+        db = SessionLocal()
+        for _ in range(families):
+            _, parent, kids = seed_family(db, children=children, transactions_per_child=transactions)
+            parent_headers = _bearer(create_access_token({
+                "sub": parent.id, "username": parent.username,
+                "user_type": "parent", "family_id": parent.family_id
+            }))
+            self.parents.append((parent.username, parent_headers))
+            for kid in kids:
+                child_headers = _bearer(create_access_token({
+                    "sub": kid.id, "username": kid.username,
+                    "user_type": "child", "family_id": kid.family_id
+                }))
+                self.children.append((kid.id, kid.username, child_headers, parent_headers))
+        db.close()
+        self.hot_child_id, _, _, self.hot_parent_headers = self.children[0]
+
+
+def _bearer(token: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _operations(fixture: Fixture, rng: random.Random) -> Dict[str, Any]:
+    """Operation name -> function returning (method, url, request kwargs)."""
+    def login_parent():
+        username, _ = rng.choice(fixture.parents)
+        return "POST", f"{API}/auth/login/parent", {"json": {"username": username, "password": PASSWORD}}
+
+    def login_child():
+        _, username, _, _ = rng.choice(fixture.children)
+        return "POST", f"{API}/auth/login/child", {"json": {"username": username, "password": PASSWORD}}
+
+    def child_history():
+        child_id, _, _, parent_headers = rng.choice(fixture.children)
+        return "GET", f"{API}/transactions/child/{child_id}?limit=50", {"headers": parent_headers}
+
+    def my_history():
+        _, _, child_headers, _ = rng.choice(fixture.children)
+        return "GET", f"{API}/transactions/my-transactions?limit=50", {"headers": child_headers}
+
+    def family_history():
+        _, parent_headers = rng.choice(fixture.parents)
+        return "GET", f"{API}/transactions/family?limit=50", {"headers": parent_headers}
+
+    def dashboard():
+        _, parent_headers = rng.choice(fixture.parents)
+        return "GET", f"{API}/dashboard/parent", {"headers": parent_headers}
+
+    def credit():
+        body = {"child_id": fixture.hot_child_id, "type": "credit", "amount": "1.00", "description": "load credit"}
+        return "POST", f"{API}/transactions/", {"json": body, "headers": fixture.hot_parent_headers}
+
+    def debit():
+        body = {"child_id": fixture.hot_child_id, "type": "debit", "amount": "0.50", "description": "load debit"}
+        return "POST", f"{API}/transactions/", {"json": body, "headers": fixture.hot_parent_headers}
+
+    return {
+        "login_parent": login_parent,
+        "login_child": login_child,
+        "child_history": child_history,
+        "my_history": my_history,
+        "family_history": family_history,
+        "dashboard": dashboard,
+        "credit": credit,
+        "debit": debit,
+    }
+
+
+def parse_mix(spec: str, known: List[str]) -> Dict[str, float]:
+    """Parse "op=weight,..." into weights, rejecting unknown operations."""
+    weights = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in known:
+            raise SystemExit(f"unknown operation {name!r}; choose from {', '.join(known)}")
+        weights[name] = float(weight or 1)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    fixture: Fixture,
+    names: List[str],
+    weights: List[float],
+    rng: random.Random,
+    stop_at: float,
+    samples: Dict[str, List[Tuple[float, int]]]
+) -> None:
+    operations = _operations(fixture, rng)
+    while time.perf_counter() < stop_at:
+        name = rng.choices(names, weights)[0]
+        method, url, kwargs = operations[name]()
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            status_code = response.status_code
+        except httpx.HTTPError:
+            status_code = 0
+        samples[name].append((time.perf_counter() - started, status_code))
+
+
+async def run_load(
+    base_url: str,
+    transport: Optional[httpx.AsyncBaseTransport],
+    fixture: Fixture,
+    mix: Dict[str, float],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    seed: int
+) -> Tuple[Dict[str, List[Tuple[float, int]]], float]:
+    """Drive the workload and return latency samples per operation and the measured seconds."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits, timeout=60) as client:
+        async def run_workers(seconds: float, rng_seed: int, samples: Dict[str, List[Tuple[float, int]]]):
+            stop_at = time.perf_counter() + seconds
+            await asyncio.gather(*(
+                _worker(client, fixture, names, weights, random.Random(rng_seed + i), stop_at, samples)
+                for i in range(concurrency)
+            ))
+
+        if warmup > 0:
+            await run_workers(warmup, -seed - concurrency, {name: [] for name in names})
+
+        samples = {name: [] for name in names}
+        started = time.perf_counter()
+        await run_workers(duration, seed, samples)
+        elapsed = time.perf_counter() - started
+    return samples, elapsed
+
+
+def summarize(samples: List[Tuple[float, int]], elapsed: float) -> Dict[str, Any]:
+    """Latency percentiles (ms), throughput and status counts for one operation."""
+    latencies = sorted(latency for latency, _ in samples)
+    statuses: Dict[str, int] = {}
+    for _, status_code in samples:
+        statuses[str(status_code)] = statuses.get(str(status_code), 0) + 1
+    errors = sum(count for code, count in statuses.items() if not 200 <= int(code) < 400)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        "status": statuses,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_uvicorn() -> Tuple[subprocess.Popen, str]:
+    """Start uvicorn on the benchmark database and wait until it answers."""
+    port = _free_port()
+    env = dict(os.environ, MIGRATE_ON_STARTUP="false")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"uvicorn exited with {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}{API}/health", timeout=1).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    process.terminate()
+    raise SystemExit("uvicorn did not start within 30s")
+
+
+async def _run_inprocess(fixture: Fixture, args, mix) -> Tuple[Dict[str, List[Tuple[float, int]]], float]:
+    from src.main import app
+
+    async with app.router.lifespan_context(app):
+        return await run_load(
+            "http://loadtest", httpx.ASGITransport(app=app), fixture, mix,
+            args.concurrency, args.duration, args.warmup, args.seed
+        )
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], previous_path: Path) -> None:
+    """Print p50/p95/p99 and RPS changes against an earlier result file."""
+    previous = json.loads(previous_path.read_text())
+    rows = []
+    for name, stats in current["operations"].items():
+        before = previous.get("operations", {}).get(name)
+        if not before:
+            continue
+        row = [name]
+        for key in ("p50_ms", "p95_ms", "p99_ms", "rps"):
+            change = (stats[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            row.append(f"{before[key]} -> {stats[key]} ({change:+.1f}%)")
+        rows.append(row)
+    print(f"\ncompared with {previous_path} ({previous.get('git_commit') or 'unknown commit'})")
+    print_table(["operation", "p50 ms", "p95 ms", "p99 ms", "rps"], rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--server", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds before the run")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--families", type=int, default=10)
+    parser.add_argument("--children", type=int, default=3, help="children per family")
+    parser.add_argument("--transactions", type=int, default=200, help="seeded credits per child")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="operation weights, op=weight,...")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for operation choice")
+    parser.add_argument("--output", type=Path, help="result file (default benchmarks/results/load-<time>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    fixture = Fixture(args.families, args.children, args.transactions)
+    mix = parse_mix(args.mix, list(_operations(fixture, random.Random(0))))
+
+    if args.server == "uvicorn":
+        process, base_url = _start_uvicorn()
+        try:
+            samples, elapsed = asyncio.run(run_load(
+                base_url, None, fixture, mix, args.concurrency, args.duration, args.warmup, args.seed
+            ))
+        finally:
+            process.terminate()
+            process.wait()
+    else:
+        samples, elapsed = asyncio.run(_run_inprocess(fixture, args, mix))
+
+    operations = {name: summarize(samples[name], elapsed) for name in mix}
+    total = summarize([sample for name in mix for sample in samples[name]], elapsed)
+    result = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "config": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        "elapsed_seconds": round(elapsed, 3),
+        "operations": operations,
+        "total": total,
+    }
+
+    rows = [
+        [name, stats["requests"], stats["errors"], stats["rps"], stats["p50_ms"], stats["p95_ms"], stats["p99_ms"]]
+        for name, stats in list(operations.items()) + [("total", total)]
+    ]
+    print(f"{args.server}, {args.concurrency} clients, {elapsed:.1f}s")
+    print_table(["operation", "requests", "errors", "rps", "p50 ms", "p95 ms", "p99 ms"], rows)
+
+    output = args.output or RESULTS_DIR / f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"\nsaved {output}")
+
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Query plan review: EXPLAIN QUERY PLAN of every service query on a seeded database.
+
+The schema is built both ways the application gets one: by `alembic upgrade
+head` and from the models with create_all, so a model and its migrations
+cannot drift apart unnoticed. src.observability.query_plans.review_database
+seeds each database with families, transactions, notifications (mostly read)
+and invitations (mostly accepted), analyzes it, and checks every query in
+QUERY_PLANS for full scans, temp B-tree sorts, filters applied after the
+index lookup and the index it is expected to use.
+
+Flagged plans are printed with a suggested index. The exit status is 1 if
+any plan is flagged, so this doubles as the plan regression check to run
+after changing a model, an index or a statement.
+
+Usage:
+    python -m benchmarks.query_plans [--schema both|migrations|models] [--families N]
+        [--children N] [--transactions N] [--verbose]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from src.observability.query_plans import format_report, review_database
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--schema", choices=("both", "migrations", "models"), default="both")
+    parser.add_argument("--families", type=int, default=200)
+    parser.add_argument("--children", type=int, default=3, help="children per family")
+    parser.add_argument("--transactions", type=int, default=300, help="transactions per child")
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only flagged ones")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="piggybank-plans-")
+    flagged = 0
+    for schema in ("migrations", "models") if args.schema == "both" else (args.schema,):
+        reports = review_database(
+            os.path.join(directory, f"{schema}.db"), schema, args.families, args.children, args.transactions
+        )
+        print(f"\n== schema from {schema}: {sum(1 for r in reports if not r.problems)}/{len(reports)} plans ok")
+        for report in reports:
+            if report.problems or args.verbose:
+                print(format_report(report))
+        flagged += sum(1 for report in reports if report.problems)
+    if flagged:
+        print(f"\n{flagged} plan(s) flagged", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
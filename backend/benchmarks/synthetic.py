@@ -0,0 +1,263 @@
+"""
+Synthetic data generator: bulk-load realistic, chain-consistent history.
+
+Every child gets a time-ordered run of allowance/chore/gift credits and
+spending debits in which each row's balance_before equals the previous row's
+balance_after, debits never overdraw, and the child's balance equals the last
+balance_after. Output is fully determined by --seed.
+
+Rows are written with the stdlib sqlite3 module via executemany, with pragmas
+that are only safe while nothing else uses the file (no journal, no fsync,
+exclusive lock) and with the transactions indexes dropped during the load and
+rebuilt afterwards. The database is returned to WAL mode when done.
+
+Usage:
+    python -m benchmarks.synthetic --database /tmp/big.db [--families N] [--children N]
+        [--transactions N] [--seed N]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+# Only safe while the loader is the sole user of the file
+LOAD_PRAGMAS = (
+    "PRAGMA journal_mode=OFF",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA locking_mode=EXCLUSIVE",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-262144",
+)
+BATCH_SIZE = 50_000
+EPOCH = datetime(1970, 1, 1)
+
+CREDITS = (("allowance", "Weekly allowance", 500, 2000), ("chores", "Chores", 100, 1000), ("gift", "Birthday gift", 1000, 5000))
+DEBITS = (("toys", "Toy shop", 200, 3000), ("snacks", "Snacks", 50, 500), ("books", "Books", 300, 1500))
+AVATARS = ("🐷", "🦊", "🐼", "🐸", "🦁", "🐧")
+
+
+class SyntheticData(NamedTuple):
+    """Ids of the loaded rows, for benchmarks to pick targets from."""
+    family_ids: List[str]
+    parents: List[Tuple[str, str, str]]   # (id, username, family_id)
+    children: List[Tuple[str, str, str]]  # (id, username, family_id)
+    transactions: int
+    seconds: float
+
+
+def _uuid(rng: random.Random) -> str:
+    # uuid4 layout from the seeded generator; uuid.UUID() is several times slower
+    h = "%032x" % rng.getrandbits(128)
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{'89ab'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:]}"
+
+
+def _uuid7(rng: random.Random, ms: int) -> str:
+    # UUIDv7 for a row created at `ms` (Unix milliseconds), as src.models.ids generates them
+    h = "%032x" % ((ms << 80) | (0x7 << 76) | (rng.getrandbits(12) << 64) | (0b10 << 62) | rng.getrandbits(62))
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _blob(value: str) -> bytes:
+    # 16-byte storage form of a text id, as BinaryUUID binds it
+    return bytes.fromhex(value.replace("-", ""))
+
+
+def _timestamp(moment: datetime) -> str:
+    # SQLAlchemy's SQLite DateTime storage format
+    return moment.isoformat(" ", "microseconds")
+
+
+def _history(
+    rng: random.Random,
+    child_id: str,
+    parent_id: str,
+    count: int,
+    end: datetime,
+    days: Dict[int, str],
+    time_ordered_ids: bool = False,
+    key: Callable[[str], object] = _blob
+) -> Tuple[List[tuple], int]:
+    """
+    One child's transactions, oldest first, and the final balance in cents.
+
+    Timestamps are built from integer microseconds, with formatted dates
+    cached in `days` across children. With `time_ordered_ids` the ids are
+    UUIDv7s derived from each row's timestamp. Ids are stored as key(text).
+    """
+    child_id, parent_id = key(child_id), key(parent_id)
+    random_ = rng.random
+    # Roughly a dozen transactions a week ending at `end`, in microseconds
+    gaps = [int(600_000_000 + random_() * 99_400_000_000) for _ in range(count)]
+    end_us = int((end - EPOCH).total_seconds()) * 1_000_000
+    moment = end_us - sum(gaps)
+    balance = 0
+    rows = []
+    append = rows.append
+    for gap in gaps:
+        moment += gap
+        day, rest = divmod(moment, 86_400_000_000)
+        date = days.get(day)
+        if date is None:
+            date = days[day] = (EPOCH + timedelta(days=day)).strftime("%Y-%m-%d")
+        seconds, micros = divmod(rest, 1_000_000)
+        minutes, second = divmod(seconds, 60)
+        hour, minute = divmod(minutes, 60)
+        if balance >= 50 and random_() < 0.4:
+            category, description, low, high = DEBITS[int(random_() * 3)]
+            amount = min(balance, low + int(random_() * (high - low)))
+            kind, after = "DEBIT", balance - amount
+        else:
+            category, description, low, high = CREDITS[int(random_() * 3)]
+            amount = low + int(random_() * (high - low))
+            kind, after = "CREDIT", balance + amount
+        append((
+            key(_uuid7(rng, moment // 1000) if time_ordered_ids else _uuid(rng)), child_id, parent_id, kind, amount / 100, balance / 100, after / 100,
+            description, category, "%s %02d:%02d:%02d.%06d" % (date, hour, minute, second, micros)
+        ))
+        balance = after
+    return rows, balance
+
+
+def _clear(conn: sqlite3.Connection) -> None:
+    for table in ("notifications", "requests", "invitations", "transactions", "children", "parent_admins", "families"):
+        conn.execute(f"DELETE FROM {table}")
+
+
+def load(
+    path: str,
+    families: int,
+    children_per_family: int,
+    transactions_per_child: int,
+    password_hash: str,
+    seed: int = 0,
+    replace: bool = True,
+    time_ordered_ids: bool = False,
+    binary_ids: bool = True
+) -> SyntheticData:
+    """
+    Bulk-load synthetic families, parents, children and transactions.
+
+    The schema must already exist and no other connection may have the file
+    open (dispose the application engine first).
+
+    Args:
+        path: SQLite database file
+        families: Number of families, each with one owner parent
+        children_per_family: Children per family
+        transactions_per_child: Transactions per child
+        password_hash: bcrypt hash stored for every parent and child
+        seed: Random seed; the same seed produces the same rows
+        replace: Delete existing rows first
+        time_ordered_ids: Give transactions UUIDv7 ids from their timestamps instead of random ones
+        binary_ids: Store ids as 16-byte BLOBs, as the schema does since migration
+            004_binary_ids; False writes 36-character text for older schemas
+
+    Returns:
+        SyntheticData with the generated ids (in text form)
+    """
+    key = _blob if binary_ids else str
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1)
+    created = _timestamp(now - timedelta(days=3 * 365))
+    loaded = _timestamp(now)
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        for pragma in LOAD_PRAGMAS:
+            conn.execute(pragma)
+        conn.execute("BEGIN")
+        if replace:
+            _clear(conn)
+        indexes = conn.execute(
+            "SELECT name, sql FROM sqlite_master "
+            "WHERE type = 'index' AND tbl_name = 'transactions' AND sql IS NOT NULL"
+        ).fetchall()
+        for name, _ in indexes:
+            conn.execute(f'DROP INDEX "{name}"')
+
+        family_rows, parent_rows, child_rows = [], [], []
+        days: Dict[int, str] = {}
+        data = SyntheticData([], [], [], 0, 0.0)
+        batch: List[tuple] = []
+        total = 0
+        insert_transactions = (
+            "INSERT INTO transactions (id, child_id, parent_admin_id, type, amount, balance_before, "
+            "balance_after, description, category, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+        for f in range(families):
+            family_id, parent_id = _uuid(rng), _uuid(rng)
+            family_rows.append((key(family_id), f"{seed % 256:02X}{f:06X}", f"Family {f}", 0, created, loaded))
+            username = f"parent_{seed}_{f}"
+            parent_rows.append((key(parent_id), key(family_id), username, f"Parent {f}", password_hash, "OWNER", created, loaded))
+            data.family_ids.append(family_id)
+            data.parents.append((parent_id, username, family_id))
+
+            for c in range(children_per_family):
+                child_id = _uuid(rng)
+                rows, balance = _history(
+                    rng, child_id, parent_id, transactions_per_child, now, days, time_ordered_ids, key
+                )
+                username = f"child_{seed}_{f}_{c}"
+                child_rows.append((
+                    key(child_id), key(family_id), username, f"Child {f}.{c}", password_hash,
+                    AVATARS[rng.randrange(len(AVATARS))], rng.randint(5, 15), balance / 100,
+                    len(rows), created, loaded
+                ))
+                data.children.append((child_id, username, family_id))
+                batch.extend(rows)
+                if len(batch) >= BATCH_SIZE:
+                    conn.executemany(insert_transactions, batch)
+                    total += len(batch)
+                    batch = []
+
+        conn.executemany(insert_transactions, batch)
+        total += len(batch)
+        conn.executemany("INSERT INTO families (id, family_code, name, version, created_at, updated_at) "
+                         "VALUES (?, ?, ?, ?, ?, ?)", family_rows)
+        conn.executemany("INSERT INTO parent_admins (id, family_id, username, name, password_hash, role, "
+                         "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", parent_rows)
+        conn.executemany("INSERT INTO children (id, family_id, username, name, password_hash, avatar, age, "
+                         "balance, version, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         child_rows)
+
+        for _, sql in indexes:
+            conn.execute(sql)
+        conn.execute("COMMIT")
+
+        # Back to the application's settings; locking_mode takes effect on the next access
+        conn.execute("PRAGMA locking_mode=NORMAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.execute("PRAGMA journal_mode=WAL")
+    finally:
+        conn.close()
+
+    return data._replace(transactions=total, seconds=time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database", help="SQLite file to load (default: the benchmark temp database)")
+    parser.add_argument("--families", type=int, default=1000)
+    parser.add_argument("--children", type=int, default=3, help="children per family")
+    parser.add_argument("--transactions", type=int, default=1000, help="transactions per child")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.database:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.abspath(args.database)}"
+    from benchmarks.common import PASSWORD_HASH, create_schema, engine
+
+    create_schema()
+    engine.dispose()
+    data = load(engine.url.database, args.families, args.children, args.transactions, PASSWORD_HASH, args.seed)
+    print(f"loaded {len(data.family_ids)} families, {len(data.children)} children and "
+          f"{data.transactions:,} transactions into {engine.url.database} in {data.seconds:.1f}s "
+          f"({data.transactions / data.seconds:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import asyncio
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from src.config.settings import settings
+from src.observability import (
+    diff_snapshots,
+    identity_map_stats,
+    list_snapshots,
+    route_peaks,
+    start_tracing,
+    stop_tracing,
+    take_snapshot,
+    tracing_status,
+)
+
+
+async def require_admin_token(authorization: Optional[str] = Header(None)) -> None:
+    """
+    Dependency that admits only requests bearing ADMIN_TOKEN.
+
+    The admin API is hidden (404) when no token is configured.
+    """
+    if not settings.admin_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    expected = f"Bearer {settings.admin_token}"
+    if authorization is None or not hmac.compare_digest(authorization.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin token")
+
+
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/memory")
+async def memory_report():
+    """
+    Memory overview: tracemalloc status, stored snapshots, identity maps of
+    live sessions, and peak allocation per route since tracing started.
+    """
+    return {
+        "tracemalloc": tracing_status(),
+        "snapshots": [info._asdict() for info in list_snapshots()],
+        "identity_maps": identity_map_stats(),
+        "routes": route_peaks(),
+    }
+
+
+@router.post("/memory/tracing")
+async def start_memory_tracing(frames: int = Query(settings.memory_trace_frames, ge=1, le=100)):
+    """Start tracemalloc. Every allocation is slower until tracing stops."""
+    started = start_tracing(frames)
+    return {"started": started, **tracing_status()}
+
+
+@router.delete("/memory/tracing")
+async def stop_memory_tracing():
+    """Stop tracemalloc and discard stored snapshots and route peaks."""
+    stop_tracing()
+    return tracing_status()
+
+
+@router.post("/memory/snapshots", status_code=status.HTTP_201_CREATED)
+async def create_memory_snapshot():
+    """Take a tracemalloc snapshot to diff against later ones."""
+    try:
+        # Walking every traced block takes a while; keep it off the event loop
+        info = await asyncio.to_thread(take_snapshot)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return info._asdict()
+
+
+@router.get("/memory/snapshots/{old_id}/diff/{new_id}")
+async def diff_memory_snapshots(
+    old_id: int,
+    new_id: int,
+    key: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    limit: int = Query(25, ge=1, le=500)
+):
+    """Allocation sites that changed the most between two snapshots."""
+    try:
+        return await asyncio.to_thread(diff_snapshots, old_id, new_id, key, limit)
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Snapshot not found")
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from src.config.database import get_db
-from src.services import FamilyService, AuthService
+from src.services import FamilyService, AuthService, run_write
 from src.api.v1.schemas import RegisterFamilyRequest, LoginRequest, AuthResponse
 
 router = APIRouter()
@@ -19,7 +19,9 @@ async def register_family(
     Returns authentication token and family code.
     """
     try:
-        family, parent = FamilyService.create_family(
+        family, parent = await run_write(
+            db,
+            FamilyService.create_family,
             db=db,
             family_name=request.family_name,
             parent_username=request.parent_username,
@@ -1,11 +1,26 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import csv
+import io
+import json
+from typing import Any, Dict, List, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from src.config.database import get_db
-from src.services import ChildService
-from src.auth import get_current_parent
+from src.config.settings import settings
+from src.services import ChildService, run_write
+from src.auth import auth_provider, get_current_parent, get_parent_scope, ParentScope
 from src.models.parent_admin import ParentAdmin
-from src.api.v1.schemas import CreateChildRequest, UpdateChildRequest, ChildResponse
+from src.api.v1.schemas import (
+    CreateChildRequest,
+    UpdateChildRequest,
+    ChildResponse,
+    ImportChildrenResponse,
+    child_rows_adapter,
+    child_records_adapter,
+    import_children_adapter,
+)
+from src.api.v1.responses import rows_response, version_etag, not_modified
 
 router = APIRouter()
 
@@ -22,7 +37,9 @@ async def create_child(
     Requires parent authentication.
     """
     try:
-        child = ChildService.create_child(
+        child = await run_write(
+            db,
+            ChildService.create_child,
             db=db,
             family_id=current_parent.family_id,
             username=request.username,
@@ -41,18 +58,97 @@ async def create_child(
         )
 
 
+@router.post(
+    "/import",
+    response_model=ImportChildrenResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+        }
+    }
+)
+async def import_children(
+    http_request: Request,
+    all_or_nothing: bool = Query(False, description="Create nothing if any row is rejected"),
+    db: Session = Depends(get_db),
+    scope: ParentScope = Depends(get_parent_scope)
+):
+    """
+    Create many child accounts from a CSV file or JSON array.
+
+    CSV input needs a header row with username, name and password (or pin)
+    columns, and optional avatar and age columns. JSON input is an array of
+    CreateChildRequest objects, or an object with a "children" array.
+
+    Valid rows are created together in one transaction; rejected rows are
+    reported with their 1-based row number. Requires parent authentication.
+    """
+    raw_rows = _parse_import_body(
+        http_request.headers.get("content-type", ""),
+        await http_request.body()
+    )
+    if len(raw_rows) > settings.child_import_max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Imports are limited to {settings.child_import_max_rows} rows"
+        )
+
+    entries, errors = _validate_import_rows(raw_rows)
+    if errors and all_or_nothing:
+        return rows_response(import_children_adapter, {"created": [], "errors": errors})
+
+    accepted, rejected = ChildService.screen_import(db, entries)
+    errors = sorted(errors + rejected, key=lambda error: error["row"])
+    if not accepted or (errors and all_or_nothing):
+        return rows_response(import_children_adapter, {"created": [], "errors": errors})
+
+    # Hash before the write: bcrypt takes seconds for a large import, which must not
+    # use up the retry deadline, be repeated on a retry or hold up the shutdown drain
+    password_hashes = await asyncio.to_thread(
+        auth_provider.hash_passwords, [entry["password"] for entry in accepted]
+    )
+    try:
+        created = await run_write(
+            db,
+            ChildService.import_children,
+            db=db,
+            family_id=scope.family_id,
+            entries=accepted,
+            password_hashes=password_hashes
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+    return rows_response(import_children_adapter, {"created": created, "errors": errors})
+
+
 @router.get("/", response_model=List[ChildResponse])
 async def get_children(
+    request: Request,
     db: Session = Depends(get_db),
-    current_parent: ParentAdmin = Depends(get_current_parent)
+    scope: ParentScope = Depends(get_parent_scope)
 ):
     """
     Get all children in the parent's family.
 
-    Requires parent authentication.
+    Requires parent authentication. Supports conditional GET via the family's
+    version ETag.
     """
-    children = ChildService.get_children_by_family(db, current_parent.family_id)
-    return [ChildResponse.from_orm(child) for child in children]
+    etag = version_etag("children", scope.family_id, scope.family_version)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    records = settings.lightweight_rows
+    rows = ChildService.get_child_rows_by_family(db, scope.family_id, records=records)
+    return rows_response(child_records_adapter if records else child_rows_adapter, rows, etag=etag)
 
 
 @router.get("/{child_id}", response_model=ChildResponse)
@@ -66,7 +162,7 @@ async def get_child(
 
     Requires parent authentication and child must be in parent's family.
     """
-    child = ChildService.get_child_by_id(db, child_id)
+    child = ChildService.get_child_snapshot(db, child_id)
 
     if not child:
         raise HTTPException(
@@ -97,7 +193,7 @@ async def update_child(
     Requires parent authentication and child must be in parent's family.
     """
     # Verify child exists and belongs to parent's family
-    child = ChildService.get_child_by_id(db, child_id)
+    child = ChildService.get_child_snapshot(db, child_id)
 
     if not child:
         raise HTTPException(
@@ -113,7 +209,9 @@ async def update_child(
 
     # Update child
     try:
-        updated_child = ChildService.update_child(
+        updated_child = await run_write(
+            db,
+            ChildService.update_child,
             db=db,
             child_id=child_id,
             name=request.name,
@@ -148,7 +246,7 @@ async def delete_child(
     Requires parent authentication and child must be in parent's family.
     """
     # Verify child exists and belongs to parent's family
-    child = ChildService.get_child_by_id(db, child_id)
+    child = ChildService.get_child_snapshot(db, child_id)
 
     if not child:
         raise HTTPException(
@@ -163,7 +261,7 @@ async def delete_child(
         )
 
     # Delete child
-    success = ChildService.delete_child(db, child_id)
+    success = await run_write(db, ChildService.delete_child, db, child_id)
 
     if not success:
         raise HTTPException(
@@ -172,3 +270,49 @@ async def delete_child(
         )
 
     return None
+
+
+def _parse_import_body(content_type: str, body: bytes) -> List[Dict[str, Any]]:
+    """Decode an import payload into one dict per row."""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    try:
+        if media_type == "text/csv":
+            reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+            return [
+                {key.strip().lower(): (value.strip() or None) if value else None for key, value in row.items() if key}
+                for row in reader
+            ]
+        if media_type in ("application/json", ""):
+            data = json.loads(body)
+            if isinstance(data, dict):
+                data = data.get("children")
+            if isinstance(data, list) and all(isinstance(row, dict) for row in data):
+                return data
+            raise ValueError("Expected an array of child objects")
+    except (UnicodeDecodeError, ValueError, csv.Error) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid import file: {e}"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Send text/csv or application/json"
+    )
+
+
+def _validate_import_rows(raw_rows: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Validate each row against CreateChildRequest, collecting per-row errors."""
+    entries, errors = [], []
+    for number, raw in enumerate(raw_rows, start=1):
+        if "password" not in raw and "pin" in raw:
+            raw = {**raw, "password": raw["pin"]}
+        try:
+            child = CreateChildRequest(**raw)
+        except ValidationError as e:
+            message = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )
+            errors.append({"row": number, "username": raw.get("username"), "error": message})
+            continue
+        entries.append({"row": number, **child.model_dump()})
+    return entries, errors
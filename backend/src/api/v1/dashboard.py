@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from src.config.database import get_db
+from src.services import DashboardService
+from src.auth import get_parent_scope, get_current_child, ParentScope
+from src.models import ChildSnapshot
+from src.api.v1.schemas import (
+    ParentDashboardResponse,
+    ChildDashboardResponse,
+    parent_dashboard_adapter,
+    child_dashboard_adapter,
+)
+from src.api.v1.responses import rows_response
+
+router = APIRouter()
+
+
+@router.get("/parent", response_model=ParentDashboardResponse)
+async def get_parent_dashboard(
+    recent: int = Query(5, ge=0, le=20),
+    db: Session = Depends(get_db),
+    scope: ParentScope = Depends(get_parent_scope)
+):
+    """
+    Get the parent dashboard in one round trip.
+
+    Returns every child with its balance and last `recent` transactions, the
+    family's total balance, the parent's unread notification count and pending
+    invitations. Uses a fixed number of queries regardless of family size.
+
+    Requires parent authentication.
+    """
+    dashboard = DashboardService.get_parent_dashboard(
+        db=db,
+        parent_id=scope.parent_id,
+        family_id=scope.family_id,
+        recent=recent
+    )
+    return rows_response(parent_dashboard_adapter, dashboard)
+
+
+@router.get("/child", response_model=ChildDashboardResponse)
+async def get_child_dashboard(
+    recent: int = Query(5, ge=0, le=20),
+    db: Session = Depends(get_db),
+    child: ChildSnapshot = Depends(get_current_child)
+):
+    """
+    Get the child dashboard in one round trip.
+
+    Returns the child's profile and balance, last `recent` transactions and
+    unread notification count.
+
+    Requires child authentication.
+    """
+    dashboard = DashboardService.get_child_dashboard(db=db, child=child, recent=recent)
+    return rows_response(child_dashboard_adapter, dashboard)
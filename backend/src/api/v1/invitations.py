@@ -1,5 +1,4 @@
 from typing import List
-import uuid
 import secrets
 import string
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -8,6 +7,7 @@ from src.config.database import get_db
 from src.auth import get_current_parent
 from src.models.parent_admin import ParentAdmin
 from src.models.invitation import Invitation, InvitationStatus
+from src.models.ids import new_id
 from src.api.v1.schemas import InvitationResponse
 
 router = APIRouter()
@@ -52,7 +52,7 @@ async def create_invitation(
 
     # Create invitation
     invitation = Invitation(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         family_id=current_parent.family_id,
         invite_code=invite_code,
         created_by_parent_id=current_parent.id,
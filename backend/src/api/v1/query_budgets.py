@@ -0,0 +1,78 @@
+"""
+Declared statement budgets per route, keyed by method and path template.
+
+MetricsMiddleware logs a warning when a request runs more statements than its
+route's budget; assert_route_budget() turns the same check into a test failure
+so N+1 patterns cannot creep back in unnoticed.
+
+Usage:
+    response = assert_route_budget(client, "GET", "/api/v1/children/", headers=headers)
+"""
+from typing import Any, Dict, Tuple
+from starlette.routing import Match
+from src.config.settings import settings
+from src.observability import query_budget
+
+_API = settings.api_v1_prefix
+
+QUERY_BUDGETS: Dict[Tuple[str, str], int] = {
+    # Auth
+    ("POST", f"{_API}/auth/register"): 7,
+    ("POST", f"{_API}/auth/login/parent"): 1,
+    ("POST", f"{_API}/auth/login/child"): 1,
+    # Children
+    ("POST", f"{_API}/children/"): 5,
+    ("GET", f"{_API}/children/"): 2,
+    ("GET", f"{_API}/children/{{child_id}}"): 2,
+    ("PATCH", f"{_API}/children/{{child_id}}"): 7,
+    ("DELETE", f"{_API}/children/{{child_id}}"): 9,
+    # Transactions: scope, BEGIN IMMEDIATE, child, two version bumps, insert, refresh
+    ("POST", f"{_API}/transactions/"): 7,
+    ("GET", f"{_API}/transactions/{{transaction_id}}"): 2,
+    ("GET", f"{_API}/transactions/child/{{child_id}}"): 3,
+    ("GET", f"{_API}/transactions/family"): 2,
+    ("GET", f"{_API}/transactions/my-transactions"): 2,
+    # Dashboards: fixed regardless of family size
+    ("GET", f"{_API}/dashboard/parent"): 5,
+    ("GET", f"{_API}/dashboard/child"): 3,
+    # Invitations
+    ("POST", f"{_API}/invitations/"): 5,
+    ("GET", f"{_API}/invitations/"): 2,
+}
+
+
+def route_template(app: Any, method: str, path: str) -> str:
+    """
+    Resolve a request path to the path template of the route serving it.
+
+    Raises:
+        LookupError: If no route matches
+    """
+    scope = {"type": "http", "method": method, "path": path}
+    for route in app.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    raise LookupError(f"No route matches {method} {path}")
+
+
+def assert_route_budget(client: Any, method: str, url: str, **kwargs: Any) -> Any:
+    """
+    Send a request through a test client and fail if it exceeds its route's budget.
+
+    Args:
+        client: Starlette/FastAPI TestClient for the app
+        method: HTTP method
+        url: Request path, optionally with a query string
+        **kwargs: Passed to client.request (json, headers, ...)
+
+    Returns:
+        The response
+
+    Raises:
+        QueryBudgetExceeded: If the request ran more statements than declared
+        KeyError: If the route has no declared budget
+    """
+    key = (method, route_template(client.app, method, url.split("?", 1)[0]))
+    with query_budget(QUERY_BUDGETS[key], label=f"{method} {key[1]}"):
+        return client.request(method, url, **kwargs)
@@ -0,0 +1,46 @@
+from typing import Any, Dict, List, Optional, Union
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+from src.observability import phase
+
+# Cacheable per user, but always revalidated with If-None-Match
+CACHE_CONTROL = "private, no-cache"
+
+
+def rows_response(adapter: TypeAdapter, rows: Union[List[Any], Dict[str, Any]], etag: Optional[str] = None) -> Response:
+    """
+    Serialize database rows straight to a JSON response.
+
+    Returning a Response skips FastAPI's response_model validation, so rows are
+    encoded exactly once by pydantic-core. The route's response_model still
+    documents the payload in OpenAPI.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL} if etag else None
+    with phase("serialize"):
+        content = adapter.dump_json(rows)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def version_etag(kind: str, entity_id: str, version: int) -> str:
+    """Strong ETag for a representation derived from an entity's version counter."""
+    return f'"{kind}-{entity_id}-{version}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """
+    Answer a conditional GET whose If-None-Match matches `etag`.
+
+    Returns:
+        A 304 response if the client's copy is current, None otherwise
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    if header.strip() != "*" and all(
+        tag.strip().removeprefix("W/") != etag for tag in header.split(",")
+    ):
+        return None
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
@@ -1,7 +1,11 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional
+from pydantic import BaseModel, Field, TypeAdapter, validator
+from typing import List, Optional
+from typing_extensions import TypedDict
 from datetime import datetime
 from decimal import Decimal
+from src.models.transaction import TransactionType
+from src.models.invitation import InvitationStatus
+from src.models.records import ChildRecord, TransactionRecord
 
 
 # Auth schemas
@@ -51,6 +55,17 @@ class ChildResponse(BaseModel):
         from_attributes = True
 
 
+class ChildRow(TypedDict):
+    """ChildResponse fields as selected by the list query."""
+    id: str
+    username: str
+    name: str
+    avatar: Optional[str]
+    age: Optional[int]
+    balance: Decimal
+    created_at: datetime
+
+
 # Transaction schemas
 class CreateTransactionRequest(BaseModel):
     child_id: str
@@ -89,6 +104,108 @@ class TransactionResponse(BaseModel):
         return v
 
 
+class TransactionRow(TypedDict):
+    """TransactionResponse fields as selected by the list queries."""
+    id: str
+    child_id: str
+    parent_admin_id: Optional[str]
+    type: TransactionType
+    amount: Decimal
+    balance_before: Decimal
+    balance_after: Decimal
+    description: Optional[str]
+    category: Optional[str]
+    created_at: datetime
+
+
+class PartialTransactionRow(TypedDict, total=False):
+    """TransactionRow restricted to the fields requested with ?fields=."""
+    id: str
+    child_id: str
+    parent_admin_id: Optional[str]
+    type: TransactionType
+    amount: Decimal
+    balance_before: Decimal
+    balance_after: Decimal
+    description: Optional[str]
+    category: Optional[str]
+    created_at: datetime
+
+
+class TransactionColumns(TypedDict, total=False):
+    """
+    Columnar transaction history: one array per selected field.
+
+    created_at holds millisecond deltas from the previous row, starting from
+    created_at_base (epoch milliseconds).
+    """
+    count: int
+    created_at_base: Optional[int]
+    id: List[str]
+    child_id: List[str]
+    parent_admin_id: List[Optional[str]]
+    type: List[TransactionType]
+    amount: List[Decimal]
+    balance_before: List[Decimal]
+    balance_after: List[Decimal]
+    description: List[Optional[str]]
+    category: List[Optional[str]]
+    created_at: List[int]
+
+
+class InvitationRow(TypedDict):
+    """InvitationResponse fields as selected by the dashboard query."""
+    id: str
+    invite_code: str
+    status: InvitationStatus
+    created_at: datetime
+
+
+# Bulk import schemas
+class ImportErrorRow(TypedDict):
+    row: int  # 1-based position among the imported rows
+    username: Optional[str]
+    error: str
+
+
+class ImportChildrenResponse(TypedDict):
+    created: List[ChildRow]
+    errors: List[ImportErrorRow]
+
+
+# Dashboard schemas
+class ChildSummaryRow(ChildRow):
+    """A child with its most recent transactions."""
+    recent_transactions: List[TransactionRow]
+
+
+class ParentDashboardResponse(TypedDict):
+    children: List[ChildSummaryRow]
+    total_balance: Decimal
+    unread_notifications: int
+    pending_invitations: List[InvitationRow]
+
+
+class ChildDashboardResponse(TypedDict):
+    child: ChildRow
+    recent_transactions: List[TransactionRow]
+    unread_notifications: int
+
+
+# Serializers for trusted database rows: dump_json emits the same JSON as the
+# response models without building or validating model instances
+child_rows_adapter = TypeAdapter(List[ChildRow])
+child_records_adapter = TypeAdapter(List[ChildRecord])
+transaction_row_adapter = TypeAdapter(TransactionRow)
+transaction_rows_adapter = TypeAdapter(List[TransactionRow])
+transaction_records_adapter = TypeAdapter(List[TransactionRecord])
+partial_transaction_rows_adapter = TypeAdapter(List[PartialTransactionRow])
+transaction_columns_adapter = TypeAdapter(TransactionColumns)
+import_children_adapter = TypeAdapter(ImportChildrenResponse)
+parent_dashboard_adapter = TypeAdapter(ParentDashboardResponse)
+child_dashboard_adapter = TypeAdapter(ChildDashboardResponse)
+
+
 # Invitation schemas
 class InvitationResponse(BaseModel):
     id: str
@@ -1,62 +1,78 @@
-from typing import List
+from typing import List, Optional, Union
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.orm import Session
-from src.config.database import get_db
-from src.services import TransactionService, ChildService
-from src.auth import get_current_parent, get_current_child
-from src.models.parent_admin import ParentAdmin
-from src.models.child import Child
+from src.config.database import get_db, get_read_db, is_replica_session
+from src.config.settings import settings
+from src.services import TransactionService, ChildService, ChildNotFoundError, ChildAccessDeniedError, run_write
+from src.auth import get_parent_scope, get_child_scope, ParentScope, ChildScope
 from src.models.transaction import TransactionType
-from src.api.v1.schemas import CreateTransactionRequest, TransactionResponse
+from src.api.v1.schemas import (
+    CreateTransactionRequest,
+    TransactionResponse,
+    TransactionColumns,
+    transaction_row_adapter,
+    transaction_rows_adapter,
+    transaction_records_adapter,
+    partial_transaction_rows_adapter,
+    transaction_columns_adapter,
+)
+from src.api.v1.responses import rows_response, version_etag, not_modified
 
 router = APIRouter()
 
+ROWS_MAX_LIMIT = 100
+COLUMNAR_MAX_LIMIT = 2000  # A few years of daily history for charts
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return, e.g. created_at,balance_after"
+FORMAT_DESCRIPTION = "rows (default) or columnar: parallel arrays with delta-encoded timestamps"
+
+# ?format=columnar returns TransactionColumns instead of a list of rows
+ChildHistoryResponse = Union[List[TransactionResponse], TransactionColumns]
+
 
 @router.post("/", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
 async def create_transaction(
     request: CreateTransactionRequest,
     db: Session = Depends(get_db),
-    current_parent: ParentAdmin = Depends(get_current_parent)
+    scope: ParentScope = Depends(get_parent_scope)
 ):
     """
     Create a new transaction (deposit or deduction) for a child.
 
     Requires parent authentication. Uses pessimistic locking to ensure
-    balance consistency.
+    balance consistency; the child's family is checked under the lock.
     """
-    # Verify child exists and belongs to parent's family
-    child = ChildService.get_child_by_id(db, request.child_id)
-
-    if not child:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Child not found"
-        )
-
-    if child.family_id != current_parent.family_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-
     # Parse transaction type
     transaction_type = TransactionType.CREDIT if request.type == "credit" else TransactionType.DEBIT
 
     # Create transaction
     try:
-        transaction = TransactionService.create_transaction(
+        transaction = await run_write(
+            db,
+            TransactionService.create_transaction,
             db=db,
             child_id=request.child_id,
-            parent_admin_id=current_parent.id,
+            parent_admin_id=scope.parent_id,
             transaction_type=transaction_type,
             amount=request.amount,
             description=request.description,
-            category=request.category
+            category=request.category,
+            family_id=scope.family_id
         )
 
         return TransactionResponse.from_orm(transaction)
 
+    except ChildNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Child not found"
+        )
+    except ChildAccessDeniedError:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -64,21 +80,30 @@ async def create_transaction(
         )
 
 
-@router.get("/child/{child_id}", response_model=List[TransactionResponse])
+@router.get("/child/{child_id}", response_model=ChildHistoryResponse)
 async def get_child_transactions(
+    request: Request,
     child_id: str,
-    limit: int = Query(50, ge=1, le=100),
+    limit: int = Query(50, ge=1, le=COLUMNAR_MAX_LIMIT),
     offset: int = Query(0, ge=0),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    response_format: str = Query("rows", alias="format", pattern="^(rows|columnar)$", description=FORMAT_DESCRIPTION),
     db: Session = Depends(get_db),
-    current_parent: ParentAdmin = Depends(get_current_parent)
+    read_db: Session = Depends(get_read_db),
+    scope: ParentScope = Depends(get_parent_scope)
 ):
     """
     Get transactions for a specific child.
 
     Requires parent authentication. Child must be in parent's family.
+    Supports conditional GET via the child's version ETag, `?fields=` to
+    select columns and `?format=columnar` for chart data (up to
+    COLUMNAR_MAX_LIMIT rows).
     """
+    _check_limit(limit, response_format)
+
     # Verify child exists and belongs to parent's family
-    child = ChildService.get_child_by_id(db, child_id)
+    child = ChildService.get_child_snapshot(db, child_id)
 
     if not child:
         raise HTTPException(
@@ -86,78 +111,98 @@ async def get_child_transactions(
             detail="Child not found"
         )
 
-    if child.family_id != current_parent.family_id:
+    if child.family_id != scope.family_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
         )
 
-    transactions = TransactionService.get_transactions_by_child(
-        db=db,
-        child_id=child_id,
-        limit=limit,
-        offset=offset
-    )
+    etag = version_etag("child", child_id, child.version)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
 
-    return [TransactionResponse.from_orm(t) for t in transactions]
+    return _child_history_response(read_db, child_id, limit, offset, fields, response_format, etag)
 
 
 @router.get("/family", response_model=List[TransactionResponse])
 async def get_family_transactions(
-    limit: int = Query(50, ge=1, le=100),
+    request: Request,
+    limit: int = Query(50, ge=1, le=ROWS_MAX_LIMIT),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
-    current_parent: ParentAdmin = Depends(get_current_parent)
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    read_db: Session = Depends(get_read_db),
+    scope: ParentScope = Depends(get_parent_scope)
 ):
     """
     Get all transactions for the parent's family.
 
-    Requires parent authentication.
+    Requires parent authentication. Supports conditional GET via the family's
+    version ETag and `?fields=` to select columns.
     """
-    transactions = TransactionService.get_transactions_by_family(
-        db=db,
-        family_id=current_parent.family_id,
-        limit=limit,
-        offset=offset
-    )
+    etag = version_etag("family", scope.family_id, scope.family_version)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
 
-    return [TransactionResponse.from_orm(t) for t in transactions]
+    selected = _parse_fields(fields)
+    try:
+        rows = TransactionService.get_transaction_rows_by_family(
+            db=read_db,
+            family_id=scope.family_id,
+            limit=limit,
+            offset=offset,
+            fields=selected,
+            records=settings.lightweight_rows
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
+    return rows_response(_rows_adapter(selected), rows, etag=None if is_replica_session(read_db) else etag)
 
-@router.get("/my-transactions", response_model=List[TransactionResponse])
+
+@router.get("/my-transactions", response_model=ChildHistoryResponse)
 async def get_my_transactions(
-    limit: int = Query(50, ge=1, le=100),
+    request: Request,
+    limit: int = Query(50, ge=1, le=COLUMNAR_MAX_LIMIT),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
-    current_child: Child = Depends(get_current_child)
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    response_format: str = Query("rows", alias="format", pattern="^(rows|columnar)$", description=FORMAT_DESCRIPTION),
+    read_db: Session = Depends(get_read_db),
+    scope: ChildScope = Depends(get_child_scope)
 ):
     """
     Get transactions for the authenticated child.
 
-    Requires child authentication.
+    Requires child authentication. Supports conditional GET via the child's
+    version ETag, `?fields=` to select columns and `?format=columnar` for
+    chart data.
     """
-    transactions = TransactionService.get_transactions_by_child(
-        db=db,
-        child_id=current_child.id,
-        limit=limit,
-        offset=offset
-    )
+    _check_limit(limit, response_format)
+
+    etag = version_etag("child", scope.child_id, scope.version)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
 
-    return [TransactionResponse.from_orm(t) for t in transactions]
+    return _child_history_response(read_db, scope.child_id, limit, offset, fields, response_format, etag)
 
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
 async def get_transaction(
     transaction_id: str,
     db: Session = Depends(get_db),
-    current_parent: ParentAdmin = Depends(get_current_parent)
+    scope: ParentScope = Depends(get_parent_scope)
 ):
     """
     Get a specific transaction by ID.
 
     Requires parent authentication. Transaction must be in parent's family.
     """
-    transaction = TransactionService.get_transaction_by_id(db, transaction_id)
+    transaction = TransactionService.get_transaction_row(db, transaction_id)
 
     if not transaction:
         raise HTTPException(
@@ -166,12 +211,74 @@ async def get_transaction(
         )
 
     # Verify transaction belongs to parent's family
-    child = ChildService.get_child_by_id(db, transaction.child_id)
-
-    if not child or child.family_id != current_parent.family_id:
+    if transaction.pop("family_id") != scope.family_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied"
         )
 
-    return TransactionResponse.from_orm(transaction)
+    return rows_response(transaction_row_adapter, transaction)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a ?fields= value into field names."""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()] or None
+
+
+def _rows_adapter(selected: Optional[List[str]]):
+    """Adapter for row payloads: partial dicts, full dicts or TransactionRecords."""
+    if selected:
+        return partial_transaction_rows_adapter
+    return transaction_records_adapter if settings.lightweight_rows else transaction_rows_adapter
+
+
+def _check_limit(limit: int, response_format: str) -> None:
+    """Only columnar responses may exceed ROWS_MAX_LIMIT rows."""
+    if response_format != "columnar" and limit > ROWS_MAX_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"limit above {ROWS_MAX_LIMIT} requires format=columnar"
+        )
+
+
+def _child_history_response(
+    read_db: Session,
+    child_id: str,
+    limit: int,
+    offset: int,
+    fields: Optional[str],
+    response_format: str,
+    etag: str
+):
+    """Serialize a child's history as rows or columns."""
+    selected = _parse_fields(fields)
+    try:
+        if response_format == "columnar":
+            adapter = transaction_columns_adapter
+            payload = TransactionService.get_transaction_columns_by_child(
+                db=read_db,
+                child_id=child_id,
+                limit=limit,
+                offset=offset,
+                fields=selected
+            )
+        else:
+            adapter = _rows_adapter(selected)
+            payload = TransactionService.get_transaction_rows_by_child(
+                db=read_db,
+                child_id=child_id,
+                limit=limit,
+                offset=offset,
+                fields=selected,
+                records=settings.lightweight_rows
+            )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    # A lagging replica may predate the version, so it must not be tagged with it
+    return rows_response(adapter, payload, etag=None if is_replica_session(read_db) else etag)
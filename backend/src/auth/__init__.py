@@ -1,21 +1,30 @@
 from .provider import AuthProvider
-from .username_password_provider import UsernamePasswordProvider, auth_provider
+from .username_password_provider import UsernamePasswordProvider, auth_provider, shutdown_hash_pool
 from .jwt_utils import create_access_token, verify_token
 from .dependencies import (
     get_current_user,
     get_current_parent,
     get_current_child,
-    get_current_user_flexible
+    get_current_user_flexible,
+    get_parent_scope,
+    get_child_scope,
+    ParentScope,
+    ChildScope,
 )
 
 __all__ = [
     "AuthProvider",
     "UsernamePasswordProvider",
     "auth_provider",
+    "shutdown_hash_pool",
     "create_access_token",
     "verify_token",
     "get_current_user",
     "get_current_parent",
     "get_current_child",
     "get_current_user_flexible",
+    "get_parent_scope",
+    "get_child_scope",
+    "ParentScope",
+    "ChildScope",
 ]
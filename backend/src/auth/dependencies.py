@@ -1,16 +1,33 @@
-from typing import Optional
+from typing import NamedTuple, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from src.config.database import get_db
 from src.auth.jwt_utils import verify_token
 from src.models.parent_admin import ParentAdmin
-from src.models.child import Child
+from src.models.records import ChildSnapshot
+from src.models.statements import CHILD_BY_ID, PARENT_BY_ID, PARENT_SCOPE
+from src.services.child_service import ChildService
+from src.observability import phase
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
 
+class ParentScope(NamedTuple):
+    """Authenticated parent's identity and their family's version counter."""
+    parent_id: str
+    family_id: str
+    family_version: int
+
+
+class ChildScope(NamedTuple):
+    """Authenticated child's identity and version counter."""
+    child_id: str
+    family_id: str
+    version: int
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -50,7 +67,8 @@ async def get_current_parent(
             detail="Not authorized as parent"
         )
 
-    parent = db.query(ParentAdmin).filter(ParentAdmin.id == current_user["sub"]).first()
+    with phase("auth"):
+        parent = db.scalars(PARENT_BY_ID, {"parent_id": current_user["sub"]}).first()
 
     if not parent:
         raise HTTPException(
@@ -64,12 +82,12 @@ async def get_current_parent(
 async def get_current_child(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
-) -> Child:
+) -> ChildSnapshot:
     """
     Dependency to get the current authenticated child user.
 
     Returns:
-        Child model instance
+        ChildSnapshot, usually from the child cache
     """
     if current_user.get("user_type") != "child":
         raise HTTPException(
@@ -77,7 +95,8 @@ async def get_current_child(
             detail="Not authorized as child"
         )
 
-    child = db.query(Child).filter(Child.id == current_user["sub"]).first()
+    with phase("auth"):
+        child = ChildService.get_child_snapshot(db, current_user["sub"])
 
     if not child:
         raise HTTPException(
@@ -101,12 +120,13 @@ async def get_current_user_flexible(
     user_type = current_user.get("user_type")
     user_id = current_user.get("sub")
 
-    if user_type == "parent":
-        user = db.query(ParentAdmin).filter(ParentAdmin.id == user_id).first()
-    elif user_type == "child":
-        user = db.query(Child).filter(Child.id == user_id).first()
-    else:
-        user = None
+    with phase("auth"):
+        if user_type == "parent":
+            user = db.scalars(PARENT_BY_ID, {"parent_id": user_id}).first()
+        elif user_type == "child":
+            user = db.scalars(CHILD_BY_ID, {"child_id": user_id}).first()
+        else:
+            user = None
 
     if not user:
         raise HTTPException(
@@ -115,3 +135,64 @@ async def get_current_user_flexible(
         )
 
     return user
+
+
+async def get_parent_scope(
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> ParentScope:
+    """
+    Dependency to get the current parent's family and its version in one lookup.
+
+    Lighter than get_current_parent for read endpoints that only need the
+    family, and lets conditional GETs answer 304 without loading any entity.
+
+    Returns:
+        ParentScope tuple
+    """
+    if current_user.get("user_type") != "parent":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized as parent"
+        )
+
+    with phase("auth"):
+        row = db.execute(PARENT_SCOPE, {"parent_id": current_user["sub"]}).first()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Parent not found"
+        )
+
+    return ParentScope(current_user["sub"], row.family_id, row.version)
+
+
+async def get_child_scope(
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> ChildScope:
+    """
+    Dependency to get the current child's family and version in one lookup.
+
+    Served from the child cache when the child is cached.
+
+    Returns:
+        ChildScope tuple
+    """
+    if current_user.get("user_type") != "child":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized as child"
+        )
+
+    with phase("auth"):
+        child = ChildService.get_child_snapshot(db, current_user["sub"])
+
+    if not child:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Child not found"
+        )
+
+    return ChildScope(current_user["sub"], child.family_id, child.version)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 
 
@@ -47,3 +47,17 @@ class AuthProvider(ABC):
             Hashed password
         """
         pass
+
+    def hash_passwords(self, passwords: List[str]) -> List[str]:
+        """
+        Hash many passwords at once.
+
+        Providers may override this to hash in parallel.
+
+        Args:
+            passwords: Plain text passwords
+
+        Returns:
+            Hashed passwords, in the same order
+        """
+        return [self.hash_password(password) for password in passwords]
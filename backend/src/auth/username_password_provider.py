@@ -1,10 +1,56 @@
-from typing import Optional, Tuple
+import os
+import threading
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from sqlalchemy.orm import Session
 import bcrypt
+from src.config.settings import settings
 from src.auth.provider import AuthProvider
+from src.observability import timed, BCRYPT_VERIFY_SECONDS
 from src.auth.jwt_utils import create_access_token
-from src.models.parent_admin import ParentAdmin
-from src.models.child import Child
+from src.models.statements import CHILD_BY_USERNAME, PARENT_BY_USERNAME
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+# Worker processes for batch hashing, started on first use
+_hash_pool: Optional["ProcessPoolExecutor"] = None
+_hash_pool_lock = threading.Lock()
+
+
+def _bcrypt_hash(password: str) -> str:
+    """Hash one password; runs in the hashing worker processes."""
+    # Truncate to 72 bytes (bcrypt limit) to avoid errors
+    password_bytes = password.encode('utf-8')[:72]
+    return bcrypt.hashpw(password_bytes, bcrypt.gensalt()).decode('utf-8')
+
+
+def _hash_workers() -> int:
+    return settings.password_hash_workers or os.cpu_count() or 1
+
+
+def _get_hash_pool() -> "ProcessPoolExecutor":
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # Imported on first batch so startup does not pay for multiprocessing
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Spawned workers do not inherit the server's threads or open connections
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=_hash_workers(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    """Stop the batch hashing workers, if they were started."""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(cancel_futures=True)
+            _hash_pool = None
 
 
 class UsernamePasswordProvider(AuthProvider):
@@ -16,17 +62,21 @@ class UsernamePasswordProvider(AuthProvider):
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
-        return bcrypt.checkpw(
-            plain_password.encode('utf-8'),
-            hashed_password.encode('utf-8')
-        )
+        with timed(BCRYPT_VERIFY_SECONDS, phase="bcrypt"):
+            return bcrypt.checkpw(
+                plain_password.encode('utf-8'),
+                hashed_password.encode('utf-8')
+            )
 
     def hash_password(self, password: str) -> str:
         """Hash a password using bcrypt."""
-        # Truncate to 72 bytes (bcrypt limit) to avoid errors
-        password_bytes = password.encode('utf-8')[:72]
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password_bytes, salt).decode('utf-8')
+        return _bcrypt_hash(password)
+
+    def hash_passwords(self, passwords: List[str]) -> List[str]:
+        """Hash passwords with bcrypt across a pool of worker processes."""
+        if len(passwords) < 2 or _hash_workers() == 1:
+            return [_bcrypt_hash(password) for password in passwords]
+        return list(_get_hash_pool().map(_bcrypt_hash, passwords))
 
     def authenticate(self, db: Session, username: str, password: str, user_type: str = "parent") -> Optional[Tuple[str, dict]]:
         """
@@ -43,9 +93,9 @@ class UsernamePasswordProvider(AuthProvider):
         """
         # Determine which model to query based on user type
         if user_type == "parent":
-            user = db.query(ParentAdmin).filter(ParentAdmin.username == username).first()
+            user = db.scalars(PARENT_BY_USERNAME, {"username": username}).first()
         elif user_type == "child":
-            user = db.query(Child).filter(Child.username == username).first()
+            user = db.scalars(CHILD_BY_USERNAME, {"username": username}).first()
         else:
             return None
 
@@ -0,0 +1,174 @@
+"""
+Command-line entry point for operational tasks.
+
+Usage:
+    python -m src.cli backup [--dir DIR] [--keep N]
+    python -m src.cli verify-backup PATH
+    python -m src.cli list-backups [--dir DIR]
+    python -m src.cli replicate [--replica PATH] [--interval SECONDS] [--once]
+    python -m src.cli migrate
+    python -m src.cli memory [--url URL] [--token TOKEN] [--interval SECONDS] [--limit N] [--key lineno]
+    python -m src.cli query-plans [--all]
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+import urllib.request
+from typing import Any, Optional
+from src.config.settings import settings
+
+
+def _backup(args: argparse.Namespace) -> int:
+    from src.maintenance import create_backup
+
+    path = create_backup(backup_dir=args.dir, keep=args.keep)
+    print(path)
+    return 0
+
+
+def _verify_backup(args: argparse.Namespace) -> int:
+    from src.maintenance import verify_backup
+
+    ok = verify_backup(args.path)
+    print(f"{args.path}: {'ok' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+def _list_backups(args: argparse.Namespace) -> int:
+    from src.maintenance import list_backups
+
+    for path in list_backups(args.dir):
+        print(f"{path}  {path.stat().st_size} bytes")
+    return 0
+
+
+def _replicate(args: argparse.Namespace) -> int:
+    from src.maintenance import create_replicator
+
+    replicator = create_replicator(args.replica)
+    try:
+        while True:
+            applied = replicator.sync_once()
+            if args.once:
+                print(f"{replicator.replica_path}: {applied} commit(s) applied")
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        replicator.close()
+
+
+def _migrate(args: argparse.Namespace) -> int:
+    from src.maintenance import migrate_if_needed
+
+    migrate_if_needed()
+    return 0
+
+
+def _admin_request(url: str, token: str, method: str = "GET") -> Any:
+    request = urllib.request.Request(url, method=method, headers={"Authorization": f"Bearer {token}"})
+    with urllib.request.urlopen(request, timeout=120) as response:
+        return json.load(response)
+
+
+def _memory(args: argparse.Namespace) -> int:
+    base = f"{args.url.rstrip('/')}{settings.api_v1_prefix}/admin/memory"
+    token: Optional[str] = args.token or settings.admin_token
+    if not token:
+        print("An admin token is required (--token or ADMIN_TOKEN)", file=sys.stderr)
+        return 2
+
+    if not _admin_request(base, token)["tracemalloc"]["tracing"]:
+        _admin_request(f"{base}/tracing", token, "POST")
+        print("started tracemalloc")
+    first = _admin_request(f"{base}/snapshots", token, "POST")
+    print(f"snapshot {first['id']}: {first['traced_bytes']:,} bytes traced; waiting {args.interval:g}s")
+    time.sleep(args.interval)
+    second = _admin_request(f"{base}/snapshots", token, "POST")
+    print(f"snapshot {second['id']}: {second['traced_bytes']:,} bytes traced "
+          f"({second['traced_bytes'] - first['traced_bytes']:+,})\n")
+
+    diff = _admin_request(f"{base}/snapshots/{first['id']}/diff/{second['id']}?key={args.key}&limit={args.limit}", token)
+    for stat in diff:
+        site = " <- ".join(stat["site"]) if isinstance(stat["site"], list) else stat["site"]
+        print(f"{stat['size_diff_bytes']:+12,} B {stat['count_diff']:+8,} blocks  {site}")
+
+    report = _admin_request(base, token)
+    maps = report["identity_maps"]
+    print(f"\nidentity maps: {maps['objects']} objects in {maps['sessions']} sessions "
+          f"(largest {maps['largest']}) {maps['by_class']}")
+    for route in report["routes"][:args.limit]:
+        print(f"{route['max_peak_bytes']:>12,} B max {route['mean_peak_bytes']:>12,} B mean "
+              f"{route['requests']:>6} req  {route['method']} {route['route']}")
+    return 0
+
+
+def _query_plans(args: argparse.Namespace) -> int:
+    from src.config.database import engine
+    from src.observability.query_plans import format_report, review_plans
+
+    with engine.connect() as conn:
+        reports = review_plans(conn)
+    flagged = [report for report in reports if report.problems]
+    for report in reports if args.all else flagged:
+        print(format_report(report))
+    print(f"{len(reports) - len(flagged)}/{len(reports)} plans ok")
+    return 1 if flagged else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with one subcommand per task."""
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="PiggyBank operational tasks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backup = commands.add_parser("backup", help="take an online, verified, compressed snapshot")
+    backup.add_argument("--dir", help="backup directory (default: settings.backup_dir)")
+    backup.add_argument("--keep", type=int, help="snapshots to retain (default: settings.backup_keep)")
+    backup.set_defaults(handler=_backup)
+
+    verify = commands.add_parser("verify-backup", help="run PRAGMA integrity_check on a snapshot")
+    verify.add_argument("path")
+    verify.set_defaults(handler=_verify_backup)
+
+    listing = commands.add_parser("list-backups", help="list snapshots, newest first")
+    listing.add_argument("--dir", help="backup directory (default: settings.backup_dir)")
+    listing.set_defaults(handler=_list_backups)
+
+    replicate = commands.add_parser("replicate", help="ship committed WAL frames to the read replica")
+    replicate.add_argument("--replica", help="replica file (default: settings.read_replica_path)")
+    replicate.add_argument(
+        "--interval", type=float, default=settings.replication_interval_seconds,
+        help="seconds between syncs"
+    )
+    replicate.add_argument("--once", action="store_true", help="sync once and exit")
+    replicate.set_defaults(handler=_replicate)
+
+    migrate = commands.add_parser("migrate", help="upgrade the schema to head unless it is already there")
+    migrate.set_defaults(handler=_migrate)
+
+    memory = commands.add_parser("memory", help="diff two tracemalloc snapshots of a running server")
+    memory.add_argument("--url", default="http://localhost:8000", help="server base URL")
+    memory.add_argument("--token", help="admin token (default: settings.admin_token)")
+    memory.add_argument("--interval", type=float, default=60.0, help="seconds between the snapshots")
+    memory.add_argument("--limit", type=int, default=20, help="allocation sites and routes to show")
+    memory.add_argument("--key", choices=("lineno", "filename", "traceback"), default="lineno")
+    memory.set_defaults(handler=_memory)
+
+    plans = commands.add_parser("query-plans", help="EXPLAIN QUERY PLAN every service query and flag scans and sorts")
+    plans.add_argument("--all", action="store_true", help="print every plan, not only flagged ones")
+    plans.set_defaults(handler=_query_plans)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(level=settings.log_level, format="%(levelname)s [%(name)s] %(message)s")
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,7 @@
+import os
+import time
+from pathlib import Path
+from typing import Optional
 from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -8,6 +12,8 @@ engine = create_engine(
     settings.database_url,
     connect_args={"check_same_thread": False},
     echo=settings.environment == "development",
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
 )
 
 
@@ -18,7 +24,9 @@ def set_sqlite_pragma(dbapi_conn, connection_record):
     cursor = dbapi_conn.cursor()
     cursor.execute("PRAGMA journal_mode=WAL;")  # Enable Write-Ahead Logging
     cursor.execute("PRAGMA foreign_keys=ON;")   # Enable foreign key constraints
-    cursor.execute("PRAGMA busy_timeout=5000;") # Set busy timeout to 5 seconds
+    cursor.execute(f"PRAGMA journal_size_limit={settings.sqlite_journal_size_limit_mb * 1024 * 1024};")
+    # Short busy wait; contended writes are retried with backoff by src.services.write_retry
+    cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms};")
     cursor.close()
 
 
@@ -39,3 +47,81 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def sync_marker_path(replica_path: Path) -> Path:
+    """Path of the file whose mtime records the replica's last confirmed sync."""
+    return replica_path.with_name(replica_path.name + "-sync")
+
+
+# Optional read replica, kept current by src.maintenance.replication
+replica_engine = None
+ReplicaSessionLocal = None
+_replica_sync_marker = None
+
+if settings.read_replica_path:
+    replica_engine = create_engine(
+        f"sqlite:///{settings.read_replica_path}",
+        connect_args={"check_same_thread": False},
+    )
+
+    @event.listens_for(replica_engine, "connect")
+    def set_replica_pragma(dbapi_conn, connection_record):
+        """Replica connections are read-only and wait out page shipping."""
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA query_only=ON;")
+        cursor.execute("PRAGMA busy_timeout=5000;")
+        cursor.close()
+
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    _replica_sync_marker = sync_marker_path(Path(settings.read_replica_path))
+
+
+def replica_is_fresh() -> bool:
+    """
+    Check whether the read replica is within the configured staleness bound.
+
+    The replicator touches the sync marker each time it confirms the replica
+    holds every commit made before the poll started.
+    """
+    if _replica_sync_marker is None:
+        return False
+    try:
+        synced_at = os.stat(_replica_sync_marker).st_mtime
+    except FileNotFoundError:
+        return False
+    return time.time() - synced_at <= settings.read_replica_max_lag_seconds
+
+
+def is_replica_session(db) -> bool:
+    """Check whether a session from get_read_db is bound to the replica."""
+    return replica_engine is not None and db.get_bind() is replica_engine
+
+
+def get_read_db():
+    """
+    Dependency function to get a session for read-only endpoints.
+
+    Yields a replica session when the replica is configured and fresh enough,
+    otherwise falls back to the primary database.
+    """
+    db = ReplicaSessionLocal() if replica_is_fresh() else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_sqlite_path() -> Optional[Path]:
+    """
+    Get the filesystem path of the SQLite database file.
+
+    Returns:
+        Path to the database file, or None for in-memory or non-SQLite URLs
+    """
+    if engine.url.get_backend_name() != "sqlite":
+        return None
+    database = engine.url.database
+    if not database or database == ":memory:":
+        return None
+    return Path(database)
@@ -13,6 +13,12 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = f"sqlite:///{BASE_DIR}/database/piggybank.db"
+    # Requests hold up to two pooled connections (primary and read session) across awaits,
+    # and an exhausted pool blocks the event loop, so size it for peak concurrency
+    db_pool_size: int = 20
+    db_max_overflow: int = 40
+    # The WAL is truncated to this size whenever a writer restarts it
+    sqlite_journal_size_limit_mb: int = 4
 
     # JWT Authentication
     jwt_secret_key: str = "dev-secret-key-change-in-production"
@@ -27,6 +33,111 @@ class Settings(BaseSettings):
     # CORS - stored as comma-separated string to avoid pydantic-settings JSON parsing
     cors_origins_str: str = "http://localhost:5173,http://localhost:5174,http://localhost:3000"
 
+    # Startup
+    migrate_on_startup: bool = False  # Upgrade the schema in-process; skipped when already at head
+    warm_up_on_startup: bool = True  # Connect and compile hot statements before serving
+
+    # Shutdown: after the server drains requests, new writes get 503 while running writes and
+    # background tasks get SHUTDOWN_DRAIN_SECONDS to finish; then the WAL is truncated
+    shutdown_drain_seconds: float = 10.0
+    shutdown_checkpoint: bool = True  # PRAGMA optimize and wal_checkpoint(TRUNCATE) on the way out
+
+    # Child cache: LRU of child snapshots for ownership checks, scopes and balances.
+    # Kept current by this process's writes, so it assumes one process writes the database
+    child_cache_size: int = 10_000  # 0 disables
+
+    # Child onboarding
+    child_import_max_rows: int = 500  # Rows accepted by one bulk import
+    password_hash_workers: int = 0  # Processes for batch PIN hashing; 0 uses every CPU, 1 hashes inline
+
+    # Backups
+    backup_dir: str = f"{BASE_DIR}/database/backups"
+    backup_keep: int = 7  # Number of snapshots kept by rotation
+    backup_interval_minutes: int = 0  # 0 disables the scheduled backup task
+    backup_pages_per_step: int = 100  # Pages copied per backup step
+    backup_step_sleep_ms: int = 5  # Pause between steps so writers are never starved
+
+    # Read replica (WAL shipping)
+    read_replica_path: str = ""  # Empty disables the replica
+    read_replica_max_lag_seconds: float = 5.0  # Older replicas are bypassed for the primary
+    replication_interval_seconds: float = 1.0
+    replication_in_process: bool = True  # Run the WAL shipper as an app background task
+    # Let the primary restart its WAL once this many frames have been shipped from it
+    replication_wal_restart_frames: int = 1000
+
+    # Response compression
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024  # Smaller bodies are sent as-is
+    compression_thread_threshold: int = 64 * 1024  # Larger bodies are compressed off the event loop
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+    compression_content_types_str: str = "application/json,text/plain,text/html,text/csv,text/css,application/javascript"
+
+    # Rate limiting: "METHOD PATH ip=N/period user=N/period" rules separated by ";".
+    # user= buckets count every attempt for a username, right or wrong, so user=5/min on
+    # /auth/login/child lets anyone who knows a child's username lock them out with 5
+    # wrong PINs (the correct PIN then gets 429 until the bucket refills).
+    rate_limit_enabled: bool = True
+    rate_limit_rules: str = (
+        "POST /api/v1/auth/login/child ip=30/min user=5/min;"
+        "POST /api/v1/auth/login/parent ip=30/min user=10/min;"
+        "POST /api/v1/auth/register ip=10/hour;"
+        "POST /api/v1/children/import ip=10/hour;"
+        "POST /api/v1/children/ ip=60/min;"
+        "POST /api/v1/transactions/ ip=120/min"
+    )
+    rate_limit_client_ip_header: str = ""  # e.g. Fly-Client-IP behind the Fly proxy
+    rate_limit_max_keys: int = 100_000
+
+    # Write contention: fail fast on SQLITE_BUSY, retry with jittered backoff, 503 after the deadline
+    sqlite_busy_timeout_ms: int = 50
+    write_retry_deadline_seconds: float = 3.0
+    write_retry_base_delay_ms: float = 5.0
+    write_retry_max_delay_ms: float = 200.0
+    write_retry_after_seconds: int = 1
+
+    # Readiness check (/api/v1/health/ready): degraded above the first threshold of a pair,
+    # unhealthy (503) past the second; results are cached so probes never add load
+    health_cache_seconds: float = 5.0
+    health_read_degraded_ms: float = 50.0
+    health_read_unhealthy_ms: float = 500.0
+    health_lock_degraded_ms: float = 100.0
+    health_lock_unhealthy_ms: float = 1000.0  # Also the busy timeout of the check's BEGIN IMMEDIATE
+    health_wal_degraded_mb: float = 64.0
+    health_wal_unhealthy_mb: float = 512.0
+    health_disk_degraded_mb: float = 512.0  # Free space on the database volume
+    health_disk_unhealthy_mb: float = 64.0
+    health_write_queue_degraded: int = 10
+    health_write_queue_unhealthy: int = 50
+
+    # Metrics
+    metrics_enabled: bool = True
+    metrics_token: str = ""  # When set, /metrics requires "Authorization: Bearer <token>"
+
+    # Server-Timing phase breakdown on every response
+    server_timing_enabled: bool = True
+
+    # On-demand request profiling: "X-Profile: <token>" header (never a query parameter).
+    # Empty token disables it and the middleware is not installed.
+    profiling_token: str = ""
+    profiling_interval_ms: float = 5.0
+    profiling_dir: str = "./profiles"
+
+    # Admin API (/api/v1/admin/*) requires "Authorization: Bearer <token>"; empty hides it
+    admin_token: str = ""
+
+    # Memory diagnostics: tracemalloc slows every allocation, so it only runs when started
+    # from the admin API or with MEMORY_TRACE_ON_STARTUP
+    memory_trace_on_startup: bool = False
+    memory_trace_frames: int = 10
+    # List endpoints build __slots__ records instead of dicts: less memory, slightly slower encoding
+    lightweight_rows: bool = False
+
+    # Slow-query log (0 disables); entries include EXPLAIN QUERY PLAN when enabled
+    slow_query_ms: float = 100.0
+    slow_query_explain: bool = True
+
     # Logging
     log_level: str = "INFO"
 
@@ -35,6 +146,11 @@ class Settings(BaseSettings):
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.cors_origins_str.split(',')]
 
+    @property
+    def compression_content_types(self) -> List[str]:
+        """Parse compressible media types from comma-separated string."""
+        return [media_type.strip() for media_type in self.compression_content_types_str.split(',') if media_type.strip()]
+
     class Config:
         env_file = ".env"
         case_sensitive = False
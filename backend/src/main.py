@@ -1,18 +1,78 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, Header, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.orm import Session
 from src.config.settings import settings
+from src.config.database import engine, replica_engine, get_sqlite_path
+from src.auth import shutdown_hash_pool
+from src.services import WriteContentionError, WritesClosedError, open_writes, child_cache_collector
 from src.api.v1.auth import router as auth_router
 from src.api.v1.children import router as children_router
 from src.api.v1.transactions import router as transactions_router
 from src.api.v1.invitations import router as invitations_router
+from src.api.v1.dashboard import router as dashboard_router
+from src.api.v1.admin import router as admin_router
+from src.middleware import (
+    CompressionMiddleware, MemoryMiddleware, MetricsMiddleware, ProfilingMiddleware, RateLimitMiddleware,
+    ServerTimingMiddleware, gzip_codec, brotli_codec, zstd_codec, parse_rules
+)
+from src.api.v1.query_budgets import QUERY_BUDGETS
+from src.observability import (
+    register_collector, render_metrics, track_connections, sqlite_collector, instrument_queries, count_orm_loads,
+    start_tracing, track_sessions
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the database and start background tasks; drain and checkpoint on shutdown."""
+    # Each maintenance module is imported only when its feature is enabled
+    open_writes()
+
+    if settings.migrate_on_startup:
+        from src.maintenance.migrations import migrate_if_needed
+        await asyncio.to_thread(migrate_if_needed)
+    if settings.warm_up_on_startup:
+        from src.maintenance.warmup import warm_up
+        await asyncio.to_thread(warm_up)
+
+    background_tasks = []
+    if settings.backup_interval_minutes > 0:
+        from src.maintenance.backup import run_backup_schedule
+        background_tasks.append(asyncio.create_task(run_backup_schedule(settings.backup_interval_minutes)))
+    if settings.read_replica_path and settings.replication_in_process:
+        from src.maintenance.replication import run_replication
+        background_tasks.append(asyncio.create_task(run_replication(settings.replication_interval_seconds)))
+
+    yield
+
+    from src.maintenance.shutdown import graceful_shutdown
+    await graceful_shutdown(background_tasks)
+    shutdown_hash_pool()
+
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.project_name,
     version="1.0.0",
-    description="Family Banking System API for managing children's allowances"
+    description="Family Banking System API for managing children's allowances",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+# Reject over-limit logins and writes before they reach bcrypt or the database;
+# added before CORS so 429s still carry CORS headers
+if settings.rate_limit_enabled:
+    app.add_middleware(
+        RateLimitMiddleware,
+        rules=parse_rules(settings.rate_limit_rules),
+        client_ip_header=settings.rate_limit_client_ip_header,
+        max_keys=settings.rate_limit_max_keys,
+    )
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -22,11 +82,73 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON payloads; brotli and zstd are used when installed
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        codecs=[
+            brotli_codec(settings.compression_brotli_quality),
+            zstd_codec(settings.compression_zstd_level),
+            gzip_codec(settings.compression_gzip_level),
+        ],
+        content_types=settings.compression_content_types,
+        minimum_size=settings.compression_minimum_size,
+        thread_threshold=settings.compression_thread_threshold,
+    )
+
+# Count statements per request and log slow ones with their query plan
+for _engine in (engine, replica_engine):
+    if _engine is not None:
+        instrument_queries(_engine, settings.slow_query_ms, settings.slow_query_explain)
+
+# Per-route peak allocation while tracemalloc traces; the admin API can start tracing at runtime
+if settings.admin_token or settings.memory_trace_on_startup:
+    app.add_middleware(MemoryMiddleware)
+    track_sessions(Session)
+if settings.memory_trace_on_startup:
+    start_tracing(settings.memory_trace_frames)
+
+# Sample single requests for admins who send the profiling token
+if settings.profiling_token:
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.profiling_token,
+        output_dir=settings.profiling_dir,
+        interval_ms=settings.profiling_interval_ms,
+    )
+
+# Per-phase Server-Timing header; ORM loads are only hooked while it is on
+if settings.server_timing_enabled:
+    app.add_middleware(ServerTimingMiddleware)
+    count_orm_loads(Session)
+
+# Outermost, so latency includes compression and rate-limit rejections are counted
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware, query_budgets=QUERY_BUDGETS)
+    track_connections(engine)
+    _sqlite_path = get_sqlite_path()
+    register_collector(lambda: sqlite_collector(str(_sqlite_path) if _sqlite_path else None))
+    register_collector(child_cache_collector)
+
+
+@app.exception_handler(WriteContentionError)
+async def write_contention_handler(request: Request, exc: WriteContentionError):
+    """Writes that could not get the lock before their deadline, or arrived during shutdown: ask the client to retry."""
+    detail = "Server shutting down, please retry" if isinstance(exc, WritesClosedError) else "Database busy, please retry"
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": detail},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
 # Include routers
 app.include_router(auth_router, prefix=f"{settings.api_v1_prefix}/auth", tags=["auth"])
 app.include_router(children_router, prefix=f"{settings.api_v1_prefix}/children", tags=["children"])
 app.include_router(transactions_router, prefix=f"{settings.api_v1_prefix}/transactions", tags=["transactions"])
 app.include_router(invitations_router, prefix=f"{settings.api_v1_prefix}/invitations", tags=["invitations"])
+app.include_router(dashboard_router, prefix=f"{settings.api_v1_prefix}/dashboard", tags=["dashboard"])
+app.include_router(admin_router, prefix=f"{settings.api_v1_prefix}/admin", tags=["admin"], include_in_schema=False)
 
 
 @app.get("/")
@@ -41,5 +163,33 @@ async def root():
 
 @app.get(f"{settings.api_v1_prefix}/health")
 async def health_check():
-    """Health check endpoint."""
+    """Liveness: the process is up and serving requests."""
     return {"status": "healthy"}
+
+
+@app.get(f"{settings.api_v1_prefix}/health/ready")
+async def readiness_check():
+    """
+    Readiness: database latency, WAL size, free disk space and write backlog.
+
+    Answers 200 when ok or degraded and 503 when unhealthy; the report is
+    cached for HEALTH_CACHE_SECONDS.
+    """
+    from src.maintenance.health import UNHEALTHY, readiness
+
+    report = await readiness()
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE if report["status"] == UNHEALTHY else status.HTTP_200_OK,
+        content=report,
+        headers={"Cache-Control": "no-store"}
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus metrics in the text exposition format."""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if settings.metrics_token and authorization != f"Bearer {settings.metrics_token}":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
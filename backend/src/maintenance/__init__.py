@@ -0,0 +1,65 @@
+"""
+Backups, replication, migrations, warm-up, shutdown and health checks.
+
+Exports resolve on first use, so importing one feature (as the lifespan
+does, per enabled setting) loads only the module behind it.
+"""
+from importlib import import_module
+
+_EXPORTS = {
+    "create_backup": "backup",
+    "verify_backup": "backup",
+    "list_backups": "backup",
+    "rotate_backups": "backup",
+    "run_backup_schedule": "backup",
+    "WalReplicator": "replication",
+    "create_replicator": "replication",
+    "run_replication": "replication",
+    "head_revision": "migrations",
+    "current_revision": "migrations",
+    "migrate_if_needed": "migrations",
+    "warm_up": "warmup",
+    "drain": "shutdown",
+    "checkpoint_and_close": "shutdown",
+    "graceful_shutdown": "shutdown",
+    "OK": "health",
+    "DEGRADED": "health",
+    "UNHEALTHY": "health",
+    "check_health": "health",
+    "readiness": "health",
+    "write_queue_depth": "health",
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "create_backup",
+    "verify_backup",
+    "list_backups",
+    "rotate_backups",
+    "run_backup_schedule",
+    "WalReplicator",
+    "create_replicator",
+    "run_replication",
+    "head_revision",
+    "current_revision",
+    "migrate_if_needed",
+    "warm_up",
+    "drain",
+    "checkpoint_and_close",
+    "graceful_shutdown",
+    "OK",
+    "DEGRADED",
+    "UNHEALTHY",
+    "check_health",
+    "readiness",
+    "write_queue_depth",
+]
@@ -0,0 +1,180 @@
+import asyncio
+import gzip
+import logging
+import shutil
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+from src.config.settings import settings
+from src.config.database import get_sqlite_path
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = "piggybank-"
+SNAPSHOT_SUFFIX = ".db.gz"
+
+
+def create_backup(
+    backup_dir: Optional[str] = None,
+    keep: Optional[int] = None,
+    pages_per_step: Optional[int] = None,
+    step_sleep_ms: Optional[int] = None
+) -> Path:
+    """
+    Take an online snapshot of the database using the SQLite backup API.
+
+    The copy proceeds in small page steps with a pause between them. The
+    source connection holds one read transaction for the whole copy, so the
+    snapshot is consistent and commits from other connections cannot force the
+    backup to restart. In WAL mode readers never block writers, so concurrent
+    transactions are not delayed. The copy is verified with
+    PRAGMA integrity_check, gzip-compressed, and older snapshots are rotated out.
+
+    Args:
+        backup_dir: Directory for snapshots (defaults to settings.backup_dir)
+        keep: Number of snapshots to retain (defaults to settings.backup_keep)
+        pages_per_step: Pages copied per step (defaults to settings.backup_pages_per_step)
+        step_sleep_ms: Pause between steps (defaults to settings.backup_step_sleep_ms)
+
+    Returns:
+        Path of the compressed snapshot
+
+    Raises:
+        ValueError: If the database is not a file-backed SQLite database
+        RuntimeError: If the snapshot fails the integrity check
+    """
+    source_path = get_sqlite_path()
+    if source_path is None:
+        raise ValueError("Backups require a file-backed SQLite database")
+
+    target_dir = Path(backup_dir or settings.backup_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    pages = pages_per_step or settings.backup_pages_per_step
+    sleep_seconds = (settings.backup_step_sleep_ms if step_sleep_ms is None else step_sleep_ms) / 1000
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    raw_path = target_dir / f".{SNAPSHOT_PREFIX}{stamp}.db.tmp"
+    final_path = target_dir / f"{SNAPSHOT_PREFIX}{stamp}{SNAPSHOT_SUFFIX}"
+    partial_path = final_path.with_name(final_path.name + ".partial")
+
+    started = time.perf_counter()
+
+    def pause_between_steps(status: int, remaining: int, total: int) -> None:
+        if remaining and sleep_seconds:
+            time.sleep(sleep_seconds)
+
+    try:
+        source = sqlite3.connect(source_path, isolation_level=None)
+        target = sqlite3.connect(raw_path)
+        try:
+            # Pin a WAL read snapshot; writers keep appending to the WAL meanwhile
+            source.execute("BEGIN")
+            source.execute("SELECT count(*) FROM sqlite_master").fetchone()
+            source.backup(target, pages=pages, progress=pause_between_steps)
+            source.execute("ROLLBACK")
+            # Make the snapshot a single self-contained file
+            target.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            target.close()
+            source.close()
+
+        if not _integrity_ok(raw_path):
+            raise RuntimeError(f"Backup {final_path.name} failed integrity check")
+
+        with open(raw_path, "rb") as src, gzip.open(partial_path, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, length=1024 * 1024)
+        partial_path.replace(final_path)
+    finally:
+        raw_path.unlink(missing_ok=True)
+        partial_path.unlink(missing_ok=True)
+
+    rotate_backups(target_dir, keep if keep is not None else settings.backup_keep)
+
+    logger.info(
+        "Backup written to %s (%d bytes) in %.2fs",
+        final_path, final_path.stat().st_size, time.perf_counter() - started
+    )
+    return final_path
+
+
+def verify_backup(path: Path) -> bool:
+    """
+    Verify a snapshot with PRAGMA integrity_check.
+
+    Compressed snapshots are decompressed to a temporary file next to them.
+
+    Args:
+        path: Path of a .db or .db.gz snapshot
+
+    Returns:
+        True if the snapshot passes the integrity check, False otherwise
+    """
+    path = Path(path)
+    if path.suffix != ".gz":
+        return _integrity_ok(path)
+
+    scratch = path.with_name(f".{path.name}.verify")
+    try:
+        with gzip.open(path, "rb") as src, open(scratch, "wb") as dst:
+            shutil.copyfileobj(src, dst, length=1024 * 1024)
+        return _integrity_ok(scratch)
+    except (OSError, EOFError):
+        return False
+    finally:
+        scratch.unlink(missing_ok=True)
+
+
+def list_backups(backup_dir: Optional[str] = None) -> List[Path]:
+    """List snapshots in the backup directory, newest first."""
+    target_dir = Path(backup_dir or settings.backup_dir)
+    if not target_dir.exists():
+        return []
+    return sorted(target_dir.glob(f"{SNAPSHOT_PREFIX}*{SNAPSHOT_SUFFIX}"), reverse=True)
+
+
+def rotate_backups(backup_dir: Path, keep: int) -> List[Path]:
+    """
+    Delete all but the newest `keep` snapshots.
+
+    Returns:
+        List of deleted snapshot paths
+    """
+    removed = list_backups(str(backup_dir))[max(keep, 1):]
+    for path in removed:
+        path.unlink(missing_ok=True)
+    return removed
+
+
+async def run_backup_schedule(interval_minutes: int) -> None:
+    """
+    Take a backup every `interval_minutes` until cancelled.
+
+    Backups run in a worker thread so the event loop keeps serving requests.
+    Cancelling during a backup waits for it to finish; the caller bounds how
+    long (see src.maintenance.shutdown).
+    """
+    while True:
+        await asyncio.sleep(interval_minutes * 60)
+        backup = asyncio.ensure_future(asyncio.to_thread(create_backup))
+        try:
+            await asyncio.shield(backup)
+        except asyncio.CancelledError:
+            await asyncio.gather(backup, return_exceptions=True)
+            raise
+        except Exception:
+            logger.exception("Scheduled backup failed")
+
+
+def _integrity_ok(path: Path) -> bool:
+    """Run PRAGMA integrity_check against a database file."""
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            result = conn.execute("PRAGMA integrity_check").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError:
+        return False
+    return result is not None and result[0] == "ok"
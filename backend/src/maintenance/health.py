@@ -0,0 +1,199 @@
+"""
+Deep readiness check: database latency, storage pressure and write backlog.
+
+Each check times a trivial read and a BEGIN IMMEDIATE/ROLLBACK on a dedicated
+connection (so an exhausted pool or a held write lock shows up as latency,
+not as a hung probe), and reads the database and WAL file sizes, free space
+on the database volume and the number of queued writes. Every measurement is
+graded against the HEALTH_* thresholds; the worst grade is the overall status.
+
+Reports are cached for HEALTH_CACHE_SECONDS and concurrent probes share one
+check, so load balancers polling the endpoint never add database load.
+
+Usage:
+    report = await readiness()
+    status_code = 503 if report["status"] == UNHEALTHY else 200
+"""
+import asyncio
+import logging
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from src.config.settings import settings
+from src.config.database import engine, get_sqlite_path
+from src.observability import DB_WRITES_QUEUED
+
+logger = logging.getLogger(__name__)
+
+OK = "ok"
+DEGRADED = "degraded"
+UNHEALTHY = "unhealthy"
+_SEVERITY = {OK: 0, DEGRADED: 1, UNHEALTHY: 2}
+
+MB = 1024 * 1024
+
+_cached: Optional[Tuple[float, Dict[str, Any]]] = None
+_lock = asyncio.Lock()
+
+
+def _grade(value: float, degraded: float, unhealthy: float) -> str:
+    """Status of a measurement that is worse when higher."""
+    if value >= unhealthy:
+        return UNHEALTHY
+    if value >= degraded:
+        return DEGRADED
+    return OK
+
+
+def _connect() -> Tuple[Any, bool]:
+    """
+    Open the connection the latency checks run on.
+
+    Returns:
+        The DBAPI connection, and whether it is a pooled one (in-memory databases)
+    """
+    path = get_sqlite_path()
+    if path is None:
+        return engine.raw_connection(), True
+    # mode=rw: a missing database file is a failure, not something to create
+    conn = sqlite3.connect(
+        f"file:{path}?mode=rw", uri=True, timeout=settings.health_lock_unhealthy_ms / 1000,
+        isolation_level=None, check_same_thread=False
+    )
+    return conn, False
+
+
+def _check_database() -> Dict[str, Dict[str, Any]]:
+    """Time a trivial read and taking then releasing the write lock."""
+    checks: Dict[str, Dict[str, Any]] = {}
+    try:
+        conn, pooled = _connect()
+    except Exception as e:
+        logger.warning("Health check could not connect: %s", e)
+        return {"read": {"status": UNHEALTHY, "error": str(e)}}
+
+    try:
+        cursor = conn.cursor()
+        started = time.perf_counter()
+        try:
+            cursor.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        except Exception as e:
+            return {"read": {"status": UNHEALTHY, "error": str(e)}}
+        read_ms = (time.perf_counter() - started) * 1000
+        checks["read"] = {
+            "status": _grade(read_ms, settings.health_read_degraded_ms, settings.health_read_unhealthy_ms),
+            "ms": round(read_ms, 2),
+        }
+
+        started = time.perf_counter()
+        try:
+            if pooled:
+                # The pooled connection's driver manages transactions; end the implicit one first
+                conn.rollback()
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("ROLLBACK")
+        except sqlite3.OperationalError as e:
+            waited_ms = (time.perf_counter() - started) * 1000
+            checks["write_lock"] = {"status": UNHEALTHY, "ms": round(waited_ms, 2), "error": str(e)}
+        else:
+            lock_ms = (time.perf_counter() - started) * 1000
+            checks["write_lock"] = {
+                "status": _grade(lock_ms, settings.health_lock_degraded_ms, settings.health_lock_unhealthy_ms),
+                "ms": round(lock_ms, 2),
+            }
+        cursor.close()
+    finally:
+        conn.close()
+    return checks
+
+
+def _check_storage() -> Dict[str, Dict[str, Any]]:
+    """Database and WAL file sizes and free space on their volume."""
+    path = get_sqlite_path()
+    if path is None:
+        return {}
+
+    def size(suffix: str) -> int:
+        try:
+            return os.stat(f"{path}{suffix}").st_size
+        except FileNotFoundError:
+            return 0
+
+    wal_bytes = size("-wal")
+    checks: Dict[str, Dict[str, Any]] = {
+        "database": {"status": OK, "bytes": size("")},
+        "wal": {
+            "status": _grade(wal_bytes / MB, settings.health_wal_degraded_mb, settings.health_wal_unhealthy_mb),
+            "bytes": wal_bytes,
+        },
+    }
+    try:
+        free_bytes = shutil.disk_usage(path.parent).free
+    except OSError as e:
+        checks["disk"] = {"status": UNHEALTHY, "error": str(e)}
+    else:
+        # Less free space is worse, so grade the shortfall
+        free_mb = free_bytes / MB
+        if free_mb < settings.health_disk_unhealthy_mb:
+            disk_status = UNHEALTHY
+        elif free_mb < settings.health_disk_degraded_mb:
+            disk_status = DEGRADED
+        else:
+            disk_status = OK
+        checks["disk"] = {"status": disk_status, "free_bytes": free_bytes}
+    return checks
+
+
+def write_queue_depth() -> int:
+    """Writes currently running or waiting for the lock in run_write/run_with_retry."""
+    return int(sum(cell[0] for cell in DB_WRITES_QUEUED.collect().values()))
+
+
+def check_health() -> Dict[str, Any]:
+    """
+    Run every check now, without the cache.
+
+    Blocks for up to HEALTH_LOCK_UNHEALTHY_MS while the write lock is held
+    elsewhere, so async callers should use readiness().
+
+    Returns:
+        Report with the overall "status", "checked_at" and per-check "checks"
+    """
+    started = time.perf_counter()
+    checks = _check_database()
+    checks.update(_check_storage())
+    depth = write_queue_depth()
+    checks["write_queue"] = {
+        "status": _grade(depth, settings.health_write_queue_degraded, settings.health_write_queue_unhealthy),
+        "depth": depth,
+    }
+    overall = max((check["status"] for check in checks.values()), key=_SEVERITY.__getitem__)
+    if overall != OK:
+        logger.warning(
+            "Health check %s: %s", overall,
+            ", ".join(name for name, check in checks.items() if check["status"] != OK)
+        )
+    return {
+        "status": overall,
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        "checks": checks,
+    }
+
+
+async def readiness() -> Dict[str, Any]:
+    """
+    Latest health report, rechecked at most once per HEALTH_CACHE_SECONDS.
+
+    The check runs in a worker thread; probes arriving while it runs wait for
+    its result instead of starting their own.
+    """
+    global _cached
+    async with _lock:
+        now = time.monotonic()
+        if _cached is None or now - _cached[0] >= settings.health_cache_seconds:
+            _cached = (now, await asyncio.to_thread(check_health))
+        return _cached[1]
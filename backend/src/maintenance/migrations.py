@@ -0,0 +1,84 @@
+import logging
+import re
+import sqlite3
+from pathlib import Path
+from typing import Optional
+from src.config.settings import settings, BASE_DIR
+from src.config.database import get_sqlite_path
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_DIR = BASE_DIR / "alembic"
+
+_REVISION_LINE = re.compile(
+    r"^(revision|down_revision)\s*(?::[^=]+)?=\s*(?:['\"]([^'\"]+)['\"]|None)",
+    re.MULTILINE
+)
+
+
+def head_revision(versions_dir: Path = ALEMBIC_DIR / "versions") -> Optional[str]:
+    """
+    Find the head revision by scanning migration files, without loading Alembic.
+
+    Returns:
+        The single head revision, or None if there is not exactly one
+    """
+    revisions, parents = set(), set()
+    for path in versions_dir.glob("*.py"):
+        for key, value in _REVISION_LINE.findall(path.read_text(encoding="utf-8")):
+            if key == "revision":
+                revisions.add(value)
+            elif value:
+                parents.add(value)
+    heads = revisions - parents
+    return heads.pop() if len(heads) == 1 else None
+
+
+def current_revision() -> Optional[str]:
+    """
+    Read the stored revision with one SELECT on alembic_version.
+
+    Returns:
+        The stored revision, or None if the database or table does not exist
+        or the database is not a file-backed SQLite database
+    """
+    path = get_sqlite_path()
+    if path is None or not path.exists():
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT version_num FROM alembic_version").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def migrate_if_needed() -> bool:
+    """
+    Run `alembic upgrade head` unless the database is already at head.
+
+    The check costs one file scan and one SELECT; Alembic and its environment
+    are only loaded when an upgrade is actually due.
+
+    Returns:
+        True if migrations were run, False if the database was up to date
+    """
+    head = head_revision()
+    current = current_revision()
+    if head is not None and current == head:
+        logger.info("Database schema at head (%s); skipping migrations", head)
+        return False
+
+    from alembic import command
+    from alembic.config import Config
+
+    # No config file: env.py then leaves the application's logging alone
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    config.set_main_option("sqlalchemy.url", settings.database_url.replace("%", "%%"))
+    logger.info("Upgrading database schema from %s to head", current)
+    command.upgrade(config, "head")
+    return True
@@ -0,0 +1,358 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import struct
+import sys
+import time
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+from src.config.settings import settings
+from src.config.database import get_sqlite_path, sync_marker_path
+
+logger = logging.getLogger(__name__)
+
+WAL_HEADER_SIZE = 32
+WAL_FRAME_HEADER_SIZE = 24
+WAL_MAGIC_LE = 0x377F0682
+WAL_MAGIC_BE = 0x377F0683
+
+
+class WalHeader:
+    """Parsed WAL file header."""
+
+    def __init__(self, raw: bytes):
+        magic, _, page_size, _, salt1, salt2, cksum1, cksum2 = struct.unpack(">8I", raw)
+        if magic not in (WAL_MAGIC_LE, WAL_MAGIC_BE):
+            raise ValueError("Not a SQLite WAL file")
+        self.big_endian = magic == WAL_MAGIC_BE
+        self.page_size = page_size
+        self.salts = (salt1, salt2)
+        self.checksum = (cksum1, cksum2)
+        self.valid = _wal_checksum(raw[:24], 0, 0, self.big_endian) == self.checksum
+
+
+class WalReplicator:
+    """
+    Keep a replica database file current by shipping committed WAL frames.
+
+    Between syncs the replicator holds a read snapshot on the primary, handing
+    it over between two connections at every sync. Readers with a snapshot stop
+    the checkpointer from backfilling past them and stop the WAL from being
+    restarted until every frame has been checkpointed, so no frame can
+    disappear before it is shipped, and the WAL restarts at most once between
+    syncs.
+
+    A pin that is never released would keep the WAL from ever restarting, so
+    once the current WAL generation holds `wal_restart_frames` frames the sync
+    opens a restart window: it takes the primary's write lock, ships the last
+    frames, releases the pin, checkpoints and pins again before letting go of
+    the lock. Nothing can be appended while the pin is down, so when the next
+    writer restarts the WAL (and truncates it to its journal_size_limit), the
+    old generation has been shipped in full and the new salts continue from it.
+
+    Each sync reads the frames appended since the last one, validates their
+    salts and checksums, and writes the pages of every complete commit into the
+    replica while holding the replica's EXCLUSIVE lock. Replica readers
+    therefore never see a partially applied commit.
+
+    On first use, or whenever continuity cannot be proven, the replica is
+    rebuilt with the SQLite backup API from the pinned snapshot and the current
+    WAL is replayed on top.
+    """
+
+    def __init__(self, primary_path: Path, replica_path: Path, wal_restart_frames: Optional[int] = None):
+        self.primary_path = Path(primary_path)
+        self.replica_path = Path(replica_path)
+        self.wal_path = self.primary_path.with_name(self.primary_path.name + "-wal")
+        self.marker_path = sync_marker_path(self.replica_path)
+        self.last_synced_at: Optional[float] = None
+        self.resyncs = 0
+        self.wal_restart_frames = (
+            settings.replication_wal_restart_frames if wal_restart_frames is None else wal_restart_frames
+        )
+        self.restart_windows = 0
+
+        self._pins = [
+            sqlite3.connect(self.primary_path, isolation_level=None, check_same_thread=False)
+            for _ in range(2)
+        ]
+        self._held: Optional[sqlite3.Connection] = None
+        # Holds the primary's write lock during a restart window; gives up quickly when writers are busy
+        self._writer = sqlite3.connect(self.primary_path, isolation_level=None, check_same_thread=False)
+        self._writer.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        self._replica = sqlite3.connect(self.replica_path, isolation_level=None, check_same_thread=False)
+        self._replica.execute("PRAGMA busy_timeout=5000")
+        # Raw handle for page writes; kept open for the replicator's lifetime
+        # because closing any descriptor drops this process's POSIX locks on the file
+        self._replica_fd = os.open(self.replica_path, os.O_RDWR)
+
+        # Position of the last applied commit in the current WAL generation
+        self._in_sync = False
+        self._salts: Optional[Tuple[int, int]] = None
+        self._offset = WAL_HEADER_SIZE
+        self._checksum: Tuple[int, int] = (0, 0)
+
+    def sync_once(self) -> int:
+        """
+        Apply every commit found in the primary's WAL since the last call.
+
+        Returns:
+            Number of commits applied (a full resync counts as one)
+        """
+        started = time.time()
+        in_sync, self._in_sync = self._in_sync, False
+        self._pin_snapshot()
+
+        header = self._read_wal_header()
+        applied = 0
+        if not in_sync:
+            self._resync(header)
+            applied = 1
+        elif header is not None and header.salts != self._salts:
+            if self._salts is None or header.salts[0] == (self._salts[0] + 1) & 0xFFFFFFFF:
+                # The WAL restarted once (salt-1 increments on every restart)
+                # on top of the state we already shipped
+                self._start_generation(header)
+            else:
+                self._resync(header)
+                applied = 1
+
+        if header is not None:
+            applied += self._ship_frames(header)
+            if self._frames_shipped(header) >= self.wal_restart_frames:
+                applied += self._open_restart_window(header)
+        self._in_sync = True
+
+        # Everything committed before `started` is now in the replica
+        self.marker_path.touch()
+        os.utime(self.marker_path, (started, started))
+        self.last_synced_at = started
+        return applied
+
+    def close(self) -> None:
+        """Release the pinned snapshot and close all handles."""
+        for conn in self._pins:
+            conn.close()
+        self._writer.close()
+        self._replica.close()
+        os.close(self._replica_fd)
+
+    def _pin_snapshot(self) -> None:
+        """Take a fresh read snapshot, then release the previous one."""
+        spare = self._pins[1] if self._held is self._pins[0] else self._pins[0]
+        spare.execute("BEGIN")
+        spare.execute("SELECT count(*) FROM sqlite_master").fetchone()
+        if self._held is not None:
+            self._held.execute("ROLLBACK")
+        self._held = spare
+
+    def _frames_shipped(self, header: WalHeader) -> int:
+        """Frames of the current WAL generation already applied to the replica."""
+        return (self._offset - WAL_HEADER_SIZE) // (WAL_FRAME_HEADER_SIZE + header.page_size)
+
+    def _open_restart_window(self, header: WalHeader) -> int:
+        """
+        Briefly release the pin so the primary can restart its WAL.
+
+        The write lock is held from before the last frames are shipped until
+        the pin is back, so no frame can be appended unshipped while the WAL
+        is free to restart. The PASSIVE checkpoint backfills every frame that
+        no other reader still needs; when it gets them all, the new pin reads
+        from the database file and the next writer restarts the WAL.
+
+        Returns:
+            Commits shipped while holding the lock
+        """
+        # Backfill up to the pin first, so the lock is held for as little work as possible
+        idle = self._pins[1] if self._held is self._pins[0] else self._pins[0]
+        idle.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+        try:
+            self._writer.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError:
+            # Writers are busy; try again on the next sync
+            return 0
+        try:
+            applied = self._ship_frames(header)
+            self._held.execute("ROLLBACK")
+            self._held = None
+            self._pins[0].execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+            self._pin_snapshot()
+        finally:
+            self._writer.execute("ROLLBACK")
+        self.restart_windows += 1
+        return applied
+
+    def _start_generation(self, header: Optional[WalHeader]) -> None:
+        """Track a new WAL generation from its first frame."""
+        self._salts = header.salts if header else None
+        self._offset = WAL_HEADER_SIZE
+        self._checksum = header.checksum if header else (0, 0)
+
+    def _read_wal_header(self) -> Optional[WalHeader]:
+        try:
+            with open(self.wal_path, "rb") as wal:
+                raw = wal.read(WAL_HEADER_SIZE)
+        except FileNotFoundError:
+            return None
+        if len(raw) < WAL_HEADER_SIZE:
+            return None
+        header = WalHeader(raw)
+        return header if header.valid else None
+
+    def _resync(self, header: Optional[WalHeader]) -> None:
+        """Rebuild the replica from the pinned primary snapshot."""
+        scratch_path = self.replica_path.with_name(f".{self.replica_path.name}.resync")
+        scratch_path.unlink(missing_ok=True)
+        try:
+            scratch = sqlite3.connect(scratch_path)
+            try:
+                self._held.backup(scratch, pages=256)
+                # Backups copy the WAL flag in the header; the replica uses a rollback journal
+                scratch.execute("PRAGMA journal_mode=DELETE")
+                page_size = scratch.execute("PRAGMA page_size").fetchone()[0]
+            finally:
+                scratch.close()
+
+            with open(scratch_path, "rb") as snapshot:
+                size = os.fstat(snapshot.fileno()).st_size
+                with self._replica_locked() as change_counter:
+                    offset = 0
+                    while chunk := snapshot.read(1024 * 1024):
+                        os.pwrite(self._replica_fd, chunk, offset)
+                        offset += len(chunk)
+                    self._finish_write(change_counter, size // page_size, page_size)
+        finally:
+            scratch_path.unlink(missing_ok=True)
+        self.resyncs += 1
+        self._start_generation(header)
+        logger.info("Replica %s rebuilt from primary snapshot", self.replica_path)
+
+    def _ship_frames(self, header: WalHeader) -> int:
+        """Read frames after the last applied commit and apply complete commits."""
+        page_size = header.page_size
+        frame_size = WAL_FRAME_HEADER_SIZE + page_size
+        offset = self._offset
+        s0, s1 = self._checksum
+
+        pending: Dict[int, bytes] = {}
+        committed: Dict[int, bytes] = {}
+        commits = 0
+        db_pages = 0
+        commit_offset, commit_checksum = offset, (s0, s1)
+
+        with open(self.wal_path, "rb") as wal:
+            wal.seek(offset)
+            while True:
+                frame = wal.read(frame_size)
+                if len(frame) < frame_size:
+                    break
+                pgno, commit_size, salt1, salt2, c0, c1 = struct.unpack(">6I", frame[:WAL_FRAME_HEADER_SIZE])
+                if (salt1, salt2) != header.salts:
+                    break
+                s0, s1 = _wal_checksum(frame[:8] + frame[WAL_FRAME_HEADER_SIZE:], s0, s1, header.big_endian)
+                if (s0, s1) != (c0, c1):
+                    break
+
+                pending[pgno] = frame[WAL_FRAME_HEADER_SIZE:]
+                offset += frame_size
+                if commit_size:
+                    committed.update(pending)
+                    pending.clear()
+                    commits += 1
+                    db_pages = commit_size
+                    commit_offset, commit_checksum = offset, (s0, s1)
+
+        if commits:
+            self._apply_pages(committed, db_pages, page_size)
+            self._offset, self._checksum = commit_offset, commit_checksum
+        return commits
+
+    def _apply_pages(self, pages: Dict[int, bytes], db_pages: int, page_size: int) -> None:
+        """Write the pages of complete commits into the replica."""
+        with self._replica_locked() as change_counter:
+            for pgno in sorted(pages):
+                if pgno <= db_pages:
+                    os.pwrite(self._replica_fd, pages[pgno], (pgno - 1) * page_size)
+            self._finish_write(change_counter, db_pages, page_size)
+
+    @contextmanager
+    def _replica_locked(self) -> Iterator[int]:
+        """
+        Hold the replica's EXCLUSIVE lock, so no reader is mid-transaction.
+
+        Yields:
+            The replica's file change counter before the write
+        """
+        self._replica.execute("BEGIN EXCLUSIVE")
+        try:
+            raw = os.pread(self._replica_fd, 4, 24)
+            yield struct.unpack(">I", raw)[0] if len(raw) == 4 else 0
+        finally:
+            self._replica.execute("ROLLBACK")
+
+    def _finish_write(self, change_counter: int, db_pages: int, page_size: int) -> None:
+        """Truncate to the committed size and fix up the replica header."""
+        os.ftruncate(self._replica_fd, db_pages * page_size)
+        # Bump the change counter so readers drop their page caches, record
+        # the new size, and keep the file in rollback-journal mode
+        counter = (change_counter + 1) & 0xFFFFFFFF
+        os.pwrite(self._replica_fd, b"\x01\x01", 18)
+        os.pwrite(self._replica_fd, struct.pack(">II", counter, db_pages), 24)
+        os.pwrite(self._replica_fd, struct.pack(">I", counter), 92)
+        os.fsync(self._replica_fd)
+
+
+def create_replicator(replica_path: Optional[str] = None) -> WalReplicator:
+    """
+    Create a replicator for the configured primary database.
+
+    Raises:
+        ValueError: If the primary is not a file-backed SQLite database or no
+            replica path is configured
+    """
+    primary_path = get_sqlite_path()
+    if primary_path is None:
+        raise ValueError("Replication requires a file-backed SQLite database")
+    replica = replica_path or settings.read_replica_path
+    if not replica:
+        raise ValueError("No replica path configured (READ_REPLICA_PATH)")
+    Path(replica).parent.mkdir(parents=True, exist_ok=True)
+    return WalReplicator(primary_path, Path(replica))
+
+
+async def run_replication(interval_seconds: float) -> None:
+    """
+    Ship WAL frames to the configured replica every `interval_seconds` until cancelled.
+
+    Syncs run in a worker thread so the event loop keeps serving requests.
+    A worker thread cannot be interrupted, so on cancellation a running sync
+    is allowed to finish before the replicator's connections are closed.
+    """
+    replicator = await asyncio.to_thread(create_replicator)
+    sync = None
+    try:
+        while True:
+            sync = asyncio.ensure_future(asyncio.to_thread(replicator.sync_once))
+            try:
+                await asyncio.shield(sync)
+            except Exception:
+                logger.exception("Replication sync failed")
+            await asyncio.sleep(interval_seconds)
+    finally:
+        if sync is not None and not sync.done():
+            await asyncio.gather(sync, return_exceptions=True)
+        replicator.close()
+
+
+def _wal_checksum(data: bytes, s0: int, s1: int, big_endian: bool) -> Tuple[int, int]:
+    """Cumulative WAL checksum over `data` as defined by the SQLite file format."""
+    words = array("I", data)
+    if big_endian != (sys.byteorder == "big"):
+        words.byteswap()
+    for i in range(0, len(words), 2):
+        s0 = (s0 + words[i] + s1) & 0xFFFFFFFF
+        s1 = (s1 + words[i + 1] + s0) & 0xFFFFFFFF
+    return s0, s1
@@ -0,0 +1,128 @@
+"""
+Graceful shutdown: stop writes, drain, then leave a compact database behind.
+
+The server drains HTTP requests before the lifespan shutdown runs (uvicorn
+waits up to --timeout-graceful-shutdown, then cancels what is left). From
+there, within SHUTDOWN_DRAIN_SECONDS:
+
+1. New writes are refused with 503 and Retry-After (close_writes).
+2. Write attempts still executing in worker threads, including those of
+   requests the server cancelled, are waited for.
+3. Background tasks are cancelled. The replicator goes before the checkpoint
+   because its pinned read snapshot would keep the WAL from being truncated;
+   a running backup or replication sync is allowed to finish.
+
+Then every pooled connection runs PRAGMA optimize as it is closed, and a
+final PRAGMA wal_checkpoint(TRUNCATE) copies the WAL into the database and
+empties it, so the next start opens a compact file with nothing to recover.
+"""
+import asyncio
+import logging
+import sqlite3
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from src.config.settings import settings
+from src.config.database import engine, replica_engine, get_sqlite_path
+from src.services import close_writes, running_writes
+
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = 0.05
+
+
+async def drain(background_tasks: List[asyncio.Task], timeout: float) -> bool:
+    """
+    Refuse new writes, wait for running ones, then cancel background tasks.
+
+    Args:
+        background_tasks: Tasks started by the lifespan
+        timeout: Seconds the whole drain may take
+
+    Returns:
+        True if every write and task finished within the timeout
+    """
+    close_writes()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    while running_writes() and loop.time() < deadline:
+        await asyncio.sleep(POLL_SECONDS)
+    writes_left = running_writes()
+    if writes_left:
+        logger.warning("Shutdown deadline passed with %d write(s) still running", writes_left)
+
+    for task in background_tasks:
+        task.cancel()
+    pending = set()
+    if background_tasks:
+        _, pending = await asyncio.wait(background_tasks, timeout=max(deadline - loop.time(), 0))
+    if pending:
+        logger.warning("Shutdown deadline passed with %d background task(s) still running", len(pending))
+    return not writes_left and not pending
+
+
+def _optimize_before_close(dbapi_conn, connection_record) -> None:
+    # PRAGMA optimize analyzes the tables this connection's queries used, so run it on
+    # each pooled connection rather than on a fresh one
+    try:
+        dbapi_conn.execute("PRAGMA optimize")
+    except sqlite3.Error as e:
+        logger.warning("PRAGMA optimize failed on shutdown: %s", e)
+
+
+def checkpoint_and_close(busy_timeout: float = 1.0) -> Optional[Tuple[int, int, int]]:
+    """
+    Close the connection pools and truncate the WAL.
+
+    Checked-in pooled connections run PRAGMA optimize as they are closed;
+    connections still checked out are left alone.
+
+    Args:
+        busy_timeout: Seconds the checkpoint waits for other connections
+
+    Returns:
+        The (busy, log frames, checkpointed frames) row of wal_checkpoint, or
+        None when the database is not a file
+    """
+    event.listen(engine, "close", _optimize_before_close)
+    try:
+        engine.dispose()
+    finally:
+        event.remove(engine, "close", _optimize_before_close)
+    if replica_engine is not None:
+        replica_engine.dispose()
+
+    path = get_sqlite_path()
+    if path is None:
+        return None
+    conn = sqlite3.connect(path, isolation_level=None, timeout=busy_timeout)
+    try:
+        busy, log_frames, checkpointed = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    finally:
+        conn.close()
+    if busy:
+        logger.warning(
+            "WAL not truncated: another connection was busy (%d of %d frames checkpointed)",
+            checkpointed, log_frames
+        )
+    else:
+        logger.info("WAL checkpointed and truncated (%d frames)", checkpointed)
+    return busy, log_frames, checkpointed
+
+
+async def graceful_shutdown(background_tasks: List[asyncio.Task]) -> None:
+    """
+    Lifespan shutdown: drain within SHUTDOWN_DRAIN_SECONDS, then checkpoint and close the engine.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await drain(background_tasks, settings.shutdown_drain_seconds)
+    if settings.shutdown_checkpoint:
+        remaining = settings.shutdown_drain_seconds - (loop.time() - started)
+        try:
+            await asyncio.to_thread(checkpoint_and_close, max(remaining, 1.0))
+        except sqlite3.Error as e:
+            logger.warning("Shutdown checkpoint failed: %s", e)
+    else:
+        engine.dispose()
+    logger.info("Shutdown finished in %.2fs", loop.time() - started)
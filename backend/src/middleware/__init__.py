@@ -0,0 +1,22 @@
+from .compression import CompressionMiddleware, Codec, gzip_codec, brotli_codec, zstd_codec
+from .memory import MemoryMiddleware
+from .metrics import MetricsMiddleware
+from .profiling import ProfilingMiddleware
+from .rate_limit import RateLimitMiddleware, RateLimitRule, Limit, parse_rules
+from .timing import ServerTimingMiddleware
+
+__all__ = [
+    "CompressionMiddleware",
+    "Codec",
+    "gzip_codec",
+    "brotli_codec",
+    "zstd_codec",
+    "MemoryMiddleware",
+    "MetricsMiddleware",
+    "ProfilingMiddleware",
+    "RateLimitMiddleware",
+    "RateLimitRule",
+    "Limit",
+    "parse_rules",
+    "ServerTimingMiddleware",
+]
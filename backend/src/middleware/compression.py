@@ -0,0 +1,248 @@
+import asyncio
+import gzip
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optional: install "brotli" to enable br
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optional: install "zstandard" to enable zstd
+    zstandard = None
+
+
+class _StreamEncoder:
+    """Incremental encoder that emits a decodable prefix after every chunk."""
+
+    def __init__(self, encode: Callable[[bytes], bytes], finish: Callable[[], bytes]):
+        self.encode = encode
+        self.finish = finish
+
+
+class Codec:
+    """A content-coding with one-shot and streaming encoders."""
+
+    def __init__(self, name: str, compress: Callable[[bytes], bytes], stream: Callable[[], _StreamEncoder]):
+        self.name = name
+        self.compress = compress
+        self.stream = stream
+
+
+def gzip_codec(level: int) -> Codec:
+    def stream() -> _StreamEncoder:
+        encoder = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return _StreamEncoder(
+            lambda chunk: encoder.compress(chunk) + encoder.flush(zlib.Z_SYNC_FLUSH),
+            encoder.flush
+        )
+
+    return Codec("gzip", lambda body: gzip.compress(body, compresslevel=level, mtime=0), stream)
+
+
+def brotli_codec(quality: int) -> Optional[Codec]:
+    if brotli is None:
+        return None
+
+    def stream() -> _StreamEncoder:
+        encoder = brotli.Compressor(quality=quality)
+        return _StreamEncoder(lambda chunk: encoder.process(chunk) + encoder.flush(), encoder.finish)
+
+    return Codec("br", lambda body: brotli.compress(body, quality=quality), stream)
+
+
+def zstd_codec(level: int) -> Optional[Codec]:
+    if zstandard is None:
+        return None
+
+    def stream() -> _StreamEncoder:
+        encoder = zstandard.ZstdCompressor(level=level).compressobj()
+        return _StreamEncoder(
+            lambda chunk: encoder.compress(chunk) + encoder.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            encoder.flush
+        )
+
+    # ZstdCompressor is not thread-safe; one-shot compressions may run in worker threads
+    return Codec("zstd", lambda body: zstandard.ZstdCompressor(level=level).compress(body), stream)
+
+
+def negotiate(accept_encoding: str, codecs: List[Codec]) -> Optional[Codec]:
+    """
+    Pick a codec for an Accept-Encoding header.
+
+    Highest q-value wins; ties go to the earlier codec in `codecs`. Codings
+    with q=0 are refused, and "*" covers every coding not listed explicitly.
+
+    Returns:
+        The chosen codec, or None to send the body unencoded
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+
+    best, best_q = None, 0.0
+    for codec in codecs:
+        q = weights.get(codec.name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = codec, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with the best coding the client accepts.
+
+    Complete bodies under `minimum_size` bytes, media types outside
+    `content_types` and responses that already carry a Content-Encoding are
+    passed through untouched. Bodies of `thread_threshold` bytes or more are
+    compressed in a worker thread so the event loop keeps serving requests.
+
+    Streaming responses are compressed incrementally: every chunk is flushed
+    so clients receive data as soon as the application produces it.
+
+    Encoded responses carry a weak ETag. A 304 has no body to decide from,
+    so the middleware remembers the last `etag_memory` ETags it encoded and
+    weakens a 304's ETag only when its 200 was encoded; for ETags it has not
+    seen, it echoes the form the client sent in If-None-Match.
+    """
+
+    etag_memory = 4096
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        codecs: Iterable[Optional[Codec]],
+        content_types: Iterable[str],
+        minimum_size: int = 1024,
+        thread_threshold: int = 64 * 1024
+    ):
+        self.app = app
+        self.codecs = [codec for codec in codecs if codec is not None]
+        self.content_types = frozenset(content_types)
+        self.minimum_size = minimum_size
+        self.thread_threshold = thread_threshold
+        self._encoded_etags: "OrderedDict[str, None]" = OrderedDict()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        codec = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.codecs)
+        if codec is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSender(self, codec, send, scope))
+
+    def compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").split(";", 1)[0].strip().lower()
+        return media_type in self.content_types
+
+    def remember_encoded(self, etag: str) -> None:
+        self._encoded_etags[etag] = None
+        self._encoded_etags.move_to_end(etag)
+        while len(self._encoded_etags) > self.etag_memory:
+            self._encoded_etags.popitem(last=False)
+
+    def was_encoded(self, etag: str, if_none_match: str) -> bool:
+        """Whether the 200 a 304 with this strong `etag` stands in for would be encoded."""
+        if etag in self._encoded_etags:
+            return True
+        return any(tag.strip() == f"W/{etag}" for tag in if_none_match.split(","))
+
+
+class _CompressingSender:
+    """ASGI send wrapper holding per-response compression state."""
+
+    def __init__(self, middleware: CompressionMiddleware, codec: Codec, send: Send, scope: Scope):
+        self.middleware = middleware
+        self.codec = codec
+        self.send = send
+        self.scope = scope
+        self.start: Optional[Message] = None
+        self.encoder: Optional[_StreamEncoder] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            if self.start["status"] == 304:
+                # Validators must match the 200 the client revalidates, which is
+                # identity-coded if it was too small or not a compressible type
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/") and self.middleware.was_encoded(
+                    etag, Headers(scope=self.scope).get("if-none-match", "")
+                ):
+                    _weaken_etag(headers)
+            too_small = not more_body and len(body) < self.middleware.minimum_size
+            if self.start["status"] < 200 or self.start["status"] in (204, 304) or too_small \
+                    or not self.middleware.compressible(headers):
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+
+            headers["Content-Encoding"] = self.codec.name
+            headers.add_vary_header("Accept-Encoding")
+            # The encoded bytes differ from the identity representation
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                self.middleware.remember_encoded(etag)
+            _weaken_etag(headers)
+
+            if not more_body:
+                body = await self._run(self.codec.compress, body)
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+            del headers["Content-Length"]
+            self.encoder = self.codec.stream()
+            await self.send(self.start)
+
+        chunk = await self._run(self.encoder.encode, body) if body else b""
+        if not more_body:
+            chunk += self.encoder.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _run(self, fn: Callable[[bytes], bytes], data: bytes) -> bytes:
+        if len(data) >= self.middleware.thread_threshold:
+            return await asyncio.to_thread(fn, data)
+        return fn(data)
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
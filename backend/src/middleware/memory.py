@@ -0,0 +1,32 @@
+import tracemalloc
+from starlette.types import ASGIApp, Receive, Scope, Send
+from src.observability.memory import record_route_peak
+
+
+class MemoryMiddleware:
+    """
+    Record each request's peak Python allocation per route while tracemalloc traces.
+
+    The peak is measured above the traced memory at the start of the request
+    and labelled with the route's path template. When tracemalloc is not
+    tracing, requests pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracemalloc.is_tracing():
+            await self.app(scope, receive, send)
+            return
+
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if tracemalloc.is_tracing():
+                _, peak = tracemalloc.get_traced_memory()
+                route = scope.get("route")
+                labels = (scope["method"], route.path if route is not None else "unmatched")
+                record_route_peak(labels, max(0, peak - baseline))
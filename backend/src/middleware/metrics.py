@@ -0,0 +1,59 @@
+import logging
+import time
+from typing import Dict, Optional, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.observability.metrics import (
+    HTTP_ERRORS, HTTP_IN_FLIGHT, HTTP_REQUESTS, HTTP_REQUEST_QUERIES, HTTP_REQUEST_SECONDS
+)
+from src.observability.queries import QueryCounter, request_queries
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """
+    Record request count, latency, errors, in-flight requests and statements per route.
+
+    Routes are labelled with their path template (e.g. /api/v1/children/{child_id})
+    so label cardinality stays bounded; unmatched paths share one label. A
+    request that runs more statements than its route's entry in
+    `query_budgets` (keyed by method and path template) is logged.
+    """
+
+    def __init__(self, app: ASGIApp, query_budgets: Optional[Dict[Tuple[str, str], int]] = None):
+        self.app = app
+        self.query_budgets = query_budgets or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        queries = QueryCounter()
+        token = request_queries.set(queries)
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            request_queries.reset(token)
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route is not None else "unmatched")
+            HTTP_REQUEST_SECONDS.observe(elapsed, labels)
+            HTTP_REQUEST_QUERIES.observe(queries.count, labels)
+            HTTP_REQUESTS.inc(labels + (str(status_code),))
+            if status_code >= 500:
+                HTTP_ERRORS.inc(labels)
+            budget = self.query_budgets.get(labels)
+            if budget is not None and queries.count > budget:
+                logger.warning("%s %s ran %d queries, budget is %d", *labels, queries.count, budget)
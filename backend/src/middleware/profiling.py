@@ -0,0 +1,78 @@
+import hmac
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from typing import Optional
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.observability.profiling import SamplingProfiler
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+
+class ProfilingMiddleware:
+    """
+    Capture a sampling profile of a single request on demand.
+
+    A request carrying the admin profiling token in an "X-Profile: <token>"
+    header is sampled from start to finish. The token is only accepted as a
+    header, so it never lands in access logs, proxies or browser history.
+    The folded stacks are written to `output_dir` and the file name is
+    returned in the X-Profile response header. Requests without the token only
+    pay for the header check; when no token is configured the middleware is
+    not installed at all.
+    """
+
+    def __init__(self, app: ASGIApp, token: str, output_dir: str, interval_ms: float = 5.0):
+        self.app = app
+        self.token = token.encode()
+        self.output_dir = output_dir
+        self.interval = interval_ms / 1000
+
+    def _requested(self, scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value, self.token)
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-") or "root"
+        filename = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{scope['method']}-{slug}.folded"
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile"] = filename
+            await send(message)
+
+        profiler = SamplingProfiler(self.interval)
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            folded = profiler.stop()
+            elapsed = time.perf_counter() - started
+            path = self._write(filename, folded)
+            logger.info(
+                "Profiled %s %s: %.1f ms, %d samples -> %s",
+                scope["method"], scope["path"], elapsed * 1000, profiler.samples, path
+            )
+
+    def _write(self, filename: str, folded: str) -> Optional[str]:
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, filename)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(folded)
+        except OSError as e:
+            logger.warning("Could not write profile %s: %s", filename, e)
+            return None
+        return path
@@ -0,0 +1,245 @@
+import json
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PERIODS = {"sec": 1.0, "second": 1.0, "min": 60.0, "minute": 60.0, "hour": 3600.0}
+
+# Login bodies are tiny; anything larger is not parsed for a username
+MAX_BODY_FOR_USERNAME = 4096
+
+
+class Limit:
+    """Bucket size and refill rate, e.g. 5/min is a burst of 5 refilled at 5 per minute."""
+
+    __slots__ = ("capacity", "rate")
+
+    def __init__(self, capacity: int, period_seconds: float):
+        self.capacity = float(capacity)
+        self.rate = capacity / period_seconds
+
+    @classmethod
+    def parse(cls, spec: str) -> "Limit":
+        """Parse "N/sec", "N/min" or "N/hour"."""
+        count, _, period = spec.partition("/")
+        if period not in PERIODS:
+            raise ValueError(f"Invalid rate limit '{spec}'")
+        return cls(int(count), PERIODS[period])
+
+
+class RateLimitRule:
+    """Limits for one method and path, keyed by client IP and optionally by username."""
+
+    __slots__ = ("method", "path", "per_ip", "per_username")
+
+    def __init__(self, method: str, path: str, per_ip: Optional[Limit] = None, per_username: Optional[Limit] = None):
+        self.method = method.upper()
+        self.path = path
+        self.per_ip = per_ip
+        self.per_username = per_username
+
+
+def parse_rules(spec: str) -> List[RateLimitRule]:
+    """
+    Parse rate limit rules.
+
+    Rules are separated by ";" and look like "POST /api/v1/auth/login/child
+    ip=20/min user=5/min". `user` limits key on the "username" field of the
+    JSON request body.
+
+    Raises:
+        ValueError: If a rule is malformed
+    """
+    rules = []
+    for chunk in spec.split(";"):
+        parts = chunk.split()
+        if not parts:
+            continue
+        if len(parts) < 3:
+            raise ValueError(f"Invalid rate limit rule '{chunk.strip()}'")
+        limits = {}
+        for part in parts[2:]:
+            key, _, value = part.partition("=")
+            if key not in ("ip", "user"):
+                raise ValueError(f"Invalid rate limit key '{key}'")
+            limits[key] = Limit.parse(value)
+        rules.append(RateLimitRule(parts[0], parts[1], limits.get("ip"), limits.get("user")))
+    return rules
+
+
+class TokenBuckets:
+    """
+    Token buckets stored as (tokens, last_update) tuples in one dict.
+
+    Buckets refill lazily when touched. Every `sweep_interval` seconds, buckets
+    that would be full again are dropped (a missing bucket reads as full). If
+    the store still holds more than `max_keys`, the least recently used
+    buckets are evicted.
+    """
+
+    def __init__(self, max_keys: int = 100_000, sweep_interval: float = 60.0):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self._buckets: Dict[Tuple[int, str, str], Tuple[float, float]] = {}
+        self._limits: Dict[int, Limit] = {}
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def take(self, key: Tuple[int, str, str], limit: Limit, now: float) -> float:
+        """
+        Take one token from the bucket at `key`.
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+        """
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        state = self._buckets.pop(key, None)
+        if state is None:
+            tokens = limit.capacity
+        else:
+            tokens = min(limit.capacity, state[0] + (now - state[1]) * limit.rate)
+
+        if tokens >= 1.0:
+            self._buckets[key] = (tokens - 1.0, now)
+            self._limits[id(limit)] = limit
+            return 0.0
+        self._buckets[key] = (tokens, now)
+        return (1.0 - tokens) / limit.rate
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _sweep(self, now: float) -> None:
+        self._next_sweep = now + self.sweep_interval
+        buckets = self._buckets
+        for key, (tokens, last) in list(buckets.items()):
+            limit = self._limits.get(key[0])
+            if limit is None or tokens + (now - last) * limit.rate >= limit.capacity:
+                del buckets[key]
+        # Dict order is least recently used first, since take() reinserts keys
+        overflow = len(buckets) - self.max_keys
+        if overflow > 0:
+            for key in list(buckets)[:overflow]:
+                del buckets[key]
+
+
+class RateLimitMiddleware:
+    """
+    Reject requests over their route's token-bucket limits with 429.
+
+    Limits are checked before the request reaches the application, so a
+    rejected login costs a dict lookup instead of a bcrypt round. Per-username
+    limits read the "username" field of small JSON bodies; the body is
+    replayed to the application unchanged.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: List[RateLimitRule],
+        client_ip_header: str = "",
+        max_keys: int = 100_000,
+        sweep_interval: float = 60.0
+    ):
+        self.app = app
+        self.rules = {(rule.method, rule.path): rule for rule in rules}
+        self.client_ip_header = client_ip_header.lower()
+        self.buckets = TokenBuckets(max_keys=max_keys, sweep_interval=sweep_interval)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rule = self.rules.get((scope["method"], scope["path"]))
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        now = time.monotonic()
+        if rule.per_ip is not None:
+            retry_after = self.buckets.take((id(rule.per_ip), "ip", self._client_ip(scope)), rule.per_ip, now)
+            if retry_after:
+                await _reject(send, retry_after)
+                return
+
+        if rule.per_username is not None:
+            body, more = await _read_small_body(receive)
+            username = _username_from(body) if not more else None
+            if username is not None:
+                retry_after = self.buckets.take((id(rule.per_username), "user", username), rule.per_username, now)
+                if retry_after:
+                    await _reject(send, retry_after)
+                    return
+            receive = _replay(body, more, receive)
+
+        await self.app(scope, receive, send)
+
+    def _client_ip(self, scope: Scope) -> str:
+        if self.client_ip_header:
+            forwarded = Headers(scope=scope).get(self.client_ip_header)
+            if forwarded:
+                return forwarded.split(",", 1)[0].strip()
+        client = scope.get("client")
+        return client[0] if client else ""
+
+
+async def _reject(send: Send, retry_after: float) -> None:
+    body = b'{"detail":"Too many requests"}'
+    await send({
+        "type": "http.response.start",
+        "status": 429,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _read_small_body(receive: Receive) -> Tuple[bytes, bool]:
+    """
+    Read the request body up to MAX_BODY_FOR_USERNAME bytes.
+
+    Returns:
+        Tuple of (bytes read, whether more body remains unread)
+    """
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            return b"".join(chunks), False
+        chunk = message.get("body", b"")
+        chunks.append(chunk)
+        size += len(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks), False
+        if size > MAX_BODY_FOR_USERNAME:
+            return b"".join(chunks), True
+
+
+def _replay(body: bytes, more: bool, receive: Receive) -> Receive:
+    """Hand the already-read body back to the application, then defer to `receive`."""
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": more}
+        return await receive()
+
+    return replay
+
+
+def _username_from(body: bytes) -> Optional[str]:
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    username = data.get("username") if isinstance(data, dict) else None
+    return username if isinstance(username, str) else None
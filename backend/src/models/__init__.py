@@ -5,6 +5,8 @@ from .transaction import Transaction, TransactionType
 from .request import Request, RequestType, RequestStatus
 from .invitation import Invitation, InvitationStatus
 from .notification import Notification, NotificationType
+from .records import ChildRecord, ChildSnapshot, TransactionRecord
+from .ids import uuid7, new_id, id_timestamp, id_to_bytes, id_from_bytes, BinaryUUID
 
 __all__ = [
     "Family",
@@ -20,4 +22,13 @@ __all__ = [
     "InvitationStatus",
     "Notification",
     "NotificationType",
+    "ChildRecord",
+    "ChildSnapshot",
+    "TransactionRecord",
+    "uuid7",
+    "new_id",
+    "id_timestamp",
+    "id_to_bytes",
+    "id_from_bytes",
+    "BinaryUUID",
 ]
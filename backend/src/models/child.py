@@ -2,6 +2,7 @@ from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Numeric
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.config.database import Base
+from src.models.ids import BinaryUUID
 
 
 class Child(Base):
@@ -9,14 +10,15 @@ class Child(Base):
 
     __tablename__ = "children"
 
-    id = Column(String(36), primary_key=True)  # UUID
-    family_id = Column(String(36), ForeignKey("families.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(BinaryUUID, primary_key=True)  # UUID
+    family_id = Column(BinaryUUID, ForeignKey("families.id", ondelete="CASCADE"), nullable=False, index=True)
     username = Column(String(50), unique=True, nullable=False, index=True)
     name = Column(String(100), nullable=False)
     password_hash = Column(String(255), nullable=False)
     avatar = Column(String(10), nullable=True)  # Emoji or small identifier
     age = Column(Integer, nullable=True)
     balance = Column(Numeric(10, 2), default=0.00, nullable=False)
+    version = Column(Integer, default=0, nullable=False)  # Bumped when the child or its transactions change; drives ETags
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
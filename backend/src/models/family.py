@@ -1,7 +1,8 @@
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, Integer, DateTime
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.config.database import Base
+from src.models.ids import BinaryUUID
 
 
 class Family(Base):
@@ -9,9 +10,10 @@ class Family(Base):
 
     __tablename__ = "families"
 
-    id = Column(String(36), primary_key=True)  # UUID
+    id = Column(BinaryUUID, primary_key=True)  # UUID
     family_code = Column(String(8), unique=True, nullable=False, index=True)
     name = Column(String(100), nullable=False)
+    version = Column(Integer, default=0, nullable=False)  # Bumped when any child or transaction changes; drives ETags
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
@@ -2,6 +2,7 @@ from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.config.database import Base
+from src.models.ids import BinaryUUID
 import enum
 
 
@@ -16,10 +17,10 @@ class Invitation(Base):
 
     __tablename__ = "invitations"
 
-    id = Column(String(36), primary_key=True)  # UUID
-    family_id = Column(String(36), ForeignKey("families.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(BinaryUUID, primary_key=True)  # UUID
+    family_id = Column(BinaryUUID, ForeignKey("families.id", ondelete="CASCADE"), nullable=False, index=True)
     invite_code = Column(String(12), unique=True, nullable=False, index=True)
-    created_by_parent_id = Column(String(36), nullable=False)
+    created_by_parent_id = Column(BinaryUUID, nullable=False)
     status = Column(SQLEnum(InvitationStatus), default=InvitationStatus.PENDING, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     accepted_at = Column(DateTime, nullable=True)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Text, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Index, Text, Enum as SQLEnum, false
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.config.database import Base
+from src.models.ids import BinaryUUID
 import enum
 
 
@@ -20,15 +21,22 @@ class Notification(Base):
 
     __tablename__ = "notifications"
 
-    id = Column(String(36), primary_key=True)  # UUID
-    parent_admin_id = Column(String(36), ForeignKey("parent_admins.id", ondelete="CASCADE"), nullable=True, index=True)
-    child_id = Column(String(36), ForeignKey("children.id", ondelete="CASCADE"), nullable=True, index=True)
+    id = Column(BinaryUUID, primary_key=True)  # UUID
+    parent_admin_id = Column(BinaryUUID, ForeignKey("parent_admins.id", ondelete="CASCADE"), nullable=True, index=True)
+    child_id = Column(BinaryUUID, ForeignKey("children.id", ondelete="CASCADE"), nullable=True, index=True)
     type = Column(SQLEnum(NotificationType), nullable=False)
     title = Column(String(200), nullable=False)
     message = Column(Text, nullable=False)
-    is_read = Column(Boolean, default=False, nullable=False, index=True)
+    is_read = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
 
+    __table_args__ = (
+        # Unread counts read only the unread entries (is_read is included so the index covers the count);
+        # the statements must filter on is_read = 0 to use them
+        Index("ix_notifications_parent_admin_id_unread", parent_admin_id, is_read, sqlite_where=is_read == false()),
+        Index("ix_notifications_child_id_unread", child_id, is_read, sqlite_where=is_read == false()),
+    )
+
     # Relationships
     parent_admin = relationship("ParentAdmin", back_populates="notifications")
     child = relationship("Child", back_populates="notifications")
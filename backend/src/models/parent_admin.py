@@ -2,6 +2,7 @@ from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.config.database import Base
+from src.models.ids import BinaryUUID
 import enum
 
 
@@ -16,8 +17,8 @@ class ParentAdmin(Base):
 
     __tablename__ = "parent_admins"
 
-    id = Column(String(36), primary_key=True)  # UUID
-    family_id = Column(String(36), ForeignKey("families.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(BinaryUUID, primary_key=True)  # UUID
+    family_id = Column(BinaryUUID, ForeignKey("families.id", ondelete="CASCADE"), nullable=False, index=True)
     username = Column(String(50), unique=True, nullable=False, index=True)
     name = Column(String(100), nullable=False)
     password_hash = Column(String(255), nullable=False)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Numeric, Enum as SQLEnum, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Numeric, Enum as SQLEnum, Text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.config.database import Base
+from src.models.ids import BinaryUUID
 import enum
 
 
@@ -23,8 +24,8 @@ class Request(Base):
 
     __tablename__ = "requests"
 
-    id = Column(String(36), primary_key=True)  # UUID
-    child_id = Column(String(36), ForeignKey("children.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(BinaryUUID, primary_key=True)  # UUID
+    child_id = Column(BinaryUUID, ForeignKey("children.id", ondelete="CASCADE"), nullable=False, index=True)
     type = Column(SQLEnum(RequestType), nullable=False)
     amount = Column(Numeric(10, 2), nullable=False)
     reason = Column(Text, nullable=False)
@@ -32,7 +33,7 @@ class Request(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     resolved_at = Column(DateTime, nullable=True)
-    resolved_by_parent_id = Column(String(36), nullable=True)
+    resolved_by_parent_id = Column(BinaryUUID, nullable=True)
 
     # Relationships
     child = relationship("Child", back_populates="requests")
@@ -0,0 +1,189 @@
+"""
+Prebuilt SELECT statements for the hottest lookups.
+
+Each statement is constructed once at import time with named bind parameters,
+so callers skip ORM query construction on every request and SQLAlchemy reuses
+the compiled SQL from the engine's compiled cache.
+
+The *_ROWS_* statements select plain columns instead of entities, so results
+come back as Core rows without ORM identity-map bookkeeping or hydration.
+
+Usage:
+    db.scalars(CHILD_BY_ID, {"child_id": child_id}).first()
+"""
+from functools import lru_cache
+from typing import Tuple
+from sqlalchemy import Select, bindparam, false, func, select, update
+from src.models.family import Family
+from src.models.parent_admin import ParentAdmin
+from src.models.child import Child
+from src.models.transaction import Transaction
+from src.models.invitation import Invitation, InvitationStatus
+from src.models.notification import Notification
+
+# Family lookups
+FAMILY_BY_ID = select(Family).where(Family.id == bindparam("family_id"))
+FAMILY_BY_CODE = select(Family).where(Family.family_code == bindparam("family_code"))
+
+# Parent lookups
+PARENT_BY_ID = select(ParentAdmin).where(ParentAdmin.id == bindparam("parent_id"))
+PARENT_BY_USERNAME = select(ParentAdmin).where(ParentAdmin.username == bindparam("username"))
+
+# Family version of an authenticated parent, in one lookup
+PARENT_SCOPE = (
+    select(ParentAdmin.family_id, Family.version)
+    .join(Family, Family.id == ParentAdmin.family_id)
+    .where(ParentAdmin.id == bindparam("parent_id"))
+)
+
+# Child lookups
+CHILD_BY_ID = select(Child).where(Child.id == bindparam("child_id"))
+CHILD_BY_ID_FOR_UPDATE = CHILD_BY_ID.with_for_update()
+CHILD_BY_USERNAME = select(Child).where(Child.username == bindparam("username"))
+CHILDREN_BY_FAMILY = select(Child).where(Child.family_id == bindparam("family_id"))
+CHILD_USERNAMES_IN = select(Child.username).where(Child.username.in_(bindparam("usernames", expanding=True)))
+
+CHILD_ROW_COLUMNS = (
+    Child.id,
+    Child.username,
+    Child.name,
+    Child.avatar,
+    Child.age,
+    Child.balance,
+    Child.created_at,
+)
+CHILD_ROWS_BY_FAMILY = select(*CHILD_ROW_COLUMNS).where(Child.family_id == bindparam("family_id"))
+
+CHILD_SNAPSHOT_COLUMNS = (
+    Child.id,
+    Child.family_id,
+    Child.username,
+    Child.name,
+    Child.avatar,
+    Child.age,
+    Child.balance,
+    Child.created_at,
+    Child.version,
+)
+CHILD_SNAPSHOT_BY_ID = select(*CHILD_SNAPSHOT_COLUMNS).where(Child.id == bindparam("child_id"))
+
+# Transaction lookups
+TRANSACTION_BY_ID = select(Transaction).where(Transaction.id == bindparam("transaction_id"))
+
+TRANSACTIONS_BY_CHILD = (
+    select(Transaction)
+    .where(Transaction.child_id == bindparam("child_id"))
+    .order_by(Transaction.created_at.desc())
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+
+TRANSACTIONS_BY_FAMILY = (
+    select(Transaction)
+    .join(Child, Transaction.child_id == Child.id)
+    .where(Child.family_id == bindparam("family_id"))
+    .order_by(Transaction.created_at.desc())
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+
+TRANSACTION_ROW_COLUMNS = (
+    Transaction.id,
+    Transaction.child_id,
+    Transaction.parent_admin_id,
+    Transaction.type,
+    Transaction.amount,
+    Transaction.balance_before,
+    Transaction.balance_after,
+    Transaction.description,
+    Transaction.category,
+    Transaction.created_at,
+)
+
+TRANSACTION_ROWS_BY_CHILD = (
+    select(*TRANSACTION_ROW_COLUMNS)
+    .where(Transaction.child_id == bindparam("child_id"))
+    .order_by(Transaction.created_at.desc())
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+
+TRANSACTION_ROWS_BY_FAMILY = (
+    select(*TRANSACTION_ROW_COLUMNS)
+    .join(Child, Transaction.child_id == Child.id)
+    .where(Child.family_id == bindparam("family_id"))
+    .order_by(Transaction.created_at.desc())
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+
+TRANSACTION_ROW_WITH_FAMILY = (
+    select(*TRANSACTION_ROW_COLUMNS, Child.family_id)
+    .join(Child, Transaction.child_id == Child.id)
+    .where(Transaction.id == bindparam("transaction_id"))
+)
+
+TRANSACTION_FIELDS = tuple(col.key for col in TRANSACTION_ROW_COLUMNS)
+_TRANSACTION_COLUMNS = {col.key: col for col in TRANSACTION_ROW_COLUMNS}
+
+
+@lru_cache(maxsize=64)
+def transaction_rows_by_child(fields: Tuple[str, ...]) -> Select:
+    """TRANSACTION_ROWS_BY_CHILD selecting only `fields`, built once per field set."""
+    return TRANSACTION_ROWS_BY_CHILD.with_only_columns(*(_TRANSACTION_COLUMNS[f] for f in fields))
+
+
+@lru_cache(maxsize=64)
+def transaction_rows_by_family(fields: Tuple[str, ...]) -> Select:
+    """TRANSACTION_ROWS_BY_FAMILY selecting only `fields`, built once per field set."""
+    return TRANSACTION_ROWS_BY_FAMILY.with_only_columns(*(_TRANSACTION_COLUMNS[f] for f in fields))
+
+
+# Last `per_child` transactions of every child in a family, in one window query
+_ranked_family_transactions = (
+    select(
+        *TRANSACTION_ROW_COLUMNS,
+        func.row_number().over(
+            partition_by=Transaction.child_id,
+            order_by=Transaction.created_at.desc()
+        ).label("recent_rank")
+    )
+    .join(Child, Transaction.child_id == Child.id)
+    .where(Child.family_id == bindparam("family_id"))
+    .subquery()
+)
+RECENT_TRANSACTION_ROWS_BY_FAMILY = (
+    select(*(_ranked_family_transactions.c[col.key] for col in TRANSACTION_ROW_COLUMNS))
+    .where(_ranked_family_transactions.c.recent_rank <= bindparam("per_child"))
+    .order_by(_ranked_family_transactions.c.child_id, _ranked_family_transactions.c.created_at.desc())
+)
+
+# Dashboard counters and invitations
+# count(*) rather than count(id), so the partial unread indexes cover the count
+UNREAD_NOTIFICATIONS_BY_PARENT = select(func.count()).select_from(Notification).where(
+    Notification.parent_admin_id == bindparam("parent_id"),
+    Notification.is_read == false()
+)
+UNREAD_NOTIFICATIONS_BY_CHILD = select(func.count()).select_from(Notification).where(
+    Notification.child_id == bindparam("child_id"),
+    Notification.is_read == false()
+)
+PENDING_INVITATION_ROWS_BY_FAMILY = (
+    select(Invitation.id, Invitation.invite_code, Invitation.status, Invitation.created_at)
+    .where(Invitation.family_id == bindparam("family_id"), Invitation.status == InvitationStatus.PENDING)
+    .order_by(Invitation.created_at.desc())
+)
+
+# Version counters, bumped inside the write's own transaction
+BUMP_FAMILY_VERSION = (
+    update(Family)
+    .where(Family.id == bindparam("family_id"))
+    .values(version=Family.version + 1)
+    .execution_options(synchronize_session=False)
+)
+BUMP_CHILD_VERSION = (
+    update(Child)
+    .where(Child.id == bindparam("child_id"))
+    .values(version=Child.version + 1)
+    .execution_options(synchronize_session=False)
+)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Numeric, Enum as SQLEnum, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Numeric, Enum as SQLEnum, Text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from src.config.database import Base
+from src.models.ids import BinaryUUID
 import enum
 
 
@@ -16,9 +17,9 @@ class Transaction(Base):
 
     __tablename__ = "transactions"
 
-    id = Column(String(36), primary_key=True)  # UUID
-    child_id = Column(String(36), ForeignKey("children.id", ondelete="CASCADE"), nullable=False, index=True)
-    parent_admin_id = Column(String(36), ForeignKey("parent_admins.id", ondelete="SET NULL"), nullable=True, index=True)
+    id = Column(BinaryUUID, primary_key=True)  # UUID
+    child_id = Column(BinaryUUID, ForeignKey("children.id", ondelete="CASCADE"), nullable=False)
+    parent_admin_id = Column(BinaryUUID, ForeignKey("parent_admins.id", ondelete="SET NULL"), nullable=True, index=True)
     type = Column(SQLEnum(TransactionType), nullable=False)
     amount = Column(Numeric(10, 2), nullable=False)
     balance_before = Column(Numeric(10, 2), nullable=False)
@@ -27,6 +28,11 @@ class Transaction(Base):
     category = Column(String(50), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
 
+    __table_args__ = (
+        # A child's history in created_at order without a sort; also serves child_id lookups
+        Index("ix_transactions_child_id_created_at", "child_id", "created_at"),
+    )
+
     # Relationships
     child = relationship("Child", back_populates="transactions")
     parent_admin = relationship("ParentAdmin", back_populates="transactions")
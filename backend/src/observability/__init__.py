@@ -0,0 +1,121 @@
+from .metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    timed,
+    register_collector,
+    render_metrics,
+    gauge_lines,
+    HTTP_REQUESTS,
+    HTTP_ERRORS,
+    HTTP_REQUEST_SECONDS,
+    HTTP_IN_FLIGHT,
+    HTTP_REQUEST_QUERIES,
+    HTTP_REQUEST_PEAK_BYTES,
+    DB_SLOW_QUERIES,
+    DB_LOCK_WAIT_SECONDS,
+    DB_WRITE_CONTENTION_SECONDS,
+    DB_WRITE_RETRIES,
+    DB_WRITE_TIMEOUTS,
+    DB_WRITES_QUEUED,
+    DB_COMMIT_SECONDS,
+    CHILD_CACHE_LOOKUPS,
+    BCRYPT_VERIFY_SECONDS,
+    JWT_DECODE_SECONDS,
+)
+from .timing import PHASES, RequestTimings, request_timings, record_phase, phase, count_orm_loads
+from .profiling import SamplingProfiler
+from .memory import (
+    SnapshotInfo,
+    start_tracing,
+    stop_tracing,
+    take_snapshot,
+    list_snapshots,
+    diff_snapshots,
+    record_route_peak,
+    route_peaks,
+    track_sessions,
+    identity_map_stats,
+    tracing_status,
+)
+from .sqlite_stats import track_connections, sqlite_collector
+from .queries import (
+    QueryCounter,
+    QueryBudgetExceeded,
+    request_queries,
+    instrument_queries,
+    count_queries,
+    query_budget,
+    plan_tree,
+)
+from .query_plans import (
+    PlannedQuery,
+    PlanReport,
+    QUERY_PLANS,
+    explain,
+    review_plans,
+    review_database,
+    suggest_index,
+    format_report,
+)
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "timed",
+    "register_collector",
+    "render_metrics",
+    "gauge_lines",
+    "HTTP_REQUESTS",
+    "HTTP_ERRORS",
+    "HTTP_REQUEST_SECONDS",
+    "HTTP_IN_FLIGHT",
+    "HTTP_REQUEST_QUERIES",
+    "HTTP_REQUEST_PEAK_BYTES",
+    "DB_SLOW_QUERIES",
+    "DB_LOCK_WAIT_SECONDS",
+    "DB_WRITE_CONTENTION_SECONDS",
+    "DB_WRITE_RETRIES",
+    "DB_WRITE_TIMEOUTS",
+    "DB_WRITES_QUEUED",
+    "DB_COMMIT_SECONDS",
+    "CHILD_CACHE_LOOKUPS",
+    "BCRYPT_VERIFY_SECONDS",
+    "JWT_DECODE_SECONDS",
+    "PHASES",
+    "RequestTimings",
+    "request_timings",
+    "record_phase",
+    "phase",
+    "count_orm_loads",
+    "SamplingProfiler",
+    "SnapshotInfo",
+    "start_tracing",
+    "stop_tracing",
+    "take_snapshot",
+    "list_snapshots",
+    "diff_snapshots",
+    "record_route_peak",
+    "route_peaks",
+    "track_sessions",
+    "identity_map_stats",
+    "tracing_status",
+    "track_connections",
+    "sqlite_collector",
+    "QueryCounter",
+    "QueryBudgetExceeded",
+    "request_queries",
+    "instrument_queries",
+    "count_queries",
+    "query_budget",
+    "plan_tree",
+    "PlannedQuery",
+    "PlanReport",
+    "QUERY_PLANS",
+    "explain",
+    "review_plans",
+    "review_database",
+    "suggest_index",
+    "format_report",
+]
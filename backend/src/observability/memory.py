@@ -0,0 +1,211 @@
+"""
+Memory diagnostics: tracemalloc snapshots and diffs, session identity-map sizes
+and per-route peak allocation.
+
+Tracing is off unless started (MEMORY_TRACE_ON_STARTUP or the admin API)
+because tracemalloc slows every allocation. While it runs, MemoryMiddleware
+records each request's peak allocation above its starting point. The peak is
+process-wide, so overlapping requests inflate each other's figures; compare
+routes on a quiet instance or under a single-client benchmark.
+
+Usage:
+    start_tracing()
+    first = take_snapshot()
+    ...
+    for line in diff_snapshots(first.id, take_snapshot().id):
+        print(line)
+"""
+import itertools
+import threading
+import tracemalloc
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Tuple
+from sqlalchemy import event
+from src.observability.metrics import HTTP_REQUEST_PEAK_BYTES, Labels
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Snapshots kept for diffing; each holds every traced allocation site
+MAX_SNAPSHOTS = 4
+
+# Allocations made by the diagnostics themselves are left out of snapshots
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class SnapshotInfo(NamedTuple):
+    """A stored snapshot's id and the traced memory when it was taken."""
+    id: int
+    taken_at: datetime
+    traced_bytes: int
+    peak_bytes: int
+
+
+_snapshots: "OrderedDict[int, Tuple[SnapshotInfo, tracemalloc.Snapshot]]" = OrderedDict()
+_snapshot_ids = itertools.count(1)
+_snapshots_lock = threading.Lock()
+
+# Per route since tracing started: [largest peak, requests, sum of peaks]. The
+# HTTP_REQUEST_PEAK_BYTES histogram also counts earlier tracing sessions
+_route_peaks: Dict[Labels, List[int]] = {}
+_live_sessions: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def start_tracing(frames: int = 10) -> bool:
+    """
+    Start tracemalloc, keeping `frames` frames per allocation.
+
+    Returns:
+        False if it was already tracing
+    """
+    if tracemalloc.is_tracing():
+        return False
+    _route_peaks.clear()
+    tracemalloc.start(frames)
+    return True
+
+
+def stop_tracing() -> None:
+    """Stop tracemalloc and drop stored snapshots and route peaks."""
+    tracemalloc.stop()
+    with _snapshots_lock:
+        _snapshots.clear()
+    _route_peaks.clear()
+
+
+def take_snapshot() -> SnapshotInfo:
+    """
+    Take and store a tracemalloc snapshot; the oldest is dropped beyond MAX_SNAPSHOTS.
+
+    Raises:
+        RuntimeError: If tracemalloc is not tracing
+    """
+    if not tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc is not tracing; start tracing first")
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+    with _snapshots_lock:
+        info = SnapshotInfo(next(_snapshot_ids), datetime.utcnow(), current, peak)
+        _snapshots[info.id] = (info, snapshot)
+        while len(_snapshots) > MAX_SNAPSHOTS:
+            _snapshots.popitem(last=False)
+    return info
+
+
+def list_snapshots() -> List[SnapshotInfo]:
+    """Stored snapshots, oldest first."""
+    with _snapshots_lock:
+        return [info for info, _ in _snapshots.values()]
+
+
+def diff_snapshots(old_id: int, new_id: int, key_type: str = "lineno", limit: int = 25) -> List[Dict[str, Any]]:
+    """
+    Allocation sites that grew or shrank the most between two snapshots.
+
+    Args:
+        old_id: Id of the earlier snapshot
+        new_id: Id of the later snapshot
+        key_type: Group by "lineno", "filename" or "traceback"
+        limit: Number of sites to return
+
+    Returns:
+        Dicts with site, size_bytes, size_diff_bytes, count and count_diff, largest change first
+
+    Raises:
+        KeyError: If either snapshot is not stored
+        ValueError: If key_type is not supported
+    """
+    if key_type not in ("lineno", "filename", "traceback"):
+        raise ValueError(f"Invalid key type: {key_type}")
+    with _snapshots_lock:
+        _, old = _snapshots[old_id]
+        _, new = _snapshots[new_id]
+    stats = new.compare_to(old, key_type)
+    return [
+        {
+            "site": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+            if key_type == "traceback" else f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_bytes": stat.size,
+            "size_diff_bytes": stat.size_diff,
+            "count": stat.count,
+            "count_diff": stat.count_diff,
+        }
+        for stat in stats[:limit]
+    ]
+
+
+def record_route_peak(labels: Labels, peak_bytes: int) -> None:
+    """Record one request's peak allocation for its (method, route)."""
+    HTTP_REQUEST_PEAK_BYTES.observe(peak_bytes, labels)
+    stats = _route_peaks.setdefault(labels, [0, 0, 0])
+    stats[0] = max(stats[0], peak_bytes)
+    stats[1] += 1
+    stats[2] += peak_bytes
+
+
+def route_peaks() -> List[Dict[str, Any]]:
+    """Largest and mean peak allocation per route since tracing started, largest first."""
+    report = []
+    for labels, (largest, count, total) in list(_route_peaks.items()):
+        report.append({
+            "method": labels[0],
+            "route": labels[1],
+            "requests": count,
+            "max_peak_bytes": largest,
+            "mean_peak_bytes": total // count if count else 0,
+        })
+    return sorted(report, key=lambda row: row["max_peak_bytes"], reverse=True)
+
+
+def track_sessions(session_class: Any) -> None:
+    """Remember sessions of this class, weakly, when they begin a transaction."""
+    @event.listens_for(session_class, "after_begin")
+    def _began(session, transaction, connection):
+        _live_sessions.add(session)
+
+
+def identity_map_stats() -> Dict[str, Any]:
+    """
+    Sizes of the identity maps of live tracked sessions.
+
+    Returns:
+        Dict with sessions, objects, largest (objects in the biggest map) and by_class counts
+    """
+    by_class: Dict[str, int] = {}
+    sizes = []
+    for session in list(_live_sessions):
+        # Snapshot the map: another thread may be loading into it
+        objects = list(session.identity_map.values())
+        sizes.append(len(objects))
+        for obj in objects:
+            name = type(obj).__name__
+            by_class[name] = by_class.get(name, 0) + 1
+    return {
+        "sessions": len(sizes),
+        "objects": sum(sizes),
+        "largest": max(sizes, default=0),
+        "by_class": dict(sorted(by_class.items(), key=lambda item: item[1], reverse=True)),
+    }
+
+
+def tracing_status() -> Dict[str, Any]:
+    """Whether tracemalloc is tracing, current and peak traced bytes, and the process's peak RSS."""
+    tracing = tracemalloc.is_tracing()
+    current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+    return {
+        "tracing": tracing,
+        "frames": tracemalloc.get_traceback_limit() if tracing else 0,
+        "traced_bytes": current,
+        "peak_bytes": peak,
+        # ru_maxrss is in kilobytes on Linux
+        "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024 if resource else None,
+    }
@@ -0,0 +1,236 @@
+"""
+Prometheus-style metrics with lock-free recording.
+
+Every thread records into its own shard (a dict of plain lists), so observing
+a value is a couple of dict lookups and in-place additions with no lock and
+no contention. Shards are summed when /metrics is scraped.
+
+Usage:
+    HTTP_REQUEST_SECONDS.observe(0.012, ("GET", "/api/v1/children/"))
+    with timed(DB_COMMIT_SECONDS):
+        db.commit()
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from src.observability.timing import record_phase
+
+Labels = Tuple[str, ...]
+
+# Latency buckets in seconds, from sub-millisecond lookups to slow bcrypt rounds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_metrics: List["Metric"] = []
+_collectors: List[Callable[[], List[str]]] = []
+_shards: List[Dict[Tuple[int, Labels], List[float]]] = []
+_shards_lock = threading.Lock()
+_local = threading.local()
+
+
+def _shard() -> Dict[Tuple[int, Labels], List[float]]:
+    try:
+        return _local.shard
+    except AttributeError:
+        shard = _local.shard = {}
+        # Taken once per thread, never while recording
+        with _shards_lock:
+            _shards.append(shard)
+        return shard
+
+
+class Metric:
+    """Base class: a named family of cells, one cell per label set."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._index = len(_metrics)
+        _metrics.append(self)
+
+    def _new_cell(self) -> List[float]:
+        return [0.0]
+
+    def _cell(self, labels: Labels) -> List[float]:
+        shard = _shard()
+        key = (self._index, labels)
+        cell = shard.get(key)
+        if cell is None:
+            cell = shard[key] = self._new_cell()
+        return cell
+
+    def collect(self) -> Dict[Labels, List[float]]:
+        """Sum this metric's cells across all thread shards."""
+        totals: Dict[Labels, List[float]] = {}
+        with _shards_lock:
+            shards = list(_shards)
+        for shard in shards:
+            # dict.copy() runs without releasing the GIL, so it is safe against writers
+            for (index, labels), cell in shard.copy().items():
+                if index != self._index:
+                    continue
+                total = totals.get(labels)
+                if total is None:
+                    totals[labels] = list(cell)
+                else:
+                    for i, value in enumerate(cell):
+                        total[i] += value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for labels, cell in sorted(self.collect().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(cell[0])}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self._cell(labels)[0] += amount
+
+
+class Gauge(Metric):
+    """Value that goes up and down; increments from all threads are summed."""
+
+    kind = "gauge"
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self._cell(labels)[0] += amount
+
+    def dec(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self._cell(labels)[0] -= amount
+
+
+class Histogram(Metric):
+    """Distribution of observed values in fixed buckets, with count and sum."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_cell(self) -> List[float]:
+        # One slot per bucket plus +Inf, then count and sum
+        return [0.0] * (len(self.buckets) + 3)
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        cell = self._cell(labels)
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-2] += 1
+        cell[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        names = self.labelnames + ("le",)
+        for labels, cell in sorted(self.collect().items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), cell):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(names, labels + (le,))} {_format_value(cumulative)}")
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_count{suffix} {_format_value(cell[-2])}")
+            lines.append(f"{self.name}_sum{suffix} {_format_value(cell[-1])}")
+        return lines
+
+
+@contextmanager
+def timed(histogram: Histogram, labels: Labels = (), phase: Optional[str] = None) -> Iterator[None]:
+    """
+    Observe the wall time of the block, including when it raises.
+
+    With `phase`, the time is also added to that phase of the current
+    request's Server-Timing breakdown.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        histogram.observe(elapsed, labels)
+        if phase is not None:
+            record_phase(phase, elapsed)
+
+
+def register_collector(collector: Callable[[], List[str]]) -> None:
+    """Add a function that renders extra exposition lines at scrape time."""
+    _collectors.append(collector)
+
+
+def render_metrics() -> str:
+    """Render every metric and collector in the Prometheus text format."""
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
+
+
+def gauge_lines(name: str, documentation: str, value: float) -> List[str]:
+    """Exposition lines for a single unlabelled gauge computed at scrape time."""
+    return [f"# HELP {name} {documentation}", f"# TYPE {name} gauge", f"{name} {_format_value(value)}"]
+
+
+def _format_labels(names: Sequence[str], values: Labels) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+# Hot-path instruments
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+HTTP_ERRORS = Counter("http_request_errors_total", "HTTP requests that failed with a 5xx or an exception.", ("method", "route"))
+HTTP_REQUEST_SECONDS = Histogram("http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"))
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+HTTP_REQUEST_QUERIES = Histogram(
+    "http_request_queries", "Database statements run per HTTP request.", ("method", "route"),
+    buckets=(1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50)
+)
+HTTP_REQUEST_PEAK_BYTES = Histogram(
+    "http_request_peak_allocated_bytes", "Peak Python allocation above the request's baseline (while tracemalloc traces).",
+    ("method", "route"), buckets=(16_384, 65_536, 262_144, 1_048_576, 4_194_304, 16_777_216, 67_108_864)
+)
+DB_SLOW_QUERIES = Counter("db_slow_queries_total", "Statements slower than SLOW_QUERY_MS.")
+DB_LOCK_WAIT_SECONDS = Histogram("db_lock_wait_seconds", "Time waiting for BEGIN IMMEDIATE to acquire the write lock.")
+DB_WRITE_CONTENTION_SECONDS = Histogram(
+    "db_write_contention_seconds", "Time each write lost to SQLITE_BUSY: failed attempts and backoff.",
+    buckets=(0, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+DB_WRITE_RETRIES = Counter("db_write_retries_total", "Writes retried after SQLITE_BUSY.")
+DB_WRITE_TIMEOUTS = Counter("db_write_timeouts_total", "Writes abandoned with 503 after the retry deadline.")
+DB_WRITES_QUEUED = Gauge("db_writes_queued", "Writes in progress or waiting for the write lock.")
+DB_COMMIT_SECONDS = Histogram("db_commit_seconds", "Time spent committing write transactions.")
+CHILD_CACHE_LOOKUPS = Counter("child_cache_lookups_total", "Child snapshot lookups by result (hit or miss).", ("result",))
+BCRYPT_VERIFY_SECONDS = Histogram(
+    "bcrypt_verify_seconds", "Time spent verifying passwords with bcrypt.",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0)
+)
+JWT_DECODE_SECONDS = Histogram(
+    "jwt_decode_seconds", "Time spent decoding and verifying JWTs.",
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025)
+)
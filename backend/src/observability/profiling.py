@@ -0,0 +1,88 @@
+"""
+Stdlib sampling profiler for profiling a single request.
+
+A background thread reads sys._current_frames() every interval and counts
+each busy thread's stack. Threads parked in the event loop's selector or
+waiting on a queue are skipped, so the profile shows the request's work on
+the event loop and in worker threads. Other requests running at the same
+time are sampled too, so profile on a quiet instance where possible.
+
+Stacks are written in the folded format ("outer;inner;leaf count" per line)
+read by flamegraph.pl and speedscope.
+
+Usage:
+    profiler = SamplingProfiler(interval=0.005)
+    profiler.start()
+    ...
+    folded = profiler.stop()
+"""
+import os
+import sys
+import threading
+from collections import Counter
+from types import FrameType
+from typing import Optional
+
+# A thread whose innermost frame is in one of these is idle, not working
+_IDLE_FILES = tuple(
+    os.sep + path for path in ("threading.py", "queue.py", "selectors.py", os.path.join("concurrent", "futures", "thread.py"))
+)
+
+MAX_DEPTH = 128
+
+
+class SamplingProfiler:
+    """Count the stacks of busy threads at a fixed interval."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        """
+        Stop sampling.
+
+        Returns:
+            The profile in folded-stack format, most frequent stacks first
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or frame.f_code.co_filename.endswith(_IDLE_FILES):
+                    continue
+                self.stacks[_fold(frame)] += 1
+
+
+def _fold(frame: Optional[FrameType]) -> str:
+    labels = []
+    while frame is not None and len(labels) < MAX_DEPTH:
+        code = frame.f_code
+        labels.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def _short_path(filename: str) -> str:
+    # Installed packages from their package directory, application code relative to the cwd
+    _, found, package_path = filename.rpartition("site-packages" + os.sep)
+    if found:
+        return package_path
+    try:
+        path = os.path.relpath(filename)
+    except ValueError:
+        return filename
+    return filename if path.startswith("..") else path
@@ -0,0 +1,142 @@
+"""
+Statement counting, the slow-query log and query budgets.
+
+instrument_queries() hooks an engine's before/after_cursor_execute events.
+Each statement is counted against the request's QueryCounter (set by
+MetricsMiddleware) and against any count_queries() block, its time is added
+to the request's "db" Server-Timing phase, and statements
+slower than the threshold are logged with their EXPLAIN QUERY PLAN.
+
+Usage:
+    with query_budget(3):
+        client.get("/api/v1/children/", headers=headers)
+"""
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from src.observability.metrics import DB_SLOW_QUERIES
+from src.observability.timing import record_phase
+
+logger = logging.getLogger(__name__)
+
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+class QueryCounter:
+    """Number of statements run, optionally with their SQL."""
+
+    __slots__ = ("count", "statements")
+
+    def __init__(self, keep_statements: bool = False):
+        self.count = 0
+        self.statements: Optional[List[str]] = [] if keep_statements else None
+
+    def add(self, statement: str) -> None:
+        self.count += 1
+        if self.statements is not None:
+            self.statements.append(statement)
+
+
+# Statements run on behalf of the current request
+request_queries: ContextVar[Optional[QueryCounter]] = ContextVar("request_queries", default=None)
+
+# count_queries() blocks see statements from every thread, so they also cover
+# requests served by a TestClient's event loop thread
+_block_counters: List[QueryCounter] = []
+_block_counters_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A block or route ran more statements than its declared budget."""
+
+
+def instrument_queries(engine: Engine, slow_query_ms: float = 0, explain: bool = True) -> None:
+    """
+    Count the engine's statements and log slow ones.
+
+    Args:
+        engine: Engine to instrument
+        slow_query_ms: Log statements taking at least this long; 0 disables the log
+        explain: Include EXPLAIN QUERY PLAN output in slow-query log entries
+    """
+    threshold = slow_query_ms / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def record_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        record_phase("db", elapsed)
+
+        counter = request_queries.get()
+        if counter is not None:
+            counter.add(statement)
+        if _block_counters:
+            for block_counter in list(_block_counters):
+                block_counter.add(statement)
+
+        if threshold and elapsed >= threshold:
+            DB_SLOW_QUERIES.inc()
+            plan = _explain(cursor, statement, parameters) if explain and not executemany else None
+            logger.warning(
+                "Slow query (%.1f ms): %s\nParameters: %r%s",
+                elapsed * 1000, statement, parameters, f"\nQuery plan:\n{plan}" if plan else ""
+            )
+
+
+def _explain(cursor, statement: str, parameters) -> Optional[str]:
+    """EXPLAIN QUERY PLAN for a statement, rendered as an indented tree."""
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    try:
+        rows = cursor.connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    except (sqlite3.Error, AttributeError):
+        return None
+
+    return "\n".join(f"{'  ' * depth}{detail}" for depth, detail in plan_tree(rows))
+
+
+def plan_tree(rows: List[tuple]) -> List[Tuple[int, str]]:
+    """Nesting depth and detail of each EXPLAIN QUERY PLAN row (id, parent, notused, detail)."""
+    depth = {0: -1}
+    nodes = []
+    for node_id, parent_id, _, detail in rows:
+        depth[node_id] = depth.get(parent_id, -1) + 1
+        nodes.append((depth[node_id], detail))
+    return nodes
+
+
+@contextmanager
+def count_queries(keep_statements: bool = True) -> Iterator[QueryCounter]:
+    """Count statements run on instrumented engines, from any thread, inside the block."""
+    counter = QueryCounter(keep_statements)
+    with _block_counters_lock:
+        _block_counters.append(counter)
+    try:
+        yield counter
+    finally:
+        with _block_counters_lock:
+            _block_counters.remove(counter)
+
+
+@contextmanager
+def query_budget(budget: int, label: str = "block") -> Iterator[QueryCounter]:
+    """
+    Fail when the block runs more than `budget` statements.
+
+    Raises:
+        QueryBudgetExceeded: Listing every statement the block ran
+    """
+    with count_queries() as counter:
+        yield counter
+    if counter.count > budget:
+        statements = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(counter.statements, 1))
+        raise QueryBudgetExceeded(f"{label} ran {counter.count} queries, budget is {budget}:\n{statements}")
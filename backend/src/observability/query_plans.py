@@ -0,0 +1,459 @@
+"""
+EXPLAIN QUERY PLAN review of the application's queries.
+
+QUERY_PLANS lists the statements the services and auth dependencies run,
+with representative parameters and what each plan must look like: the index
+it should search and whether a temp B-tree sort is acceptable (e.g. merging
+the histories of one family's children). review_plans() explains each one on
+a connection and reports:
+
+- full scans: "SCAN <table>" of a table or of a whole index instead of a SEARCH
+- temp sorts: "USE TEMP B-TREE FOR ORDER BY" (or GROUP BY / DISTINCT / window)
+- residual filters: WHERE columns of a searched table that the index neither
+  contains nor implies, so matching rows are read and then thrown away
+- a plan that does not use the expected index
+
+For a flagged query, suggest_index() proposes an index from the statement's
+equality filters and ORDER BY (literal filters such as is_read = 0 become a
+partial index). Plans depend on table statistics, so review a database with
+realistic data that has been analyzed: review_database() builds the schema
+with Alembic or from the models, seeds families, children, transactions,
+notifications and invitations in typical proportions, runs ANALYZE and
+reviews it. The test suite and benchmarks.query_plans both use it.
+
+Usage:
+    with engine.connect() as conn:
+        for report in review_plans(conn):
+            print(format_report(report))
+
+    reports = review_database("/tmp/plans.db", schema="migrations")
+"""
+import os
+import random
+import re
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+from sqlalchemy import Column, Table, create_engine, event
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select, operators, visitors
+from sqlalchemy.sql.elements import BindParameter, BinaryExpression, BooleanClauseList, False_, True_, UnaryExpression
+from src.config.database import Base
+from src.models import statements, uuid7
+from src.observability.queries import plan_tree
+
+_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+_SEARCH = re.compile(r"^SEARCH (?:TABLE )?(\w+) USING (?:COVERING )?(?:INDEX (\w+))?")
+_TEMP_SORT = "USE TEMP B-TREE"
+
+# Placeholder id; plans do not depend on the value
+_ID = "00000000-0000-7000-8000-000000000000"
+_PAGE = {"limit": 50, "offset": 0}
+
+# Shape of the seeded review database, per family and per user
+NOTIFICATIONS_PER_USER = 40
+UNREAD_SHARE = 0.1
+INVITATIONS_PER_FAMILY = 4
+
+
+class PlannedQuery(NamedTuple):
+    """A statement to explain and what its plan is expected to be."""
+    name: str
+    statement: Any
+    params: Dict[str, Any]
+    # Index the plan must use, if any
+    index: Optional[str] = None
+    # A temp B-tree sort is acceptable (the rows sorted are bounded by one family)
+    temp_sort: bool = False
+    # Columns that may be filtered after the index lookup
+    residual: Tuple[str, ...] = ()
+    # The index must cover the query, so no table rows are read
+    covering: bool = False
+
+
+class PlanReport(NamedTuple):
+    """The plan of one PlannedQuery and everything wrong with it."""
+    query: PlannedQuery
+    plan: List[str]
+    problems: List[str]
+    suggestion: Optional[str]
+
+
+QUERY_PLANS: List[PlannedQuery] = [
+    PlannedQuery("family by id", statements.FAMILY_BY_ID, {"family_id": _ID}, "sqlite_autoindex_families_1"),
+    PlannedQuery("family by code", statements.FAMILY_BY_CODE, {"family_code": "ABCD1234"}, "ix_families_family_code"),
+    PlannedQuery("parent by id", statements.PARENT_BY_ID, {"parent_id": _ID}, "sqlite_autoindex_parent_admins_1"),
+    PlannedQuery("parent by username", statements.PARENT_BY_USERNAME, {"username": "mom"}, "ix_parent_admins_username"),
+    PlannedQuery("parent scope", statements.PARENT_SCOPE, {"parent_id": _ID}, "sqlite_autoindex_parent_admins_1"),
+    PlannedQuery("child by id", statements.CHILD_BY_ID, {"child_id": _ID}, "sqlite_autoindex_children_1"),
+    PlannedQuery("child by username", statements.CHILD_BY_USERNAME, {"username": "kid"}, "ix_children_username"),
+    PlannedQuery(
+        "child usernames in", statements.CHILD_USERNAMES_IN, {"usernames": ["kid1", "kid2"]}, "ix_children_username",
+        covering=True
+    ),
+    PlannedQuery("child snapshot", statements.CHILD_SNAPSHOT_BY_ID, {"child_id": _ID}, "sqlite_autoindex_children_1"),
+    PlannedQuery("children of family", statements.CHILDREN_BY_FAMILY, {"family_id": _ID}, "ix_children_family_id"),
+    PlannedQuery("child rows of family", statements.CHILD_ROWS_BY_FAMILY, {"family_id": _ID}, "ix_children_family_id"),
+    PlannedQuery("transaction by id", statements.TRANSACTION_BY_ID, {"transaction_id": _ID}, "sqlite_autoindex_transactions_1"),
+    PlannedQuery(
+        "transaction row with family", statements.TRANSACTION_ROW_WITH_FAMILY, {"transaction_id": _ID},
+        "sqlite_autoindex_transactions_1"
+    ),
+    PlannedQuery(
+        "child history", statements.TRANSACTIONS_BY_CHILD, {"child_id": _ID, **_PAGE},
+        "ix_transactions_child_id_created_at"
+    ),
+    PlannedQuery(
+        "child history rows", statements.TRANSACTION_ROWS_BY_CHILD, {"child_id": _ID, **_PAGE},
+        "ix_transactions_child_id_created_at"
+    ),
+    PlannedQuery(
+        "child history fields", statements.transaction_rows_by_child(("amount", "created_at")), {"child_id": _ID, **_PAGE},
+        "ix_transactions_child_id_created_at"
+    ),
+    # Merging several children's histories needs a sort, over one family's rows
+    PlannedQuery(
+        "family history", statements.TRANSACTIONS_BY_FAMILY, {"family_id": _ID, **_PAGE},
+        "ix_transactions_child_id_created_at", temp_sort=True
+    ),
+    PlannedQuery(
+        "family history rows", statements.TRANSACTION_ROWS_BY_FAMILY, {"family_id": _ID, **_PAGE},
+        "ix_transactions_child_id_created_at", temp_sort=True
+    ),
+    PlannedQuery(
+        "recent rows of family", statements.RECENT_TRANSACTION_ROWS_BY_FAMILY, {"family_id": _ID, "per_child": 5},
+        "ix_transactions_child_id_created_at", temp_sort=True
+    ),
+    PlannedQuery(
+        "unread notifications of parent", statements.UNREAD_NOTIFICATIONS_BY_PARENT, {"parent_id": _ID},
+        "ix_notifications_parent_admin_id_unread", covering=True
+    ),
+    PlannedQuery(
+        "unread notifications of child", statements.UNREAD_NOTIFICATIONS_BY_CHILD, {"child_id": _ID},
+        "ix_notifications_child_id_unread", covering=True
+    ),
+    PlannedQuery(
+        "pending invitations of family", statements.PENDING_INVITATION_ROWS_BY_FAMILY, {"family_id": _ID},
+        "ix_invitations_family_id", temp_sort=True, residual=("status",)
+    ),
+    PlannedQuery("bump family version", statements.BUMP_FAMILY_VERSION, {"family_id": _ID}, "sqlite_autoindex_families_1"),
+    PlannedQuery("bump child version", statements.BUMP_CHILD_VERSION, {"child_id": _ID}, "sqlite_autoindex_children_1"),
+]
+
+
+def explain(connection: Connection, statement: Any, params: Dict[str, Any]) -> List[Tuple[int, str]]:
+    """
+    EXPLAIN QUERY PLAN for a statement as SQLAlchemy would run it.
+
+    The statement goes through normal compilation and bind processing; only
+    the SQL sent to SQLite is prefixed, so nothing is read or written.
+
+    Returns:
+        (depth, detail) per plan node, in order
+    """
+    rows: List[tuple] = []
+
+    def prefix(conn, cursor, sql, parameters, context, executemany):
+        return f"EXPLAIN QUERY PLAN {sql}", parameters
+
+    def collect(conn, cursor, sql, parameters, context, executemany):
+        rows.extend(cursor.fetchall())
+
+    event.listen(connection, "before_cursor_execute", prefix, retval=True)
+    event.listen(connection, "after_cursor_execute", collect)
+    try:
+        connection.execute(statement, params)
+    finally:
+        event.remove(connection, "before_cursor_execute", prefix)
+        event.remove(connection, "after_cursor_execute", collect)
+
+    return plan_tree(rows)
+
+
+def review_plans(connection: Connection, queries: Optional[List[PlannedQuery]] = None) -> List[PlanReport]:
+    """
+    Explain every query and check its plan.
+
+    Args:
+        connection: Connection to an analyzed database with realistic data
+        queries: Queries to review (default: QUERY_PLANS)
+
+    Returns:
+        One PlanReport per query, in order
+    """
+    indexes = _index_columns(connection)
+    reports = []
+    for query in QUERY_PLANS if queries is None else queries:
+        nodes = explain(connection, query.statement, query.params)
+        problems = _plan_problems(query, [detail for _, detail in nodes], indexes)
+        suggestion = suggest_index(query.statement) if problems else None
+        reports.append(PlanReport(query, [f"{'  ' * depth}{detail}" for depth, detail in nodes], problems, suggestion))
+    return reports
+
+
+def suggest_index(statement: Any) -> Optional[str]:
+    """
+    Propose an index serving a single-table statement's filters and sort.
+
+    Equality filters against parameters come first, then the ORDER BY columns;
+    filters against literals (e.g. is_read = 0) become the WHERE of a partial
+    index, and their columns are appended so the index can cover the
+    statement. Statements whose filters and sort span several tables get None.
+
+    Returns:
+        A CREATE INDEX statement, or None
+    """
+    if not isinstance(statement, Select):
+        return None
+    columns: List[str] = []
+    conditions: List[Tuple[str, int]] = []
+    tables: Set[str] = set()
+    for clause in _conjuncts(statement.whereclause):
+        if not (isinstance(clause, BinaryExpression) and clause.operator is operators.eq and isinstance(clause.left, Column)):
+            return None
+        tables.add(clause.left.table.name)
+        if isinstance(clause.right, BindParameter):
+            columns.append(clause.left.name)
+        elif isinstance(clause.right, (False_, True_)):
+            conditions.append((clause.left.name, 1 if isinstance(clause.right, True_) else 0))
+        else:
+            return None
+    for clause in statement._order_by_clauses:
+        element = clause.element if isinstance(clause, UnaryExpression) else clause
+        if not isinstance(element, Column) or not isinstance(element.table, Table):
+            return None
+        tables.add(element.table.name)
+        if element.name not in columns:
+            columns.append(element.name)
+    if len(tables) != 1 or not columns:
+        return None
+    columns += [column for column, _ in conditions if column not in columns]
+
+    table = tables.pop()
+    name = f"ix_{table}_{'_'.join(columns)}{'_partial' if conditions else ''}"
+    where = f" WHERE {' AND '.join(f'{column} = {value}' for column, value in conditions)}" if conditions else ""
+    return f"CREATE INDEX {name} ON {table} ({', '.join(columns)}){where}"
+
+
+def format_report(report: PlanReport) -> str:
+    """Render a report as the query name, its plan and any problems."""
+    status = "ok" if not report.problems else "FLAGGED"
+    lines = [f"{report.query.name}: {status}"]
+    lines += [f"    {line}" for line in report.plan]
+    lines += [f"  ! {problem}" for problem in report.problems]
+    if report.suggestion:
+        lines.append(f"  suggest: {report.suggestion}")
+    return "\n".join(lines)
+
+
+def review_database(
+    path: str,
+    schema: str = "migrations",
+    families: int = 200,
+    children: int = 3,
+    transactions: int = 300,
+    seed: int = 1
+) -> List[PlanReport]:
+    """
+    Build, seed and analyze a database at `path`, then review every query on it.
+
+    Args:
+        path: New SQLite file; removed again afterwards
+        schema: "migrations" (alembic upgrade head) or "models" (create_all)
+        families: Number of families, each with one owner parent
+        children: Children per family
+        transactions: Transactions per child
+        seed: Random seed for the generated rows
+
+    Returns:
+        One PlanReport per query in QUERY_PLANS
+    """
+    build_schema(path, schema)
+    seed_database(path, families, children, transactions, seed)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        with engine.connect() as conn:
+            return review_plans(conn)
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def build_schema(path: str, schema: str) -> None:
+    """
+    Create the schema at `path` with Alembic or from the models.
+
+    Raises:
+        ValueError: If schema is neither "migrations" nor "models"
+    """
+    url = f"sqlite:///{path}"
+    if schema == "models":
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+        engine.dispose()
+        return
+    if schema != "migrations":
+        raise ValueError(f"Invalid schema source: {schema}")
+
+    from alembic import command
+    from alembic.config import Config
+    from src.maintenance.migrations import ALEMBIC_DIR
+
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    config.set_main_option("sqlalchemy.url", url)
+    # alembic/env.py prefers DATABASE_URL over the configured URL
+    previous = os.environ.get("DATABASE_URL")
+    os.environ["DATABASE_URL"] = url
+    try:
+        command.upgrade(config, "head")
+    finally:
+        if previous is None:
+            del os.environ["DATABASE_URL"]
+        else:
+            os.environ["DATABASE_URL"] = previous
+
+
+def seed_database(path: str, families: int, children: int, transactions: int, seed: int = 1) -> None:
+    """
+    Fill an empty schema with families in the application's proportions, then ANALYZE.
+
+    Every family gets an owner, `children` children with `transactions`
+    transactions each, INVITATIONS_PER_FAMILY invitations (one pending) and
+    every user NOTIFICATIONS_PER_USER notifications (UNREAD_SHARE unread).
+    Balances are not kept consistent; plans do not depend on them.
+    """
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1)
+    created = "2026-01-01 00:00:00.000000"
+    family_rows, parent_rows, child_rows, transaction_rows = [], [], [], []
+    notification_rows, invitation_rows = [], []
+
+    def notifications(parent_id: Optional[bytes], child_id: Optional[bytes], kind: str) -> None:
+        for _ in range(NOTIFICATIONS_PER_USER):
+            notification_rows.append((
+                uuid7().bytes, parent_id, child_id, kind, "Title", "Message", rng.random() < UNREAD_SHARE, created
+            ))
+
+    for f in range(families):
+        family_id, parent_id = uuid7().bytes, uuid7().bytes
+        family_rows.append((family_id, f"{seed % 256:02X}{f:06X}", f"Family {f}", 0, created, created))
+        parent_rows.append((
+            parent_id, family_id, f"parent_{seed}_{f}", f"Parent {f}", "x", "OWNER", created, created
+        ))
+        notifications(parent_id, None, "REQUEST_SUBMITTED")
+        for i in range(INVITATIONS_PER_FAMILY):
+            pending = i == 0
+            invitation_rows.append((
+                uuid7().bytes, family_id, f"{f:08X}{i:04X}", parent_id,
+                "PENDING" if pending else "ACCEPTED", created, None if pending else created
+            ))
+        for c in range(children):
+            child_id = uuid7().bytes
+            child_rows.append((
+                child_id, family_id, f"child_{seed}_{f}_{c}", f"Child {f}.{c}", "x", None, 10, 0, 0, created, created
+            ))
+            notifications(None, child_id, "TRANSACTION_CREDIT")
+            moment = start
+            for _ in range(transactions):
+                moment += timedelta(seconds=rng.randint(600, 100_000))
+                credit = rng.random() < 0.6
+                transaction_rows.append((
+                    uuid7().bytes, child_id, parent_id, "CREDIT" if credit else "DEBIT", 1.0, 0.0, 1.0,
+                    None, "allowance" if credit else "toys", moment.isoformat(" ", "microseconds")
+                ))
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.executemany(
+            "INSERT INTO families (id, family_code, name, version, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            family_rows
+        )
+        conn.executemany(
+            "INSERT INTO parent_admins (id, family_id, username, name, password_hash, role, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", parent_rows
+        )
+        conn.executemany(
+            "INSERT INTO children (id, family_id, username, name, password_hash, avatar, age, balance, version, "
+            "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", child_rows
+        )
+        conn.executemany(
+            "INSERT INTO transactions (id, child_id, parent_admin_id, type, amount, balance_before, balance_after, "
+            "description, category, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", transaction_rows
+        )
+        conn.executemany(
+            "INSERT INTO notifications (id, parent_admin_id, child_id, type, title, message, is_read, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", notification_rows
+        )
+        conn.executemany(
+            "INSERT INTO invitations (id, family_id, invite_code, created_by_parent_id, status, created_at, "
+            "accepted_at) VALUES (?, ?, ?, ?, ?, ?, ?)", invitation_rows
+        )
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+
+def _plan_problems(query: PlannedQuery, details: List[str], indexes: Dict[str, Set[str]]) -> List[str]:
+    problems = []
+    filtered = _filter_columns(query.statement)
+    used = set()
+    for detail in details:
+        scan = _SCAN.match(detail)
+        if scan and scan.group(1) in _table_names():
+            problems.append(f"full scan: {detail}")
+        if detail.startswith(_TEMP_SORT) and not query.temp_sort:
+            problems.append(f"temp sort: {detail}")
+        search = _SEARCH.match(detail)
+        if search:
+            table, index = search.groups()
+            used.add(index)
+            if not index:
+                continue
+            missing = sorted(filtered.get(table, set()) - indexes.get(index, set()) - set(query.residual))
+            if missing:
+                problems.append(f"residual filter on {table}.{', '.join(missing)}: {detail}")
+            if query.covering and index == query.index and " USING COVERING INDEX " not in detail:
+                problems.append(f"index does not cover the query: {detail}")
+    if query.index and query.index not in used:
+        problems.append(f"does not use {query.index}")
+    return problems
+
+
+def _index_columns(connection: Connection) -> Dict[str, Set[str]]:
+    """Columns each index contains or, for partial indexes, implies in its WHERE."""
+    indexes: Dict[str, Set[str]] = {}
+    raw = connection.connection.driver_connection
+    for name, sql in raw.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index'").fetchall():
+        columns = {row[2] for row in raw.execute(f'PRAGMA index_info("{name}")') if row[2]}
+        if sql and " WHERE " in sql.upper():
+            where = sql[sql.upper().rindex(" WHERE ") + 7:]
+            columns |= set(re.findall(r"(\w+)\s*=", where))
+        indexes[name] = columns
+    return indexes
+
+
+def _filter_columns(statement: Any) -> Dict[str, Set[str]]:
+    """Table -> columns compared in the WHERE clauses of the statement and its subqueries."""
+    columns: Dict[str, Set[str]] = {}
+    for element in visitors.iterate(statement):
+        if element.__visit_name__ not in ("select", "update", "delete") or element.whereclause is None:
+            continue
+        whereclause = element.whereclause
+        for node in visitors.iterate(whereclause):
+            if isinstance(node, Column) and isinstance(node.table, Table):
+                columns.setdefault(node.table.name, set()).add(node.name)
+    return columns
+
+
+def _conjuncts(clause: Any) -> List[Any]:
+    if clause is None:
+        return []
+    if isinstance(clause, BooleanClauseList) and clause.operator is operators.and_:
+        return [part for child in clause.clauses for part in _conjuncts(child)]
+    return [clause]
+
+
+def _table_names() -> Set[str]:
+    return set(Base.metadata.tables)
@@ -0,0 +1,99 @@
+"""
+SQLite statistics for the metrics endpoint.
+
+File sizes come from the filesystem. Page-cache hits and misses come from
+sqlite3_db_status() on every open pooled connection. The Python sqlite3 module
+does not expose that call, so it is reached through ctypes using the
+connection's sqlite3* handle. If that is not possible on this interpreter, the
+cache metrics are simply omitted.
+"""
+import ctypes
+import os
+import platform
+import sqlite3
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from src.observability.metrics import gauge_lines
+
+SQLITE_DBSTATUS_CACHE_HIT = 7
+SQLITE_DBSTATUS_CACHE_MISS = 8
+
+# sqlite3 connections cannot be weakly referenced; the pool's close events prune this set
+_connections = set()
+
+
+def _load_db_status():
+    # pysqlite_Connection starts with PyObject_HEAD followed by the sqlite3* handle
+    if platform.python_implementation() != "CPython":
+        return None
+    try:
+        import _sqlite3
+        library = ctypes.CDLL(_sqlite3.__file__)
+        db_status = library.sqlite3_db_status
+    except (ImportError, OSError, AttributeError):
+        return None
+    db_status.argtypes = [
+        ctypes.c_void_p, ctypes.c_int,
+        ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.c_int
+    ]
+    db_status.restype = ctypes.c_int
+    return db_status
+
+
+_db_status = _load_db_status()
+
+
+def track_connections(engine: Engine) -> None:
+    """Remember the engine's DBAPI connections so their cache stats can be read."""
+    @event.listens_for(engine, "connect")
+    def remember_connection(dbapi_conn, connection_record):
+        _connections.add(dbapi_conn)
+
+    @event.listens_for(engine, "close")
+    def forget_connection(dbapi_conn, connection_record):
+        _connections.discard(dbapi_conn)
+
+    @event.listens_for(engine, "close_detached")
+    def forget_detached_connection(dbapi_conn):
+        _connections.discard(dbapi_conn)
+
+
+def _cache_counts(conn: sqlite3.Connection) -> Optional[Tuple[int, int]]:
+    handle = ctypes.c_void_p.from_address(id(conn) + object.__basicsize__).value
+    if not handle:
+        return None
+    current, highwater = ctypes.c_int(), ctypes.c_int()
+    counts = []
+    for op in (SQLITE_DBSTATUS_CACHE_HIT, SQLITE_DBSTATUS_CACHE_MISS):
+        if _db_status(handle, op, ctypes.byref(current), ctypes.byref(highwater), 0) != 0:
+            return None
+        counts.append(current.value)
+    return counts[0], counts[1]
+
+
+def sqlite_collector(database_path: Optional[str]) -> List[str]:
+    """Render SQLite file sizes and page-cache statistics."""
+    lines: List[str] = []
+    if database_path:
+        for suffix, name, documentation in (
+            ("", "sqlite_database_size_bytes", "Size of the main database file."),
+            ("-wal", "sqlite_wal_size_bytes", "Size of the write-ahead log."),
+        ):
+            try:
+                lines.extend(gauge_lines(name, documentation, os.stat(f"{database_path}{suffix}").st_size))
+            except FileNotFoundError:
+                lines.extend(gauge_lines(name, documentation, 0))
+
+    if _db_status is not None:
+        hits = misses = 0
+        for conn in list(_connections):
+            counts = _cache_counts(conn)
+            if counts is not None:
+                hits += counts[0]
+                misses += counts[1]
+        lines.extend(gauge_lines("sqlite_page_cache_hits", "Page-cache hits on open connections.", hits))
+        lines.extend(gauge_lines("sqlite_page_cache_misses", "Page-cache misses on open connections.", misses))
+        ratio = hits / (hits + misses) if hits + misses else 1.0
+        lines.extend(gauge_lines("sqlite_page_cache_hit_ratio", "Page-cache hit ratio on open connections.", ratio))
+    return lines
@@ -0,0 +1,111 @@
+"""
+Per-request phase timings for the Server-Timing header.
+
+ServerTimingMiddleware puts a RequestTimings in the request_timings context
+variable; code on the request's path adds to it with phase() or record_phase().
+Worker threads started with asyncio.to_thread or Starlette's threadpool get a
+copy of the context, so they add to the same RequestTimings. Outside a request
+(or with SERVER_TIMING_ENABLED=false) the variable is None and recording is a
+single lookup.
+
+Usage:
+    with phase("auth"):
+        row = db.execute(PARENT_SCOPE, {"parent_id": parent_id}).first()
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import event
+
+# Header descriptions, in the order phases are listed
+PHASES: Dict[str, str] = {
+    "jwt": "JWT decode",
+    "auth": "Auth lookup",
+    "bcrypt": "Password check",
+    "lock": "Write lock wait",
+    "db": "SQL statements",
+    "commit": "Commit",
+    "orm": "ORM objects loaded",
+    "serialize": "JSON encode",
+}
+
+
+class RequestTimings:
+    """Seconds spent and number of occurrences per phase, for one request."""
+
+    __slots__ = ("seconds", "counts")
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Count occurrences without a duration (e.g. ORM objects loaded)."""
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def header(self, total: float) -> str:
+        """
+        Render the Server-Timing header value.
+
+        Args:
+            total: Wall time of the whole request in seconds
+
+        Returns:
+            e.g. 'jwt;dur=0.04;desc="JWT decode", db;dur=1.2;desc="SQL statements (3)", total;dur=4.8'
+        """
+        entries: List[str] = []
+        names = [name for name in PHASES if name in self.counts]
+        names += [name for name in self.counts if name not in PHASES]
+        for name in names:
+            description = PHASES.get(name, name)
+            count = self.counts[name]
+            if name in self.seconds:
+                suffix = f" ({count})" if count > 1 else ""
+                entries.append(f'{name};dur={self.seconds[name] * 1000:.3f};desc="{description}{suffix}"')
+            else:
+                entries.append(f'{name};desc="{description}: {count}"')
+        entries.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(entries)
+
+
+# Phase timings of the current request
+request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def record_phase(name: str, seconds: float) -> None:
+    """Add an already-measured duration to the current request's phase."""
+    timings = request_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Add the wall time of the block, including when it raises, to the current request's phase."""
+    timings = request_timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+def count_orm_loads(session_class: Any) -> None:
+    """
+    Count ORM instances loaded by sessions of this class into the request's "orm" phase.
+
+    Registered only when Server-Timing is on: the hook runs once per loaded object.
+    """
+    @event.listens_for(session_class, "loaded_as_persistent")
+    def _loaded(session, instance):
+        timings = request_timings.get()
+        if timings is not None:
+            timings.count("orm")
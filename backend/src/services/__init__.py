@@ -1,11 +1,37 @@
 from .family_service import FamilyService
 from .auth_service import AuthService
 from .child_service import ChildService
-from .transaction_service import TransactionService
+from .child_cache import ChildCache, child_cache, child_cache_collector
+from .transaction_service import TransactionService, ChildNotFoundError, ChildAccessDeniedError
+from .dashboard_service import DashboardService
+from .write_retry import (
+    WriteContentionError,
+    WritesClosedError,
+    is_busy_error,
+    run_with_retry,
+    run_write,
+    close_writes,
+    open_writes,
+    running_writes,
+)
 
 __all__ = [
     "FamilyService",
     "AuthService",
     "ChildService",
+    "ChildCache",
+    "child_cache",
+    "child_cache_collector",
     "TransactionService",
+    "ChildNotFoundError",
+    "ChildAccessDeniedError",
+    "DashboardService",
+    "WriteContentionError",
+    "WritesClosedError",
+    "is_busy_error",
+    "run_with_retry",
+    "run_write",
+    "close_writes",
+    "open_writes",
+    "running_writes",
 ]
@@ -0,0 +1,122 @@
+"""
+Write-through LRU cache of child snapshots.
+
+Ownership checks, the child's own scope and balance reads all need the same
+few columns of one child row on almost every request. ChildService serves
+them from here: a miss reads CHILD_SNAPSHOT_BY_ID and fills the cache, and
+the services that change a child refresh or drop its entry after they commit.
+
+Two rules keep a slow reader from putting an old row back:
+- every committed write (update or delete) bumps a generation counter, and a
+  fill is dropped if the generation moved while its row was being read, even
+  if the newer entry has since been evicted;
+- every child write bumps children.version, so an entry is only replaced by
+  a snapshot with a version at least as new.
+
+Only writes made through this process are seen, so the cache assumes one
+application process writes the database (as deployed). CHILD_CACHE_SIZE=0
+turns it off.
+
+Usage:
+    snapshot = child_cache.get(child_id)
+    if snapshot is None:
+        generation = child_cache.generation
+        snapshot = read_from_database()
+        child_cache.fill(snapshot, generation)
+"""
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+from src.config.settings import settings
+from src.models.child import Child
+from src.models.records import ChildSnapshot
+from src.observability import CHILD_CACHE_LOOKUPS, gauge_lines
+
+
+class ChildCache:
+    """Bounded, thread-safe LRU of ChildSnapshot by child id."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.generation = 0
+        self._entries: "OrderedDict[str, ChildSnapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, child_id: str) -> Optional[ChildSnapshot]:
+        """Cached snapshot of a child, or None on a miss."""
+        with self._lock:
+            snapshot = self._entries.get(child_id)
+            if snapshot is not None:
+                self._entries.move_to_end(child_id)
+        CHILD_CACHE_LOOKUPS.inc(("hit",) if snapshot is not None else ("miss",))
+        return snapshot
+
+    def fill(self, snapshot: ChildSnapshot, generation: int) -> None:
+        """
+        Cache a snapshot read from the database.
+
+        Args:
+            snapshot: Row read after `generation` was taken
+            generation: Value of `generation` before the read started
+        """
+        with self._lock:
+            if generation == self.generation:
+                self._store(snapshot)
+
+    def update(self, snapshot: ChildSnapshot) -> None:
+        """Write through a committed change; reads already under way are not cached."""
+        with self._lock:
+            self.generation += 1
+            self._store(snapshot)
+
+    def invalidate(self, child_id: str) -> None:
+        """Drop a child after its deletion commits; reads already under way are not cached."""
+        with self._lock:
+            self.generation += 1
+            self._entries.pop(child_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, snapshot: ChildSnapshot) -> None:
+        if not self.enabled:
+            return
+        current = self._entries.get(snapshot.id)
+        if current is not None and current.version > snapshot.version:
+            return
+        self._entries[snapshot.id] = snapshot
+        self._entries.move_to_end(snapshot.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+child_cache = ChildCache(settings.child_cache_size)
+
+
+def snapshot_of(child: Child) -> ChildSnapshot:
+    """Snapshot of a loaded Child entity."""
+    return ChildSnapshot(
+        child.id, child.family_id, child.username, child.name, child.avatar, child.age,
+        child.balance, child.created_at, child.version
+    )
+
+
+def child_cache_collector() -> List[str]:
+    """Render the cache's size and hit ratio."""
+    counts = {labels[0]: cell[0] for labels, cell in CHILD_CACHE_LOOKUPS.collect().items()}
+    hits, misses = counts.get("hit", 0), counts.get("miss", 0)
+    lines = gauge_lines("child_cache_entries", "Child snapshots held in memory.", len(child_cache))
+    lines.extend(gauge_lines(
+        "child_cache_hit_ratio", "Share of child lookups served from memory.",
+        hits / (hits + misses) if hits + misses else 0.0
+    ))
+    return lines
@@ -1,9 +1,23 @@
-import uuid
-from typing import List, Optional
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple, Union
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from src.models.child import Child
+from src.models.records import ChildRecord, ChildSnapshot
+from src.models.ids import new_id
+from src.models.statements import (
+    CHILD_BY_ID,
+    CHILD_SNAPSHOT_BY_ID,
+    CHILD_BY_USERNAME,
+    CHILDREN_BY_FAMILY,
+    CHILD_USERNAMES_IN,
+    CHILD_ROWS_BY_FAMILY,
+    BUMP_CHILD_VERSION,
+    BUMP_FAMILY_VERSION,
+)
 from src.auth import auth_provider
+from src.services.child_cache import child_cache, snapshot_of
 
 
 class ChildService:
@@ -38,7 +52,7 @@ class ChildService:
             ValueError: If username already exists
         """
         # Check if username is already taken
-        existing_child = db.query(Child).filter(Child.username == username).first()
+        existing_child = db.scalars(CHILD_BY_USERNAME, {"username": username}).first()
         if existing_child:
             raise ValueError(f"Username '{username}' is already taken")
 
@@ -47,7 +61,7 @@ class ChildService:
 
         # Create child
         child = Child(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             family_id=family_id,
             username=username,
             name=name,
@@ -59,6 +73,7 @@ class ChildService:
 
         try:
             db.add(child)
+            db.execute(BUMP_FAMILY_VERSION, {"family_id": family_id})
             db.commit()
             db.refresh(child)
             return child
@@ -66,20 +81,165 @@ class ChildService:
             db.rollback()
             raise ValueError(f"Database error: {str(e)}")
 
+    @staticmethod
+    def screen_import(
+        db: Session,
+        entries: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Reject import rows whose username repeats in the import or is already taken.
+
+        Existing usernames are checked with a single IN query. The read
+        transaction is ended before returning, so no snapshot is held while
+        the caller hashes PINs.
+
+        Args:
+            db: Database session
+            entries: Validated rows, each with "row", "username", "name",
+                "password" and optional "avatar" and "age"
+
+        Returns:
+            Tuple of (accepted entries, errors as {"row", "username", "error"} dicts)
+        """
+        errors: List[Dict[str, Any]] = []
+        accepted: List[Dict[str, Any]] = []
+        seen = set()
+        for entry in entries:
+            if entry["username"] in seen:
+                errors.append(_import_error(entry, f"Duplicate username '{entry['username']}' in import"))
+            else:
+                seen.add(entry["username"])
+                accepted.append(entry)
+
+        try:
+            taken = set(db.scalars(CHILD_USERNAMES_IN, {"usernames": list(seen)})) if seen else set()
+        finally:
+            db.rollback()
+        if taken:
+            errors.extend(
+                _import_error(entry, f"Username '{entry['username']}' is already taken")
+                for entry in accepted if entry["username"] in taken
+            )
+            accepted = [entry for entry in accepted if entry["username"] not in taken]
+
+        errors.sort(key=lambda error: error["row"])
+        return accepted, errors
+
+    @staticmethod
+    def import_children(
+        db: Session,
+        family_id: str,
+        entries: List[Dict[str, Any]],
+        password_hashes: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Create many screened child accounts in one transaction.
+
+        PINs are hashed by the caller beforehand (auth_provider.hash_passwords),
+        so a retried attempt only repeats the insert and commit.
+
+        Args:
+            db: Database session
+            family_id: ID of the family
+            entries: Rows accepted by screen_import
+            password_hashes: Hashed PINs, in the same order as `entries`
+
+        Returns:
+            Created children as ChildResponse dicts
+
+        Raises:
+            ValueError: If a username was taken concurrently while inserting
+        """
+        now = datetime.utcnow()
+        children = [
+            Child(
+                id=new_id(),
+                family_id=family_id,
+                username=entry["username"],
+                name=entry["name"],
+                password_hash=password_hash,
+                avatar=entry.get("avatar"),
+                age=entry.get("age"),
+                balance=Decimal("0.00"),
+                created_at=now
+            )
+            for entry, password_hash in zip(entries, password_hashes)
+        ]
+        created = [
+            {
+                "id": child.id,
+                "username": child.username,
+                "name": child.name,
+                "avatar": child.avatar,
+                "age": child.age,
+                "balance": child.balance,
+                "created_at": child.created_at,
+            }
+            for child in children
+        ]
+
+        try:
+            db.add_all(children)
+            db.execute(BUMP_FAMILY_VERSION, {"family_id": family_id})
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            raise ValueError(f"Database error: {str(e)}")
+
+        return created
+
     @staticmethod
     def get_child_by_id(db: Session, child_id: str) -> Optional[Child]:
         """Get a child by ID."""
-        return db.query(Child).filter(Child.id == child_id).first()
+        return db.scalars(CHILD_BY_ID, {"child_id": child_id}).first()
+
+    @staticmethod
+    def get_child_snapshot(db: Session, child_id: str) -> Optional[ChildSnapshot]:
+        """
+        Get a child's identity, profile, balance and version, from memory when cached.
+
+        Enough for ownership checks, ETags and ChildResponse without loading
+        the entity. Misses read one row and fill the child cache.
+
+        Args:
+            db: Session on the primary database (not the replica)
+            child_id: ID of the child
+
+        Returns:
+            ChildSnapshot, or None if the child does not exist
+        """
+        snapshot = child_cache.get(child_id)
+        if snapshot is not None:
+            return snapshot
+        generation = child_cache.generation
+        row = db.execute(CHILD_SNAPSHOT_BY_ID, {"child_id": child_id}).first()
+        if row is None:
+            return None
+        snapshot = ChildSnapshot(*row)
+        child_cache.fill(snapshot, generation)
+        return snapshot
 
     @staticmethod
     def get_child_by_username(db: Session, username: str) -> Optional[Child]:
         """Get a child by username."""
-        return db.query(Child).filter(Child.username == username).first()
+        return db.scalars(CHILD_BY_USERNAME, {"username": username}).first()
 
     @staticmethod
     def get_children_by_family(db: Session, family_id: str) -> List[Child]:
         """Get all children in a family."""
-        return db.query(Child).filter(Child.family_id == family_id).all()
+        return list(db.scalars(CHILDREN_BY_FAMILY, {"family_id": family_id}))
+
+    @staticmethod
+    def get_child_rows_by_family(
+        db: Session,
+        family_id: str,
+        records: bool = False
+    ) -> List[Union[Dict[str, Any], ChildRecord]]:
+        """Get all children in a family as plain dicts (or ChildRecords) of the ChildResponse fields."""
+        result = db.execute(CHILD_ROWS_BY_FAMILY, {"family_id": family_id})
+        if records:
+            return [ChildRecord(*row) for row in result]
+        return [row._asdict() for row in result]
 
     @staticmethod
     def update_child(
@@ -102,7 +262,7 @@ class ChildService:
         Returns:
             Updated Child instance or None if not found
         """
-        child = db.query(Child).filter(Child.id == child_id).first()
+        child = db.scalars(CHILD_BY_ID, {"child_id": child_id}).first()
         if not child:
             return None
 
@@ -114,8 +274,11 @@ class ChildService:
             child.age = age
 
         try:
+            db.execute(BUMP_CHILD_VERSION, {"child_id": child_id})
+            db.execute(BUMP_FAMILY_VERSION, {"family_id": child.family_id})
             db.commit()
             db.refresh(child)
+            child_cache.update(snapshot_of(child))
             return child
         except IntegrityError as e:
             db.rollback()
@@ -133,10 +296,17 @@ class ChildService:
         Returns:
             True if deleted, False if not found
         """
-        child = db.query(Child).filter(Child.id == child_id).first()
+        child = db.scalars(CHILD_BY_ID, {"child_id": child_id}).first()
         if not child:
             return False
 
+        deleted_id = child.id
         db.delete(child)
+        db.execute(BUMP_FAMILY_VERSION, {"family_id": child.family_id})
         db.commit()
+        child_cache.invalidate(deleted_id)
         return True
+
+
+def _import_error(entry: Dict[str, Any], message: str) -> Dict[str, Any]:
+    return {"row": entry["row"], "username": entry["username"], "error": message}
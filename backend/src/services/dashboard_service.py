@@ -0,0 +1,103 @@
+from decimal import Decimal
+from typing import Any, Dict
+from sqlalchemy.orm import Session
+from src.models.records import ChildSnapshot
+from src.models.statements import (
+    CHILD_ROWS_BY_FAMILY,
+    TRANSACTION_ROWS_BY_CHILD,
+    RECENT_TRANSACTION_ROWS_BY_FAMILY,
+    UNREAD_NOTIFICATIONS_BY_PARENT,
+    UNREAD_NOTIFICATIONS_BY_CHILD,
+    PENDING_INVITATION_ROWS_BY_FAMILY,
+)
+
+
+class DashboardService:
+    """Service for aggregated dashboard reads."""
+
+    @staticmethod
+    def get_parent_dashboard(
+        db: Session,
+        parent_id: str,
+        family_id: str,
+        recent: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Get everything the parent dashboard shows in one pass.
+
+        Runs four queries regardless of family size: children, the last `recent`
+        transactions of every child (one window-function query), the parent's
+        unread notification count and the family's pending invitations.
+
+        Args:
+            db: Database session
+            parent_id: ID of the parent
+            family_id: ID of the parent's family
+            recent: Number of recent transactions per child
+
+        Returns:
+            Dashboard payload matching ParentDashboardResponse
+        """
+        children = [row._asdict() for row in db.execute(CHILD_ROWS_BY_FAMILY, {"family_id": family_id})]
+        by_child = {}
+        for child in children:
+            child["recent_transactions"] = []
+            by_child[child["id"]] = child["recent_transactions"]
+
+        if recent > 0 and children:
+            rows = db.execute(RECENT_TRANSACTION_ROWS_BY_FAMILY, {"family_id": family_id, "per_child": recent})
+            for row in rows:
+                by_child[row.child_id].append(row._asdict())
+
+        unread = db.scalar(UNREAD_NOTIFICATIONS_BY_PARENT, {"parent_id": parent_id})
+        invitations = db.execute(PENDING_INVITATION_ROWS_BY_FAMILY, {"family_id": family_id})
+
+        return {
+            "children": children,
+            "total_balance": sum((child["balance"] for child in children), Decimal("0.00")),
+            "unread_notifications": unread or 0,
+            "pending_invitations": [row._asdict() for row in invitations],
+        }
+
+    @staticmethod
+    def get_child_dashboard(
+        db: Session,
+        child: ChildSnapshot,
+        recent: int = 5
+    ) -> Dict[str, Any]:
+        """
+        Get everything the child dashboard shows in one pass.
+
+        The profile and balance come from the snapshot the request was
+        authenticated with, so only transactions and notifications are read.
+
+        Args:
+            db: Database session
+            child: Snapshot of the child, usually from the child cache
+            recent: Number of recent transactions
+
+        Returns:
+            Dashboard payload matching ChildDashboardResponse
+        """
+        child_id = child.id
+        transactions = []
+        if recent > 0:
+            transactions = db.execute(
+                TRANSACTION_ROWS_BY_CHILD,
+                {"child_id": child_id, "limit": recent, "offset": 0}
+            )
+        unread = db.scalar(UNREAD_NOTIFICATIONS_BY_CHILD, {"child_id": child_id})
+
+        return {
+            "child": {
+                "id": child.id,
+                "username": child.username,
+                "name": child.name,
+                "avatar": child.avatar,
+                "age": child.age,
+                "balance": child.balance,
+                "created_at": child.created_at,
+            },
+            "recent_transactions": [row._asdict() for row in transactions],
+            "unread_notifications": unread or 0,
+        }
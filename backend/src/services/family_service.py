@@ -1,4 +1,3 @@
-import uuid
 import random
 import string
 from typing import Optional
@@ -6,6 +5,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from src.models.family import Family
 from src.models.parent_admin import ParentAdmin, ParentRole
+from src.models.ids import new_id
+from src.models.statements import FAMILY_BY_ID, FAMILY_BY_CODE, PARENT_BY_USERNAME
 from src.auth import auth_provider
 
 
@@ -47,7 +48,7 @@ class FamilyService:
 
         for _ in range(max_retries):
             code = FamilyService.generate_family_code()
-            existing = db.query(Family).filter(Family.family_code == code).first()
+            existing = db.scalars(FAMILY_BY_CODE, {"family_code": code}).first()
             if not existing:
                 family_code = code
                 break
@@ -56,13 +57,13 @@ class FamilyService:
             raise ValueError("Could not generate unique family code")
 
         # Check if username is already taken
-        existing_parent = db.query(ParentAdmin).filter(ParentAdmin.username == parent_username).first()
+        existing_parent = db.scalars(PARENT_BY_USERNAME, {"username": parent_username}).first()
         if existing_parent:
             raise ValueError(f"Username '{parent_username}' is already taken")
 
         # Create family
         family = Family(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             family_code=family_code,
             name=family_name
         )
@@ -70,7 +71,7 @@ class FamilyService:
         # Create owner parent admin
         hashed_password = auth_provider.hash_password(parent_password)
         parent = ParentAdmin(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             family_id=family.id,
             username=parent_username,
             name=parent_name,
@@ -92,9 +93,9 @@ class FamilyService:
     @staticmethod
     def get_family_by_code(db: Session, family_code: str) -> Optional[Family]:
         """Get a family by its code."""
-        return db.query(Family).filter(Family.family_code == family_code).first()
+        return db.scalars(FAMILY_BY_CODE, {"family_code": family_code}).first()
 
     @staticmethod
     def get_family_by_id(db: Session, family_id: str) -> Optional[Family]:
         """Get a family by its ID."""
-        return db.query(Family).filter(Family.id == family_id).first()
+        return db.scalars(FAMILY_BY_ID, {"family_id": family_id}).first()
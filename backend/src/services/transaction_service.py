@@ -1,11 +1,40 @@
-import uuid
+from dataclasses import replace
 from decimal import Decimal
-from typing import List, Optional
-from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from src.models.transaction import Transaction, TransactionType
 from src.models.child import Child
+from src.models.transaction import Transaction, TransactionType
+from src.models.records import TransactionRecord
+from src.models.ids import new_id
+from src.observability import timed, DB_LOCK_WAIT_SECONDS, DB_COMMIT_SECONDS
+from src.services.child_cache import child_cache, snapshot_of
+from src.services.child_service import ChildService
+from src.models.statements import (
+    CHILD_BY_ID_FOR_UPDATE,
+    TRANSACTION_BY_ID,
+    TRANSACTION_ROW_WITH_FAMILY,
+    TRANSACTIONS_BY_CHILD,
+    TRANSACTIONS_BY_FAMILY,
+    TRANSACTION_ROWS_BY_CHILD,
+    TRANSACTION_ROWS_BY_FAMILY,
+    TRANSACTION_FIELDS,
+    transaction_rows_by_child,
+    transaction_rows_by_family,
+    BUMP_FAMILY_VERSION,
+)
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MS = timedelta(milliseconds=1)
+
+
+class ChildNotFoundError(ValueError):
+    """The transaction's child does not exist."""
+
+
+class ChildAccessDeniedError(ValueError):
+    """The transaction's child belongs to another family."""
 
 
 class TransactionService:
@@ -19,13 +48,15 @@ class TransactionService:
         transaction_type: TransactionType,
         amount: Decimal,
         description: Optional[str] = None,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        family_id: Optional[str] = None
     ) -> Transaction:
         """
         Create a new transaction with pessimistic locking.
 
         Uses BEGIN IMMEDIATE to acquire an exclusive lock on the database,
-        preventing concurrent writes and ensuring balance consistency.
+        preventing concurrent writes and ensuring balance consistency. The
+        child is read once, under the lock, which also serves the family check.
 
         Args:
             db: Database session
@@ -35,11 +66,14 @@ class TransactionService:
             amount: Transaction amount (must be positive)
             description: Optional description
             category: Optional category
+            family_id: If given, the child must belong to this family
 
         Returns:
             Created Transaction instance
 
         Raises:
+            ChildNotFoundError: If the child does not exist
+            ChildAccessDeniedError: If the child is not in `family_id`
             ValueError: If amount is invalid or insufficient funds for debit
         """
         if amount <= 0:
@@ -47,15 +81,20 @@ class TransactionService:
 
         # BEGIN IMMEDIATE transaction for pessimistic locking
         # This acquires a RESERVED lock immediately, preventing other writes
-        db.execute(text("BEGIN IMMEDIATE"))
+        with timed(DB_LOCK_WAIT_SECONDS, phase="lock"):
+            db.execute(text("BEGIN IMMEDIATE"))
 
         try:
             # Fetch and lock the child record
-            child = db.query(Child).filter(Child.id == child_id).with_for_update().first()
+            child = db.scalars(CHILD_BY_ID_FOR_UPDATE, {"child_id": child_id}).first()
 
             if not child:
                 db.rollback()
-                raise ValueError(f"Child with ID {child_id} not found")
+                raise ChildNotFoundError(f"Child with ID {child_id} not found")
+
+            if family_id is not None and child.family_id != family_id:
+                db.rollback()
+                raise ChildAccessDeniedError("Access denied")
 
             balance_before = child.balance
 
@@ -74,12 +113,16 @@ class TransactionService:
                 db.rollback()
                 raise ValueError(f"Invalid transaction type: {transaction_type}")
 
-            # Update child balance
+            # The committed row, for the child cache; the version is bumped in SQL below
+            snapshot = replace(snapshot_of(child), balance=balance_after, version=child.version + 1)
+
+            # Update child balance and bump its version in the same UPDATE
             child.balance = balance_after
+            child.version = Child.version + 1
 
             # Create transaction record
             transaction = Transaction(
-                id=str(uuid.uuid4()),
+                id=new_id(),
                 child_id=child_id,
                 parent_admin_id=parent_admin_id,
                 type=transaction_type,
@@ -92,7 +135,10 @@ class TransactionService:
             )
 
             db.add(transaction)
-            db.commit()
+            db.execute(BUMP_FAMILY_VERSION, {"family_id": child.family_id})
+            with timed(DB_COMMIT_SECONDS, phase="commit"):
+                db.commit()
+            child_cache.update(snapshot)
             db.refresh(transaction)
 
             return transaction
@@ -104,7 +150,21 @@ class TransactionService:
     @staticmethod
     def get_transaction_by_id(db: Session, transaction_id: str) -> Optional[Transaction]:
         """Get a transaction by ID."""
-        return db.query(Transaction).filter(Transaction.id == transaction_id).first()
+        return db.scalars(TRANSACTION_BY_ID, {"transaction_id": transaction_id}).first()
+
+    @staticmethod
+    def get_transaction_row(db: Session, transaction_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a transaction as a plain dict, with its child's family_id.
+
+        One joined query, so callers can check family access without
+        loading the child separately.
+
+        Returns:
+            TransactionResponse fields plus family_id, or None if not found
+        """
+        row = db.execute(TRANSACTION_ROW_WITH_FAMILY, {"transaction_id": transaction_id}).first()
+        return row._asdict() if row else None
 
     @staticmethod
     def get_transactions_by_child(
@@ -125,14 +185,8 @@ class TransactionService:
         Returns:
             List of Transaction instances
         """
-        return (
-            db.query(Transaction)
-            .filter(Transaction.child_id == child_id)
-            .order_by(Transaction.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-            .all()
-        )
+        params = {"child_id": child_id, "limit": limit, "offset": offset}
+        return list(db.scalars(TRANSACTIONS_BY_CHILD, params))
 
     @staticmethod
     def get_transactions_by_family(
@@ -153,18 +207,109 @@ class TransactionService:
         Returns:
             List of Transaction instances
         """
-        return (
-            db.query(Transaction)
-            .join(Child, Transaction.child_id == Child.id)
-            .filter(Child.family_id == family_id)
-            .order_by(Transaction.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-            .all()
-        )
+        params = {"family_id": family_id, "limit": limit, "offset": offset}
+        return list(db.scalars(TRANSACTIONS_BY_FAMILY, params))
+
+    @staticmethod
+    def get_transaction_rows_by_child(
+        db: Session,
+        child_id: str,
+        limit: int = 50,
+        offset: int = 0,
+        fields: Optional[Sequence[str]] = None,
+        records: bool = False
+    ) -> List[Union[Dict[str, Any], TransactionRecord]]:
+        """
+        Get a child's transactions as plain dicts, most recent first.
+
+        Selects only the TransactionResponse columns and skips ORM hydration;
+        used by list endpoints that serialize rows straight to JSON.
+
+        Args:
+            db: Database session
+            child_id: ID of the child
+            limit: Maximum number of transactions to return
+            offset: Number of transactions to skip
+            fields: Optional subset of TRANSACTION_FIELDS to select
+            records: Return TransactionRecord objects instead of dicts (ignored with `fields`)
+
+        Raises:
+            ValueError: If `fields` names an unknown field
+        """
+        params = {"child_id": child_id, "limit": limit, "offset": offset}
+        if fields:
+            stmt = transaction_rows_by_child(TransactionService.normalize_fields(fields))
+            return [row._asdict() for row in db.execute(stmt, params)]
+        if records:
+            return [TransactionRecord(*row) for row in db.execute(TRANSACTION_ROWS_BY_CHILD, params)]
+        return [row._asdict() for row in db.execute(TRANSACTION_ROWS_BY_CHILD, params)]
+
+    @staticmethod
+    def get_transaction_rows_by_family(
+        db: Session,
+        family_id: str,
+        limit: int = 50,
+        offset: int = 0,
+        fields: Optional[Sequence[str]] = None,
+        records: bool = False
+    ) -> List[Union[Dict[str, Any], TransactionRecord]]:
+        """Get a family's transactions as plain dicts (or records), most recent first."""
+        params = {"family_id": family_id, "limit": limit, "offset": offset}
+        if fields:
+            stmt = transaction_rows_by_family(TransactionService.normalize_fields(fields))
+            return [row._asdict() for row in db.execute(stmt, params)]
+        if records:
+            return [TransactionRecord(*row) for row in db.execute(TRANSACTION_ROWS_BY_FAMILY, params)]
+        return [row._asdict() for row in db.execute(TRANSACTION_ROWS_BY_FAMILY, params)]
+
+    @staticmethod
+    def get_transaction_columns_by_child(
+        db: Session,
+        child_id: str,
+        limit: int = 50,
+        offset: int = 0,
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get a child's transactions as parallel arrays, most recent first.
+
+        Each selected field maps to one array. `created_at` is delta-encoded:
+        `created_at_base` holds the first timestamp in epoch milliseconds and
+        `created_at[i]` is the millisecond difference from row i-1 (0 for the
+        first row), so charts can rebuild timestamps with a running sum.
+
+        Raises:
+            ValueError: If `fields` names an unknown field
+        """
+        selected = TransactionService.normalize_fields(fields) if fields else TRANSACTION_FIELDS
+        params = {"child_id": child_id, "limit": limit, "offset": offset}
+        rows = db.execute(transaction_rows_by_child(selected), params).all()
+
+        columns: Dict[str, Any] = {"count": len(rows)}
+        for name, values in zip(selected, zip(*rows) if rows else [()] * len(selected)):
+            if name == "created_at":
+                stamps = [(value - EPOCH) // ONE_MS for value in values]
+                columns["created_at_base"] = stamps[0] if stamps else None
+                columns[name] = [b - a for a, b in zip(stamps[:1] + stamps, stamps)]
+            else:
+                columns[name] = list(values)
+        return columns
+
+    @staticmethod
+    def normalize_fields(fields: Sequence[str]) -> Tuple[str, ...]:
+        """
+        Validate a field selection and put it in column order.
+
+        Raises:
+            ValueError: If a field is not a transaction field
+        """
+        unknown = set(fields) - set(TRANSACTION_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return tuple(field for field in TRANSACTION_FIELDS if field in fields)
 
     @staticmethod
     def get_child_balance(db: Session, child_id: str) -> Optional[Decimal]:
-        """Get the current balance for a child."""
-        child = db.query(Child).filter(Child.id == child_id).first()
+        """Get the current balance for a child, from the child cache when possible."""
+        child = ChildService.get_child_snapshot(db, child_id)
         return child.balance if child else None
@@ -0,0 +1,210 @@
+"""
+Retry writes that hit SQLITE_BUSY, with jittered exponential backoff and a deadline.
+
+Connections use a short busy_timeout (SQLITE_BUSY_TIMEOUT_MS), so a contended
+write fails fast instead of blocking for seconds. The whole service call is
+then rolled back and retried after a randomized, growing delay until
+WRITE_RETRY_DEADLINE_SECONDS, after which WriteContentionError is raised and
+the API answers 503 with Retry-After.
+
+During shutdown close_writes() makes new writes fail at once with
+WritesClosedError (also a 503), while writes already started run to
+completion; running_writes() tells the shutdown sequence when they are done.
+
+Usage:
+    transaction = await run_write(db, TransactionService.create_transaction, db=db, ...)
+"""
+import asyncio
+import logging
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, TypeVar
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from src.config.settings import settings
+from src.observability import DB_WRITE_CONTENTION_SECONDS, DB_WRITE_RETRIES, DB_WRITE_TIMEOUTS, DB_WRITES_QUEUED
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SQLITE_BUSY = 5
+SQLITE_LOCKED = 6
+
+_writes_open = True
+# Write attempts executing right now, counted in the worker thread itself: a cancelled
+# request stops awaiting its attempt, but the thread still runs until the commit
+_running = 0
+_running_lock = threading.Lock()
+
+
+class WriteContentionError(Exception):
+    """A write could not get the database lock before its deadline."""
+
+    def __init__(self, waited: float, attempts: int, retry_after: int):
+        super().__init__(f"Database busy: gave up after {attempts} attempts in {waited:.2f}s")
+        self.waited = waited
+        self.attempts = attempts
+        self.retry_after = retry_after
+
+
+class WritesClosedError(WriteContentionError):
+    """Writes are no longer accepted because the server is shutting down."""
+
+    def __init__(self, retry_after: int):
+        Exception.__init__(self, "Server is shutting down")
+        self.waited = 0.0
+        self.attempts = 0
+        self.retry_after = retry_after
+
+
+def close_writes() -> None:
+    """Refuse new writes from now on; writes already started still finish."""
+    global _writes_open
+    _writes_open = False
+
+
+def open_writes() -> None:
+    """Accept writes again (at startup)."""
+    global _writes_open
+    _writes_open = True
+
+
+def running_writes() -> int:
+    """Number of write attempts currently executing in any thread."""
+    return _running
+
+
+def _check_open() -> None:
+    if not _writes_open:
+        raise WritesClosedError(settings.write_retry_after_seconds)
+
+
+def _attempt(write: Callable[..., T], args: Any, kwargs: Any) -> T:
+    global _running
+    with _running_lock:
+        _running += 1
+    try:
+        return write(*args, **kwargs)
+    finally:
+        with _running_lock:
+            _running -= 1
+
+
+def is_busy_error(exc: BaseException) -> bool:
+    """Check whether an exception is SQLite reporting a locked or busy database."""
+    if not isinstance(exc, OperationalError):
+        return False
+    orig = exc.orig
+    code = getattr(orig, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (SQLITE_BUSY, SQLITE_LOCKED)
+    return isinstance(orig, sqlite3.OperationalError) and (
+        "database is locked" in str(orig) or "database is busy" in str(orig)
+    )
+
+
+class _Backoff:
+    """Full-jitter exponential backoff bounded by a deadline."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.deadline = self.started + settings.write_retry_deadline_seconds
+        self.attempts = 0
+
+    def next_delay(self, exc: OperationalError) -> float:
+        """
+        Delay before the next attempt.
+
+        Raises:
+            WriteContentionError: If the deadline leaves no room for another attempt
+        """
+        self.attempts += 1
+        DB_WRITE_RETRIES.inc()
+        now = time.perf_counter()
+        ceiling = min(
+            settings.write_retry_max_delay_ms,
+            settings.write_retry_base_delay_ms * 2 ** (self.attempts - 1)
+        ) / 1000
+        delay = random.uniform(0, ceiling)
+        if now + delay >= self.deadline:
+            waited = now - self.started
+            DB_WRITE_TIMEOUTS.inc()
+            DB_WRITE_CONTENTION_SECONDS.observe(waited)
+            logger.warning("Write gave up after %d attempts in %.2fs: %s", self.attempts, waited, exc.orig)
+            raise WriteContentionError(waited, self.attempts, settings.write_retry_after_seconds) from exc
+        return delay
+
+    def succeeded(self) -> None:
+        # Time lost to contention: failed attempts and backoff, zero on the first try
+        DB_WRITE_CONTENTION_SECONDS.observe(time.perf_counter() - self.started if self.attempts else 0.0)
+
+
+def run_with_retry(db: Session, write: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """
+    Call a service write method, retrying it while the database is busy.
+
+    For scripts and worker threads; API routes use run_write so backoff does
+    not block the event loop.
+
+    Args:
+        db: Session the write uses; rolled back before each retry
+        write: Service method that commits its own transaction
+
+    Returns:
+        Whatever `write` returns
+
+    Raises:
+        WriteContentionError: If the lock was not acquired before the deadline
+        WritesClosedError: If the server is shutting down
+    """
+    _check_open()
+    backoff = _Backoff()
+    DB_WRITES_QUEUED.inc()
+    try:
+        while True:
+            try:
+                result = _attempt(write, args, kwargs)
+            except OperationalError as e:
+                if not is_busy_error(e):
+                    raise
+                db.rollback()
+                time.sleep(backoff.next_delay(e))
+                continue
+            backoff.succeeded()
+            return result
+    finally:
+        DB_WRITES_QUEUED.dec()
+
+
+async def run_write(db: Session, write: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """
+    Async run_with_retry: attempts run in a worker thread and backoff awaits.
+
+    Neither the short busy wait nor the backoff delay holds up the event loop,
+    so other requests keep being served while a write waits for the lock.
+
+    Raises:
+        WriteContentionError: If the lock was not acquired before the deadline
+        WritesClosedError: If the server is shutting down
+    """
+    _check_open()
+    backoff = _Backoff()
+    DB_WRITES_QUEUED.inc()
+    try:
+        while True:
+            try:
+                result = await asyncio.to_thread(_attempt, write, args, kwargs)
+            except OperationalError as e:
+                if not is_busy_error(e):
+                    raise
+                await asyncio.to_thread(db.rollback)
+                await asyncio.sleep(backoff.next_delay(e))
+                continue
+            backoff.succeeded()
+            return result
+    finally:
+        DB_WRITES_QUEUED.dec()
+
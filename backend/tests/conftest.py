@@ -0,0 +1,17 @@
+"""
+Shared test setup.
+
+Settings are read when src.config is first imported, so the environment is
+pointed at a scratch database before any test module imports the app.
+"""
+import os
+import tempfile
+
+_DATA_DIR = tempfile.mkdtemp(prefix="piggybank-tests-")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{_DATA_DIR}/piggybank.db"
+os.environ["ENVIRONMENT"] = "test"
+os.environ["READ_REPLICA_PATH"] = ""
+os.environ["BACKUP_INTERVAL_MINUTES"] = "0"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["WARM_UP_ON_STARTUP"] = "false"
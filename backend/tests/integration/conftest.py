@@ -0,0 +1,21 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import src.models  # noqa: F401  (registers the tables)
+from src.config.database import Base, engine
+from src.main import app
+from tests.integration.helpers import Family
+
+
+@pytest.fixture(scope="module")
+def client():
+    """TestClient for the app, with its lifespan running, on the scratch database."""
+    Base.metadata.create_all(engine)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def family(client):
+    """A new family with one child and one transaction."""
+    return Family(client)
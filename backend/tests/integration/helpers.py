@@ -0,0 +1,51 @@
+"""Shared setup for the API integration tests."""
+import uuid
+from typing import Tuple
+
+from fastapi.testclient import TestClient
+
+from src.config.settings import settings
+
+API = settings.api_v1_prefix
+PASSWORD = "password1"
+PIN = "1234"
+
+
+class Family:
+    """A registered family with one child and one transaction, plus helpers to add more."""
+
+    def __init__(self, client: TestClient):
+        self.client = client
+        self.parent_username = unique("mom")
+        response = client.post(f"{API}/auth/register", json={
+            "family_name": "Budget", "parent_username": self.parent_username,
+            "parent_name": "Mom", "parent_password": PASSWORD,
+        })
+        assert response.status_code == 201, response.text
+        self.parent = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        self.child_username, self.child_id = self.add_child()
+        response = client.post(f"{API}/auth/login/child", json={"username": self.child_username, "password": PIN})
+        self.child = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        self.transaction_id = self.add_transaction()
+
+    def add_child(self) -> Tuple[str, str]:
+        username = unique("kid")
+        response = self.client.post(
+            f"{API}/children/", json={"username": username, "name": "Kid", "password": PIN}, headers=self.parent
+        )
+        assert response.status_code == 201, response.text
+        return username, response.json()["id"]
+
+    def add_transaction(self) -> str:
+        response = self.client.post(
+            f"{API}/transactions/", json={"child_id": self.child_id, "type": "credit", "amount": "5.00"},
+            headers=self.parent
+        )
+        assert response.status_code == 201, response.text
+        return response.json()["id"]
+
+
+def unique(prefix: str) -> str:
+    """A username nobody else in the scratch database has."""
+    return f"{prefix}{uuid.uuid4().hex[:8]}"
@@ -0,0 +1,35 @@
+"""Writes through the API are visible immediately in cached reads and ETags."""
+from decimal import Decimal
+
+from src.services import child_cache
+from tests.integration.helpers import API
+
+
+def test_balance_and_history_etag_follow_a_new_transaction(client, family):
+    child_url = f"{API}/children/{family.child_id}"
+    history_url = f"{API}/transactions/child/{family.child_id}"
+    before = client.get(child_url, headers=family.parent)
+    history = client.get(history_url, headers=family.parent)
+    # Both reads are now served from a cached snapshot
+    assert child_cache.get(family.child_id) is not None
+
+    family.add_transaction()
+
+    after = client.get(child_url, headers=family.parent)
+    assert Decimal(after.json()["balance"]) == Decimal(before.json()["balance"]) + Decimal("5.00")
+    revalidated = client.get(history_url, headers={**family.parent, "If-None-Match": history.headers["etag"]})
+    assert revalidated.status_code == 200
+    assert revalidated.headers["etag"] != history.headers["etag"]
+    assert len(revalidated.json()) == len(history.json()) + 1
+
+
+def test_profile_update_and_delete_reach_the_cache(client, family):
+    child_url = f"{API}/children/{family.child_id}"
+    client.get(child_url, headers=family.parent)
+
+    response = client.patch(child_url, json={"name": "Renamed"}, headers=family.parent)
+    assert response.status_code == 200
+    assert client.get(child_url, headers=family.parent).json()["name"] == "Renamed"
+
+    assert client.delete(child_url, headers=family.parent).status_code == 204
+    assert client.get(child_url, headers=family.parent).status_code == 404
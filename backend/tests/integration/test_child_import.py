@@ -0,0 +1,62 @@
+"""Bulk child import: PINs are hashed once, before the retried write."""
+import sqlite3
+
+from sqlalchemy.exc import OperationalError
+
+from src.auth import auth_provider
+from src.services import ChildService, running_writes
+from tests.integration.helpers import API, PIN, unique
+
+
+def _rows(count: int) -> list:
+    return [{"username": unique("kid"), "name": f"Kid {i}", "password": PIN} for i in range(count)]
+
+
+def test_pins_are_hashed_outside_the_write_and_not_rehashed_on_retry(client, family, monkeypatch):
+    hashed_batches = []
+    writes_during_hashing = []
+    hash_passwords = auth_provider.hash_passwords
+
+    def recording_hash(passwords):
+        writes_during_hashing.append(running_writes())
+        hashed_batches.append(len(passwords))
+        return hash_passwords(passwords)
+
+    attempts = []
+    import_children = ChildService.import_children
+
+    def busy_once(**kwargs):
+        attempts.append(kwargs["password_hashes"])
+        if len(attempts) == 1:
+            raise OperationalError("INSERT", {}, sqlite3.OperationalError("database is locked"))
+        return import_children(**kwargs)
+
+    monkeypatch.setattr(auth_provider, "hash_passwords", recording_hash)
+    monkeypatch.setattr(ChildService, "import_children", staticmethod(busy_once))
+
+    response = client.post(f"{API}/children/import", json=_rows(3), headers=family.parent)
+
+    assert response.status_code == 200, response.text
+    assert len(response.json()["created"]) == 3
+    assert hashed_batches == [3]
+    # Hashing is not a write: the shutdown drain does not wait for it
+    assert writes_during_hashing == [0]
+    # The retry reused the same hashes
+    assert len(attempts) == 2 and attempts[0] is attempts[1]
+
+
+def test_rejected_rows_are_not_hashed(client, family, monkeypatch):
+    hashed_batches = []
+    hash_passwords = auth_provider.hash_passwords
+    monkeypatch.setattr(
+        auth_provider, "hash_passwords", lambda passwords: hashed_batches.append(len(passwords)) or hash_passwords(passwords)
+    )
+    rows = _rows(2) + [{"username": family.child_username, "name": "Taken", "password": PIN}]
+
+    response = client.post(f"{API}/children/import", json=rows, headers=family.parent)
+    assert [error["row"] for error in response.json()["errors"]] == [3]
+    assert hashed_batches == [2]
+
+    response = client.post(f"{API}/children/import?all_or_nothing=true", json=rows, headers=family.parent)
+    assert response.json()["created"] == []
+    assert hashed_batches == [2]
@@ -0,0 +1,66 @@
+"""Every route in QUERY_BUDGETS stays within its declared statement budget."""
+from typing import Any, Callable, Dict, Tuple
+
+import pytest
+
+from src.api.v1.query_budgets import QUERY_BUDGETS, assert_route_budget
+from src.services import child_cache
+from tests.integration.helpers import API, PASSWORD, PIN, Family, unique
+
+# Per budgeted route: (url, request kwargs, expected status); arguments that need
+# a fresh row to act on are created before the budget is measured
+Case = Callable[[Family], Tuple[str, Dict[str, Any], int]]
+
+CASES: Dict[Tuple[str, str], Case] = {
+    ("POST", f"{API}/auth/register"): lambda f: (f"{API}/auth/register", {"json": {
+        "family_name": "Other", "parent_username": unique("dad"), "parent_name": "Dad", "parent_password": PASSWORD,
+    }}, 201),
+    ("POST", f"{API}/auth/login/parent"): lambda f: (
+        f"{API}/auth/login/parent", {"json": {"username": f.parent_username, "password": PASSWORD}}, 200
+    ),
+    ("POST", f"{API}/auth/login/child"): lambda f: (
+        f"{API}/auth/login/child", {"json": {"username": f.child_username, "password": PIN}}, 200
+    ),
+    ("POST", f"{API}/children/"): lambda f: (f"{API}/children/", {
+        "json": {"username": unique("kid"), "name": "Kid", "password": PIN}, "headers": f.parent,
+    }, 201),
+    ("GET", f"{API}/children/"): lambda f: (f"{API}/children/", {"headers": f.parent}, 200),
+    ("GET", f"{API}/children/{{child_id}}"): lambda f: (f"{API}/children/{f.child_id}", {"headers": f.parent}, 200),
+    ("PATCH", f"{API}/children/{{child_id}}"): lambda f: (
+        f"{API}/children/{f.child_id}", {"json": {"name": "Renamed"}, "headers": f.parent}, 200
+    ),
+    ("DELETE", f"{API}/children/{{child_id}}"): lambda f: (
+        f"{API}/children/{f.add_child()[1]}", {"headers": f.parent}, 204
+    ),
+    ("POST", f"{API}/transactions/"): lambda f: (f"{API}/transactions/", {
+        "json": {"child_id": f.child_id, "type": "credit", "amount": "1.50"}, "headers": f.parent,
+    }, 201),
+    ("GET", f"{API}/transactions/{{transaction_id}}"): lambda f: (
+        f"{API}/transactions/{f.transaction_id}", {"headers": f.parent}, 200
+    ),
+    ("GET", f"{API}/transactions/child/{{child_id}}"): lambda f: (
+        f"{API}/transactions/child/{f.child_id}", {"headers": f.parent}, 200
+    ),
+    ("GET", f"{API}/transactions/family"): lambda f: (f"{API}/transactions/family", {"headers": f.parent}, 200),
+    ("GET", f"{API}/transactions/my-transactions"): lambda f: (
+        f"{API}/transactions/my-transactions", {"headers": f.child}, 200
+    ),
+    ("GET", f"{API}/dashboard/parent"): lambda f: (f"{API}/dashboard/parent", {"headers": f.parent}, 200),
+    ("GET", f"{API}/dashboard/child"): lambda f: (f"{API}/dashboard/child", {"headers": f.child}, 200),
+    ("POST", f"{API}/invitations/"): lambda f: (f"{API}/invitations/", {"headers": f.parent}, 201),
+    ("GET", f"{API}/invitations/"): lambda f: (f"{API}/invitations/", {"headers": f.parent}, 200),
+}
+
+
+def test_every_budgeted_route_has_a_case():
+    assert set(CASES) == set(QUERY_BUDGETS)
+
+
+@pytest.mark.parametrize("route", list(QUERY_BUDGETS), ids=lambda route: f"{route[0]} {route[1]}")
+def test_route_within_budget(client, family, route):
+    method, _ = route
+    url, kwargs, expected_status = CASES[route](family)
+    # Measure the cold path: child lookups must not rely on an earlier request's cache fill
+    child_cache.clear()
+    response = assert_route_budget(client, method, url, **kwargs)
+    assert response.status_code == expected_status, response.text
@@ -0,0 +1,37 @@
+"""Every reviewed statement is served by an index on a seeded database at head."""
+import pytest
+
+from src.observability.query_plans import QUERY_PLANS, format_report, review_database
+
+TEMP_SORT_ALLOWED = {
+    "family history",
+    "family history rows",
+    "recent rows of family",
+    "pending invitations of family",
+}
+
+
+@pytest.fixture(scope="module", params=["migrations", "models"])
+def reports(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp("plans") / f"{request.param}.db"
+    return review_database(str(path), request.param, families=40, children=3, transactions=100)
+
+
+def test_every_statement_is_reviewed(reports):
+    assert [report.query.name for report in reports] == [query.name for query in QUERY_PLANS]
+
+
+def test_no_full_scans(reports):
+    flagged = [report for report in reports if any(problem.startswith("full scan") for problem in report.problems)]
+    assert not flagged, "\n".join(format_report(report) for report in flagged)
+
+
+def test_no_temp_btrees_beyond_the_per_family_merges(reports):
+    sorting = {report.query.name for report in reports if any("USE TEMP B-TREE" in line for line in report.plan)}
+    # Each sorts at most one family's rows; any other statement must read in index order
+    assert sorting <= TEMP_SORT_ALLOWED, sorted(sorting - TEMP_SORT_ALLOWED)
+
+
+def test_plans_use_their_expected_indexes(reports):
+    flagged = [report for report in reports if report.problems]
+    assert not flagged, "\n".join(format_report(report) for report in flagged)
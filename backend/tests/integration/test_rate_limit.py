@@ -0,0 +1,32 @@
+"""Rate limits in front of the real login handler."""
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.middleware import RateLimitMiddleware, parse_rules
+from tests.integration.helpers import API, PIN
+
+CHILD_LOGIN = f"{API}/auth/login/child"
+
+
+@pytest.fixture
+def limited(client):
+    # The test settings turn rate limiting off; wrap the app with the default child login rule
+    return TestClient(RateLimitMiddleware(app, rules=parse_rules(f"POST {CHILD_LOGIN} ip=30/min user=5/min")))
+
+
+def test_login_body_reaches_the_handler(limited, family):
+    response = limited.post(CHILD_LOGIN, json={"username": family.child_username, "password": PIN})
+    assert response.status_code == 200, response.text
+    assert response.json()["access_token"]
+
+
+def test_wrong_pins_lock_out_the_correct_one(limited, family):
+    # Documented in the rate_limit_rules setting: user buckets count failures too
+    for _ in range(5):
+        response = limited.post(CHILD_LOGIN, json={"username": family.child_username, "password": "0000"})
+        assert response.status_code == 401
+    response = limited.post(CHILD_LOGIN, json={"username": family.child_username, "password": PIN})
+    assert response.status_code == 429
+    # One token every 12 s at 5/min
+    assert 1 <= int(response.headers["retry-after"]) <= 12
@@ -0,0 +1,61 @@
+"""A write blocked by another connection's lock is retried until the deadline, then answered with 503."""
+import sqlite3
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from src.config.database import engine, get_sqlite_path
+from src.config.settings import settings
+from tests.integration.helpers import API
+
+
+@pytest.fixture
+def locker(client):
+    conn = sqlite3.connect(get_sqlite_path(), isolation_level=None, check_same_thread=False)
+    yield conn
+    if conn.in_transaction:
+        conn.execute("ROLLBACK")
+    conn.close()
+
+
+def _credit(client, family):
+    return client.post(
+        f"{API}/transactions/", json={"child_id": family.child_id, "type": "credit", "amount": "1.00"},
+        headers=family.parent
+    )
+
+
+def test_connections_wait_briefly_for_the_lock(client):
+    assert settings.sqlite_busy_timeout_ms == 50
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.sqlite_busy_timeout_ms
+
+
+def test_held_lock_gives_503_with_retry_after_at_the_deadline(client, family, locker):
+    locker.execute("BEGIN IMMEDIATE")
+    started = time.perf_counter()
+    response = _credit(client, family)
+    elapsed = time.perf_counter() - started
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(settings.write_retry_after_seconds)
+    assert response.json() == {"detail": "Database busy, please retry"}
+    # Gives up once the next backoff would pass the deadline, not before the last delay
+    deadline = settings.write_retry_deadline_seconds
+    assert deadline - settings.write_retry_max_delay_ms / 1000 - 0.1 <= elapsed < deadline + 1.0
+
+    metrics = client.get("/metrics").text
+    assert "db_write_timeouts_total" in metrics
+
+
+def test_write_succeeds_once_the_lock_is_released(client, family, locker):
+    locker.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.3, lambda: locker.execute("ROLLBACK")).start()
+
+    started = time.perf_counter()
+    response = _credit(client, family)
+
+    assert response.status_code == 201, response.text
+    assert time.perf_counter() - started < settings.write_retry_deadline_seconds
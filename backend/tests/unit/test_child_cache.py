@@ -0,0 +1,64 @@
+"""ChildCache: stale fills are dropped, versions only move forward, size is bounded."""
+from datetime import datetime
+from decimal import Decimal
+
+from src.models import ChildSnapshot
+from src.services import ChildCache
+
+
+def _snapshot(child_id: str = "c1", version: int = 1, balance: str = "0.00") -> ChildSnapshot:
+    return ChildSnapshot(child_id, "f1", f"user-{child_id}", "Kid", None, None, Decimal(balance), datetime(2026, 1, 1), version)
+
+
+def test_miss_fills_and_hits():
+    cache = ChildCache(10)
+    assert cache.get("c1") is None
+    cache.fill(_snapshot(), cache.generation)
+    assert cache.get("c1") == _snapshot()
+
+
+def test_fill_started_before_invalidate_is_dropped():
+    cache = ChildCache(10)
+    generation = cache.generation
+    cache.invalidate("c1")  # the child is deleted while its row is being read
+    cache.fill(_snapshot(), generation)
+    assert cache.get("c1") is None
+
+
+def test_fill_racing_an_update_is_dropped_even_after_eviction():
+    cache = ChildCache(1)
+    generation = cache.generation
+    stale = _snapshot(version=1)  # read before the write committed
+    cache.update(_snapshot(version=2, balance="5.00"))
+    cache.update(_snapshot("c2"))  # evicts c1's newer entry
+    assert cache.get("c1") is None
+
+    cache.fill(stale, generation)
+    assert cache.get("c1") is None
+
+
+def test_update_with_older_version_keeps_newer_entry():
+    cache = ChildCache(10)
+    cache.update(_snapshot(version=3, balance="9.00"))
+    cache.update(_snapshot(version=2, balance="4.00"))
+    assert cache.get("c1").version == 3
+    cache.fill(_snapshot(version=1), cache.generation)
+    assert cache.get("c1").balance == Decimal("9.00")
+
+
+def test_lru_eviction_respects_max_size():
+    cache = ChildCache(2)
+    for child_id in ("c1", "c2"):
+        cache.fill(_snapshot(child_id), cache.generation)
+    cache.get("c1")  # c2 is now least recently used
+    cache.fill(_snapshot("c3"), cache.generation)
+
+    assert len(cache) == 2
+    assert cache.get("c2") is None
+    assert cache.get("c1") is not None and cache.get("c3") is not None
+
+
+def test_zero_size_disables_the_cache():
+    cache = ChildCache(0)
+    cache.update(_snapshot())
+    assert cache.get("c1") is None
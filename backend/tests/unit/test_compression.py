@@ -0,0 +1,63 @@
+"""ETags on conditional GETs through CompressionMiddleware."""
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from src.middleware.compression import CompressionMiddleware, gzip_codec
+
+ETAG = '"v1"'
+
+
+def _app(body: bytes) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/resource")
+    def resource(request: Request) -> Response:
+        if ETAG in request.headers.get("if-none-match", "").replace("W/", ""):
+            return Response(status_code=304, headers={"ETag": ETAG})
+        return Response(body, media_type="application/json", headers={"ETag": ETAG})
+
+    app.add_middleware(CompressionMiddleware, codecs=[gzip_codec(6)], content_types=["application/json"])
+    return app
+
+
+@pytest.fixture
+def large():
+    return TestClient(_app(b"[" + b"1," * 2000 + b"1]"))
+
+
+@pytest.fixture
+def small():
+    return TestClient(_app(b"[1]"))
+
+
+def test_encoded_response_and_its_304_carry_weak_etag(large):
+    response = large.get("/resource", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == f"W/{ETAG}"
+
+    revalidated = large.get("/resource", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == f"W/{ETAG}"
+
+
+def test_304_keeps_strong_etag_when_body_is_below_minimum_size(small):
+    response = small.get("/resource", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == ETAG
+
+    revalidated = small.get("/resource", headers={"Accept-Encoding": "gzip", "If-None-Match": ETAG})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == ETAG
+
+
+def test_304_keeps_strong_etag_when_no_coding_is_acceptable(large):
+    revalidated = large.get("/resource", headers={"Accept-Encoding": "identity", "If-None-Match": ETAG})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == ETAG
+
+
+def test_unseen_etag_304_echoes_the_clients_form(large):
+    # e.g. after a restart, before this process has encoded the representation
+    weak = large.get("/resource", headers={"Accept-Encoding": "gzip", "If-None-Match": f"W/{ETAG}"})
+    assert weak.headers["etag"] == f"W/{ETAG}"
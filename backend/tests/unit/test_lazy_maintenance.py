@@ -0,0 +1,41 @@
+"""The app starts without importing maintenance modules for disabled features."""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+_PROBE = """
+import json, sys
+from fastapi.testclient import TestClient
+from src.main import app
+with TestClient(app):
+    serving = sorted(m for m in sys.modules if m.startswith("src.maintenance."))
+stopped = sorted(m for m in sys.modules if m.startswith("src.maintenance."))
+import src.maintenance
+src.maintenance.verify_backup
+print(json.dumps({"serving": serving, "stopped": stopped, "after_export": "src.maintenance.backup" in sys.modules}))
+"""
+
+
+def test_disabled_features_are_not_imported(tmp_path):
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{tmp_path}/piggybank.db",
+        "MIGRATE_ON_STARTUP": "false",
+        "WARM_UP_ON_STARTUP": "false",
+        "BACKUP_INTERVAL_MINUTES": "0",
+        "READ_REPLICA_PATH": "",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert report["serving"] == []
+    # Only shutdown runs unconditionally
+    assert report["stopped"] == ["src.maintenance.shutdown"]
+    assert report["after_export"]
@@ -0,0 +1,35 @@
+"""Route peak reports cover the current tracing session only."""
+import tracemalloc
+
+import pytest
+
+from src.observability import HTTP_REQUEST_PEAK_BYTES, record_route_peak, route_peaks, start_tracing, stop_tracing
+
+ROUTE = ("GET", "/test/peaks")
+
+
+@pytest.fixture(autouse=True)
+def no_tracing():
+    if tracemalloc.is_tracing():
+        stop_tracing()
+    yield
+    if tracemalloc.is_tracing():
+        stop_tracing()
+
+
+def test_route_peaks_reset_when_tracing_starts():
+    assert start_tracing()
+    record_route_peak(ROUTE, 3000)
+    record_route_peak(ROUTE, 1000)
+    assert route_peaks() == [{
+        "method": "GET", "route": "/test/peaks", "requests": 2, "max_peak_bytes": 3000, "mean_peak_bytes": 2000,
+    }]
+
+    stop_tracing()
+    assert start_tracing()
+    record_route_peak(ROUTE, 500)
+    assert route_peaks() == [{
+        "method": "GET", "route": "/test/peaks", "requests": 1, "max_peak_bytes": 500, "mean_peak_bytes": 500,
+    }]
+    # The Prometheus histogram stays cumulative across sessions
+    assert HTTP_REQUEST_PEAK_BYTES.collect()[ROUTE][-2] == 3
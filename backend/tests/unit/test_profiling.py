@@ -0,0 +1,38 @@
+"""The profiling token is only honoured as an X-Profile header."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.middleware import ProfilingMiddleware
+
+TOKEN = "s3cret"
+
+
+@pytest.fixture
+def client(tmp_path):
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware, token=TOKEN, output_dir=str(tmp_path))
+    return TestClient(app)
+
+
+def test_header_token_profiles_the_request(client, tmp_path):
+    response = client.get("/ping", headers={"X-Profile": TOKEN})
+    assert response.status_code == 200
+    assert (tmp_path / response.headers["x-profile"]).exists()
+
+
+@pytest.mark.parametrize("request_kwargs", [
+    {"headers": {"X-Profile": "wrong"}},
+    {"headers": {"X-Profile": TOKEN[:-1]}},
+    {"params": {"profile": TOKEN}},
+])
+def test_other_requests_are_not_profiled(client, tmp_path, request_kwargs):
+    response = client.get("/ping", **request_kwargs)
+    assert response.status_code == 200
+    assert "x-profile" not in response.headers
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,101 @@
+"""Token buckets and the rate limit middleware in front of a stub app."""
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.middleware import RateLimitMiddleware, parse_rules
+from src.middleware.rate_limit import Limit, TokenBuckets
+
+KEY = (1, "ip", "203.0.113.7")
+
+
+def test_bucket_allows_a_burst_then_reports_the_wait():
+    buckets = TokenBuckets()
+    limit = Limit(3, 60.0)
+    assert [buckets.take(KEY, limit, 100.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert buckets.take(KEY, limit, 100.0) == pytest.approx(20.0)
+
+
+def test_bucket_refills_lazily():
+    buckets = TokenBuckets()
+    limit = Limit(2, 60.0)  # one token every 30 s
+    buckets.take(KEY, limit, 0.0)
+    buckets.take(KEY, limit, 0.0)
+    assert buckets.take(KEY, limit, 15.0) == pytest.approx(15.0)
+    assert buckets.take(KEY, limit, 30.0) == 0.0
+    # Refill is capped at capacity however long the bucket sat idle
+    assert [buckets.take(KEY, limit, 10_000.0) for _ in range(3)][-1] > 0
+
+
+def _key(limit: Limit, name: str):
+    # Bucket keys start with id() of their Limit, as the middleware builds them
+    return (id(limit), "ip", name)
+
+
+def test_sweep_drops_buckets_that_would_be_full():
+    buckets = TokenBuckets(sweep_interval=10.0)
+    buckets._next_sweep = 10.0
+    limit = Limit(1, 60.0)
+    buckets.take(_key(limit, "a"), limit, 0.0)
+    buckets.take(_key(limit, "b"), limit, 9.0)
+    assert len(buckets) == 2
+
+    # At t=61 "a" has refilled and is swept; "b" has not, and "c" is added
+    buckets.take(_key(limit, "c"), limit, 61.0)
+    assert set(buckets._buckets) == {_key(limit, "b"), _key(limit, "c")}
+
+
+def test_sweep_evicts_least_recently_used_beyond_max_keys():
+    buckets = TokenBuckets(max_keys=2, sweep_interval=10.0)
+    buckets._next_sweep = 10.0
+    limit = Limit(1, 3600.0)
+    for t, name in enumerate(["a", "b", "c"]):
+        buckets.take(_key(limit, name), limit, float(t))
+    buckets.take(_key(limit, "a"), limit, 5.0)  # touching "a" makes "b" the oldest
+
+    # The sweep keeps the 2 most recently used, then "d" is added
+    buckets.take(_key(limit, "d"), limit, 10.0)
+    assert set(buckets._buckets) == {_key(limit, "c"), _key(limit, "a"), _key(limit, "d")}
+
+
+@pytest.mark.parametrize("spec", ["POST /x", "POST /x ip=5", "POST /x ip=5/fortnight", "POST /x any=5/min"])
+def test_malformed_rules_are_rejected(spec):
+    with pytest.raises(ValueError):
+        parse_rules(spec)
+
+
+@pytest.fixture
+def stub():
+    app = FastAPI()
+    calls = []
+
+    @app.post("/login")
+    async def login(request: Request):
+        calls.append(await request.json())
+        return {"ok": True}
+
+    limited = RateLimitMiddleware(app, rules=parse_rules("POST /login ip=4/min user=2/min"))
+    return TestClient(limited), calls
+
+
+def test_over_limit_gets_429_before_the_app_runs(stub):
+    client, calls = stub
+    for _ in range(2):
+        assert client.post("/login", json={"username": "kid"}).status_code == 200
+
+    response = client.post("/login", json={"username": "kid"})
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert len(calls) == 2
+
+    # Another username has its own bucket; rejected requests still spent IP tokens
+    assert client.post("/login", json={"username": "other"}).status_code == 200
+    assert client.post("/login", json={"username": "third"}).status_code == 429
+    assert len(calls) == 3
+
+
+def test_body_read_for_the_username_is_replayed(stub):
+    client, calls = stub
+    body = {"username": "kid", "password": "1234", "extra": ["kept"]}
+    assert client.post("/login", json=body).status_code == 200
+    assert calls == [body]
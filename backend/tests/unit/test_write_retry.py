@@ -0,0 +1,37 @@
+"""is_busy_error only lets SQLITE_BUSY and SQLITE_LOCKED through to a retry."""
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from src.services.write_retry import is_busy_error
+
+
+def _operational(message: str, code=None) -> OperationalError:
+    orig = sqlite3.OperationalError(message)
+    if code is not None:
+        orig.sqlite_errorcode = code
+    return OperationalError("UPDATE children SET balance = ?", {}, orig)
+
+
+@pytest.mark.parametrize("exc", [
+    _operational("database is locked"),
+    _operational("database is busy"),
+    _operational("database is locked", code=5),  # SQLITE_BUSY
+    _operational("database table is locked", code=6),  # SQLITE_LOCKED
+    _operational("database is locked", code=5 | (2 << 8)),  # SQLITE_BUSY_SNAPSHOT
+])
+def test_busy_errors_are_retried(exc):
+    assert is_busy_error(exc)
+
+
+@pytest.mark.parametrize("exc", [
+    _operational("no such table: children"),
+    _operational("disk I/O error", code=10),  # SQLITE_IOERR
+    _operational("attempt to write a readonly database", code=8),  # SQLITE_READONLY
+    IntegrityError("INSERT", {}, sqlite3.IntegrityError("UNIQUE constraint failed")),
+    sqlite3.OperationalError("database is locked"),  # not wrapped by SQLAlchemy
+    ValueError("database is locked"),
+])
+def test_other_errors_are_not_retried(exc):
+    assert not is_busy_error(exc)